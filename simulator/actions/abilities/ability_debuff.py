@@ -3,13 +3,7 @@
 from typing import Any
 
 from actions.abilities.base_ability import BaseAbility
-from core.constants import (
-    ActionCategory,
-    ActionType,
-    GLOBAL_VERBOSE_LEVEL,
-    get_effect_color,
-)
-from core.utils import cprint
+from core.constants import ActionCategory, ActionType
 from effects.base_effect import Effect
 from effects.modifier_effect import DebuffEffect
 from catchery import validate_type, log_critical
@@ -103,36 +97,8 @@ class DebuffAbility(BaseAbility):
             )
             return False
 
-        # Get display strings for logging.
-        actor_str, target_str = self._get_display_strings(actor, target)
-
-        # Apply the buff effect
-        effect_applied = self._common_apply_effect(actor, target, self.effect)
-
-        # Display results
-        effect_color = get_effect_color(self.effect)
-
-        msg = f"    ✨ {actor_str} uses [bold blue]{self.name}[/] on {target_str}"
-
-        if GLOBAL_VERBOSE_LEVEL == 0:
-            if effect_applied:
-                msg += f" applying [{effect_color}]{self.effect.name}[/]"
-            else:
-                msg += f" but fails to apply [{effect_color}]{self.effect.name}[/]"
-            msg += "."
-        elif GLOBAL_VERBOSE_LEVEL >= 1:
-            if effect_applied:
-                msg += f" successfully applying [{effect_color}]{self.effect.name}[/]"
-            else:
-                msg += (
-                    f" but {target_str} resists [{effect_color}]{self.effect.name}[/]"
-                )
-            msg += ".\n"
-
-            if effect_applied and hasattr(self.effect, "description"):
-                msg += f"        Effect: {self.effect.description}"
-
-        cprint(msg)
+        # Apply the debuff effect, which reports whether it was applied.
+        self._common_apply_effect(actor, target, self.effect)
 
         return True
 
@@ -3,10 +3,10 @@
 from typing import Any
 
 from actions.abilities.base_ability import BaseAbility
-from core.constants import ActionCategory, ActionType, GLOBAL_VERBOSE_LEVEL
+from combat.events import CombatEvent, CombatEventType, emit_event, wants_event
+from core.constants import ActionCategory, ActionType
 from catchery import ensure_string, log_critical
 from core.utils import (
-    cprint,
     parse_expr_and_assume_max_roll,
     parse_expr_and_assume_min_roll,
     roll_and_describe,
@@ -93,9 +93,6 @@ class HealingAbility(BaseAbility):
             )
             return False
 
-        # Get display strings for logging.
-        actor_str, target_str = self._get_display_strings(actor, target)
-
         # Roll healing amount
         variables = actor.get_expression_variables()
         healing_amount, healing_desc, _ = roll_and_describe(self.heal_roll, variables)
@@ -106,29 +103,21 @@ class HealingAbility(BaseAbility):
         # Apply effects
         effect_applied = self._common_apply_effect(actor, target, self.effect)
 
-        # Display results.
-        msg = f"    💚 {actor_str} uses [bold green]{self.name}[/] on {target_str}"
-
-        if GLOBAL_VERBOSE_LEVEL == 0:
-            msg += f" healing {actual_healing} HP"
-            if self.effect and effect_applied:
-                msg += f" and applying [bold yellow]{self.effect.name}[/]"
-            msg += "."
-        elif GLOBAL_VERBOSE_LEVEL >= 1:
-            if actual_healing != healing_amount:
-                msg += f" healing {actual_healing} HP (rolled {healing_amount}, capped at max HP)"
-            else:
-                msg += f" healing {actual_healing} HP → {healing_desc}"
-            msg += ".\n"
-
-            if self.effect:
-                if effect_applied:
-                    msg += f"        {target_str} is affected by"
-                else:
-                    msg += f"        {target_str} resists"
-                msg += f" [bold yellow]{self.effect.name}[/]."
-
-        cprint(msg)
+        # Report the results.
+        if wants_event(CombatEventType.HEAL):
+            emit_event(
+                CombatEvent(
+                    CombatEventType.HEAL,
+                    actor=actor,
+                    target=target,
+                    action=self,
+                    base=healing_amount,
+                    amount=actual_healing,
+                    description=healing_desc,
+                    effect=self.effect,
+                    effect_applied=effect_applied,
+                )
+            )
 
         return True
 
@@ -158,8 +147,7 @@ class HealingAbility(BaseAbility):
             int: Minimum healing amount.
         """
         variables = actor.get_expression_variables()
-        substituted = substitute_variables(self.heal_roll, variables)
-        return parse_expr_and_assume_min_roll(substituted)
+        return parse_expr_and_assume_min_roll(self.heal_roll, variables)
 
     def get_max_heal(self, actor: Any) -> int:
         """Returns the maximum possible healing value for the ability.
@@ -171,5 +159,4 @@ class HealingAbility(BaseAbility):
             int: Maximum healing amount.
         """
         variables = actor.get_expression_variables()
-        substituted = substitute_variables(self.heal_roll, variables)
-        return parse_expr_and_assume_max_roll(substituted)
+        return parse_expr_and_assume_max_roll(self.heal_roll, variables)
@@ -8,10 +8,10 @@ from combat.damage import (
     roll_damage_components_no_mind,
     roll_damage_components,
 )
-from core.constants import ActionCategory, ActionType, GLOBAL_VERBOSE_LEVEL
+from combat.events import CombatEvent, CombatEventType, emit_event, wants_event
+from core.constants import ActionCategory, ActionType
 from core.constants import BonusType
 from catchery import *
-from core.utils import cprint
 from effects.base_effect import Effect
 
 
@@ -106,8 +106,6 @@ class OffensiveAbility(BaseAbility):
             )
             return False
 
-        actor_str, target_str = self._get_display_strings(actor, target)
-
         # =====================================================================
         # 2. ATTACK ROLL (TO-HIT, CRIT, FUMBLE)
         # =====================================================================
@@ -116,16 +114,28 @@ class OffensiveAbility(BaseAbility):
         is_critical = False
         is_fumble = False
         hit = True
-        attack_roll_msg = ""
+        attack_total = 0
+        attack_roll_desc = ""
+        target_ac = 0
         if self.requires_attack_roll():
-            hit, roll, is_critical, is_fumble, attack_roll_msg = self.roll_to_hit(
-                actor, target
+            hit, attack_total, is_critical, is_fumble, attack_roll_desc = (
+                self.roll_to_hit(actor, target)
             )
+            target_ac = getattr(target, "AC", 0)
             if not hit:
-                msg = f"    ❌ {actor_str} uses [bold blue]{self.name}[/] on {target_str} but misses!"
-                if attack_roll_msg:
-                    msg += f" ({attack_roll_msg})"
-                cprint(msg)
+                if wants_event(CombatEventType.MISS):
+                    emit_event(
+                        CombatEvent(
+                            CombatEventType.MISS,
+                            actor=actor,
+                            target=target,
+                            action=self,
+                            total=attack_total,
+                            description=attack_roll_desc,
+                            ac=target_ac,
+                            fumble=is_fumble,
+                        )
+                    )
                 return True
 
         # =====================================================================
@@ -134,7 +144,7 @@ class OffensiveAbility(BaseAbility):
         # If fumble, set damage to 0. If crit, double damage.
         if is_fumble:
             base_damage = 0
-            base_damage_details = ["Fumble: no damage"]
+            base_damage_details = []
         elif is_critical:
             # Roll damage twice and sum for crit
             dmg1, details1 = roll_damage_components_no_mind(actor, target, self.damage)
@@ -157,17 +167,24 @@ class OffensiveAbility(BaseAbility):
                 target.effects_module.add_effect(actor, effect, mind_level)
 
         bonus_damage, bonus_damage_details = self._roll_bonus_damage(actor, target)
-        total_damage = (
-            base_damage + bonus_damage + sum(trigger_damage_bonuses)
-        )  # trigger_damage_bonuses is a list of ints
-        damage_details = base_damage_details + bonus_damage_details
+        trigger_damage, trigger_damage_details = roll_damage_components(
+            actor, target, trigger_damage_bonuses
+        )
+        total_damage = base_damage + bonus_damage + trigger_damage
+        damage_details = (
+            base_damage_details + bonus_damage_details + trigger_damage_details
+        )
 
         # =============================
         # 4b. On-Hit Trigger Messaging (parity with BaseAttack)
         # =============================
-        for trigger in consumed_triggers:
-            trigger_msg = f"    ⚡ {actor_str}'s [bold yellow]{getattr(trigger, 'name', str(trigger))}[/] activates!"
-            cprint(trigger_msg)
+        if wants_event(CombatEventType.TRIGGER_ACTIVATED):
+            for trigger in consumed_triggers:
+                emit_event(
+                    CombatEvent(
+                        CombatEventType.TRIGGER_ACTIVATED, actor=actor, effect=trigger
+                    )
+                )
 
         # =====================================================================
         # 5. EFFECT APPLICATION
@@ -176,49 +193,27 @@ class OffensiveAbility(BaseAbility):
         effect_applied = self._common_apply_effect(actor, target, self.effect)
 
         # =====================================================================
-        # 6. RESULT DISPLAY AND LOGGING
+        # 6. RESULT REPORTING
         # =====================================================================
-        msg = f"    🔥 {actor_str} uses [bold blue]{self.name}[/] on {target_str}"
-        if attack_roll_msg:
-            msg += f" ({attack_roll_msg})"
-
-        if GLOBAL_VERBOSE_LEVEL == 0:
-            msg += f" dealing {total_damage} damage"
-            if is_fumble:
-                msg += " (fumble!)"
-            elif is_critical:
-                msg += " (critical hit!)"
-            if is_dead:
-                msg += f" defeating {target_str}"
-            elif self.effect:
-                if effect_applied:
-                    msg += f" and applying"
-                else:
-                    msg += f" and failing to apply"
-                msg += f" [bold yellow]{self.effect.name}[/]"
-            msg += "."
-        elif GLOBAL_VERBOSE_LEVEL >= 1:
-            if damage_details:
-                msg += f" dealing {total_damage} damage → "
-                msg += " + ".join(damage_details)
-            else:
-                msg += f" dealing {total_damage} damage"
-            if is_fumble:
-                msg += " (fumble!)"
-            elif is_critical:
-                msg += " (critical hit!)"
-            msg += ".\n"
-
-            if is_dead:
-                msg += f"        {target_str} is defeated."
-            elif self.effect:
-                if effect_applied:
-                    msg += f"        {target_str} is affected by"
-                else:
-                    msg += f"        {target_str} resists"
-                msg += f" [bold yellow]{self.effect.name}[/]."
-
-        cprint(msg)
+        if wants_event(CombatEventType.HIT):
+            emit_event(
+                CombatEvent(
+                    CombatEventType.HIT,
+                    actor=actor,
+                    target=target,
+                    action=self,
+                    total=attack_total,
+                    description=attack_roll_desc,
+                    ac=target_ac,
+                    critical=is_critical,
+                    fumble=is_fumble,
+                    amount=total_damage,
+                    damage=damage_details,
+                    defeated=is_dead,
+                    effect=self.effect,
+                    effect_applied=effect_applied,
+                )
+            )
 
         # =====================================================================
         # 7. RETURN
@@ -228,10 +223,12 @@ class OffensiveAbility(BaseAbility):
     # =========================================================================
     # BONUS DAMAGE AND TRIGGER METHODS (for full parity with BaseAttack)
     # =========================================================================
-    def _roll_bonus_damage(self, actor: Any, target: Any) -> tuple[int, list[str]]:
+    def _roll_bonus_damage(
+        self, actor: Any, target: Any
+    ) -> tuple[int, list[CombatEvent]]:
         """Roll any bonus damage from effects (parity with BaseAttack)."""
         all_damage_modifiers = actor.effects_module.get_damage_modifiers()
-        return roll_damage_components_no_mind(actor, target, all_damage_modifiers)
+        return roll_damage_components(actor, target, all_damage_modifiers)
 
     def _trigger_on_hit_effects(self, actor: Any, target: Any):
         """Trigger on-hit effects and return (trigger_damage_bonuses, trigger_effects_with_levels, consumed_triggers)."""
@@ -256,8 +253,7 @@ class OffensiveAbility(BaseAbility):
         is_critical = d20_roll == 20
         is_fumble = d20_roll == 1
         hit = (attack_total >= getattr(target, "AC", 0)) or is_critical
-        msg = f"rolled ({attack_roll_desc}) {attack_total} vs AC {getattr(target, 'AC', '?')}"
-        return hit, attack_total, is_critical, is_fumble, msg
+        return hit, attack_total, is_critical, is_fumble, attack_roll_desc
 
     # ============================================================================
     # DAMAGE CALCULATION METHODS
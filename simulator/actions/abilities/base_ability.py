@@ -15,7 +15,6 @@ from core.constants import (
 )
 from catchery import *
 from core.utils import (
-    debug,
     parse_expr_and_assume_max_roll,
     parse_expr_and_assume_min_roll,
     substitute_variables,
@@ -1,3 +1,4 @@
+from logging import debug
 from typing import Any
 
 from actions.base_action import BaseAction
@@ -6,15 +7,13 @@ from combat.damage import (
     roll_damage_components,
     roll_damage_components_no_mind,
 )
+from combat.events import CombatEvent, CombatEventType, emit_event, wants_event
 from core.constants import (
     ActionCategory,
     ActionType,
     BonusType,
-    GLOBAL_VERBOSE_LEVEL,
-    get_effect_color,
 )
 from catchery import ensure_list_of_type, ensure_string, log_critical, log_warning
-from core.utils import debug, cprint
 from effects.base_effect import Effect
 
 
@@ -122,7 +121,6 @@ class BaseAttack(BaseAction):
             return False
         if not self._validate_character(target):
             return False
-        actor_str, target_str = self._get_display_strings(actor, target)
         debug(f"{actor.name} attempts a {self.name} on {target.name}.")
 
         # =============================
@@ -144,22 +142,36 @@ class BaseAttack(BaseAction):
         )
         is_crit = d20_roll == 20
         is_fumble = d20_roll == 1
-        msg = f"    🎯 {actor_str} attacks {target_str} with [bold blue]{self.name}[/]"
+        if wants_event(CombatEventType.ATTACK_ROLL):
+            emit_event(
+                CombatEvent(
+                    CombatEventType.ATTACK_ROLL,
+                    actor=actor,
+                    target=target,
+                    action=self,
+                    total=attack_total,
+                    description=attack_roll_desc,
+                    ac=target.AC,
+                )
+            )
 
         # =============================
         # 4. Miss/Fumble Handling
         # =============================
-        if is_fumble:
-            if GLOBAL_VERBOSE_LEVEL >= 1:
-                msg += f" rolled ({attack_roll_desc}) [magenta]{attack_total}[/] vs AC [yellow]{target.AC}[/]"
-            msg += " and [magenta]fumble![/]"
-            cprint(msg)
-            return True
-        if attack_total < target.AC and not is_crit:
-            if GLOBAL_VERBOSE_LEVEL >= 1:
-                msg += f" rolled ({attack_roll_desc}) [red]{attack_total}[/] vs AC [yellow]{target.AC}[/]"
-            msg += " and [red]miss![/]"
-            cprint(msg)
+        if is_fumble or (attack_total < target.AC and not is_crit):
+            if wants_event(CombatEventType.MISS):
+                emit_event(
+                    CombatEvent(
+                        CombatEventType.MISS,
+                        actor=actor,
+                        target=target,
+                        action=self,
+                        total=attack_total,
+                        description=attack_roll_desc,
+                        ac=target.AC,
+                        fumble=is_fumble,
+                    )
+                )
             return True
 
         # =============================
@@ -194,42 +206,41 @@ class BaseAttack(BaseAction):
         damage_details = base_damage_details + bonus_damage_details
 
         # =============================
-        # 8. Outcome Messaging & Effects
+        # 8. Outcome & Effects
         # =============================
         is_dead = not target.is_alive()
-        if GLOBAL_VERBOSE_LEVEL == 0:
-            msg += f" dealing {total_damage} damage"
-            if is_dead:
-                msg += f" defeating {target_str}"
-            elif self.effect:
-                if self._common_apply_effect(actor, target, self.effect):
-                    msg += f" and applying"
-                else:
-                    msg += f" and failing to apply"
-                msg += f" [{get_effect_color(self.effect)}]{self.effect.name}[/]"
-            msg += "."
-        elif GLOBAL_VERBOSE_LEVEL >= 1:
-            msg += f" rolled ({attack_roll_desc}) {attack_total} vs AC [yellow]{target.AC}[/] and "
-            msg += f"[magenta]crit![/]\n" if is_crit else "[green]hit![/]\n"
-            msg += f"        Dealing {total_damage} damage to {target_str} → "
-            msg += " + ".join(damage_details) + ".\n"
-            if is_dead:
-                msg += f"        {target_str} is defeated."
-            elif self.effect:
-                if self._common_apply_effect(actor, target, self.effect):
-                    msg += f"        {target_str} is affected by"
-                else:
-                    msg += f"        {target_str} is not affected by"
-                msg += f" [{get_effect_color(self.effect)}]{self.effect.name}[/]."
+        effect_applied = False
+        if not is_dead and self.effect:
+            effect_applied = self._common_apply_effect(actor, target, self.effect)
 
         # =============================
-        # 9. On-Hit Trigger Messaging
+        # 9. On-Hit Trigger & Outcome Events
         # =============================
-        for trigger in consumed_triggers:
-            trigger_msg = f"    ⚡ {actor_str}'s [bold][{get_effect_color(trigger)}]{trigger.name}[/][/] activates!"
-            cprint(trigger_msg)
-
-        cprint(msg)
+        if wants_event(CombatEventType.TRIGGER_ACTIVATED):
+            for trigger in consumed_triggers:
+                emit_event(
+                    CombatEvent(
+                        CombatEventType.TRIGGER_ACTIVATED, actor=actor, effect=trigger
+                    )
+                )
+        if wants_event(CombatEventType.HIT):
+            emit_event(
+                CombatEvent(
+                    CombatEventType.HIT,
+                    actor=actor,
+                    target=target,
+                    action=self,
+                    total=attack_total,
+                    description=attack_roll_desc,
+                    ac=target.AC,
+                    critical=is_crit,
+                    amount=total_damage,
+                    damage=damage_details,
+                    defeated=is_dead,
+                    effect=self.effect,
+                    effect_applied=effect_applied,
+                )
+            )
         return True
 
     # ============================================================================
@@ -1,11 +1,13 @@
+from collections.abc import Mapping
 from logging import debug
 from typing import Any, Tuple
 
 from combat.damage import (
     DamageComponent,
     roll_and_describe,
-    roll_damage_components_no_mind,
+    roll_damage_components,
 )
+from combat.events import CombatEvent, CombatEventType, emit_event, wants_event
 from core.utils import (
     parse_expr_and_assume_max_roll,
     parse_expr_and_assume_min_roll,
@@ -222,6 +224,10 @@ class BaseAction:
     ) -> bool:
         """Apply an effect to a target character.
 
+        The effects that could not be applied are reported with an
+        EFFECT_APPLIED event, the ones applied are reported by the target's
+        effects module.
+
         Args:
             actor: The character applying the effect
             target: The character receiving the effect
@@ -239,21 +245,34 @@ class BaseAction:
         # Validate effect is provided and is an instance of Effect.
         if not effect or not isinstance(effect, Effect):
             return False
-        # Ensure both actor and target are alive.
-        if not actor.is_alive() or not target.is_alive():
-            return False
         # Validate and correct mind_level.
         mind_level = ensure_non_negative_int(mind_level, "mind level", 0)
-        # Try to apply the effect using the target's effects module.
-        if target.effects_module.add_effect(actor, effect, mind_level, self):
-            return True
+        # Try to apply the effect using the target's effects module, provided
+        # both actor and target are alive.
+        if actor.is_alive() and target.is_alive():
+            if target.effects_module.add_effect(actor, effect, mind_level, self):
+                return True
+        if wants_event(CombatEventType.EFFECT_APPLIED):
+            emit_event(
+                CombatEvent(
+                    CombatEventType.EFFECT_APPLIED,
+                    actor=actor,
+                    target=target,
+                    action=self,
+                    effect=effect,
+                    mind_level=mind_level,
+                    effect_applied=False,
+                )
+            )
         return False
 
     # ============================================================================
     # COMBAT SYSTEM METHODS
     # ============================================================================
 
-    def _roll_bonus_damage(self, actor: Any, target: Any) -> tuple[int, list[str]]:
+    def _roll_bonus_damage(
+        self, actor: Any, target: Any
+    ) -> tuple[int, list[CombatEvent]]:
         """Roll any bonus damage from effects.
 
         Args:
@@ -261,10 +280,10 @@ class BaseAction:
             target: The target character
 
         Returns:
-            tuple[int, list[str]]: (bonus_damage, damage_descriptions)
+            tuple[int, list[CombatEvent]]: (bonus_damage, damage_events)
         """
         all_damage_modifiers = actor.effects_module.get_damage_modifiers()
-        return roll_damage_components_no_mind(actor, target, all_damage_modifiers)
+        return roll_damage_components(actor, target, all_damage_modifiers)
 
     def _roll_attack_with_crit(
         self, actor, attack_bonus_expr: str, bonus_list: list[str]
@@ -293,11 +312,11 @@ class BaseAction:
             if bonus:  # Only add non-empty bonuses
                 expr += f" + {bonus}"
 
-        # Get actor variables and ensure it's a dict
+        # Get actor variables and ensure it's a mapping
         variables = actor.get_expression_variables()
-        if not isinstance(variables, dict):
+        if not isinstance(variables, Mapping):
             log_warning(
-                f"Actor expression variables must be dict, got: {type(variables).__name__}, using empty dict",
+                f"Actor expression variables must be a mapping, got: {type(variables).__name__}, using empty dict",
                 {
                     "variables": variables,
                     "actor": safe_get_attribute(actor, "name", "Unknown"),
@@ -404,9 +423,8 @@ class BaseAction:
             )
             extra_variables = {}
         # Get the base character variables.
-        variables = actor.get_expression_variables()
-        # Add the extra variables for this action.
-        variables.update(extra_variables)
+        # Get the character variables, with the extra variables for this action.
+        variables = actor.get_expression_variables().with_variables(extra_variables)
         # Build the full expression by substituting each component's damage roll.
         return " + ".join(
             substitute_variables(component.damage_roll, variables)
@@ -446,14 +464,11 @@ class BaseAction:
             )
             extra_variables = {}
         # Get the base character variables.
-        variables = actor.get_expression_variables()
-        # Add the extra variables for this action.
-        variables.update(extra_variables)
+        # Get the character variables, with the extra variables for this action.
+        variables = actor.get_expression_variables().with_variables(extra_variables)
         # Calculate the minimum damage by assuming all dice roll their minimum values.
         return sum(
-            parse_expr_and_assume_min_roll(
-                substitute_variables(component.damage_roll, variables)
-            )
+            parse_expr_and_assume_min_roll(component.damage_roll, variables)
             for component in damage_components
         )
 
@@ -490,14 +505,11 @@ class BaseAction:
             )
             extra_variables = {}
         # Get the base character variables.
-        variables = actor.get_expression_variables()
-        # Add the extra variables for this action.
-        variables.update(extra_variables)
+        # Get the character variables, with the extra variables for this action.
+        variables = actor.get_expression_variables().with_variables(extra_variables)
         # Calculate the maximum damage by assuming all dice roll their maximum values.
         return sum(
-            parse_expr_and_assume_max_roll(
-                substitute_variables(component.damage_roll, variables)
-            )
+            parse_expr_and_assume_max_roll(component.damage_roll, variables)
             for component in damage_components
         )
 
@@ -515,8 +527,6 @@ class BaseAction:
         Returns:
             bool: True if the target is valid for this action, False otherwise.
         """
-        from core.constants import ActionCategory
-
         # Validate actor and target.
         if not self._validate_character(actor):
             return False
@@ -527,39 +537,39 @@ class BaseAction:
         if not actor.is_alive() or not target.is_alive():
             return False
 
-        def _is_relationship_valid(actor: Any, target: Any, is_ally: bool) -> bool:
-            """Helper to check if actor and target have the correct relationship."""
-            are_opponents = is_oponent(actor.char_type, target.char_type)
-            if is_ally:
-                return not are_opponents
-            else:
-                return are_opponents
+        if not self.is_valid_relationship(actor, target):
+            return False
+        # Healing targets must be wounded.
+        if self.requires_wounded_target(actor, target):
+            return target.hp < target.HP_MAX
+        return True
 
-        # Check each restriction - return True on first match (OR logic).
-        for restriction in self.target_restrictions:
-            if restriction == "SELF" and actor == target:
-                return True
-            if restriction == "ALLY" and _is_relationship_valid(actor, target, True):
-                return True
-            if restriction == "ENEMY" and _is_relationship_valid(actor, target, False):
-                return True
-            if restriction == "ANY":
-                return True
+    def is_valid_relationship(self, actor: Any, target: Any) -> bool:
+        """Check if the relationship between actor and target allows this
+        action, whatever their state. It only depends on their factions, and
+        on whether the target is the actor.
+
+        Args:
+            actor (Any): The character performing the action.
+            target (Any): The potential target character.
+
+        Returns:
+            bool: True if the actor may target the target with this action.
+        """
+        from core.constants import ActionCategory
+
+        if self._matches_target_restrictions(actor, target):
+            return True
 
         # Otherwise, fall back to category-based default targeting.
 
         # Offensive actions target enemies (not self, must be opponents).
         if self.category == ActionCategory.OFFENSIVE:
-            # Offensive actions target enemies (not self, must be opponents)
             return target != actor and is_oponent(actor.char_type, target.char_type)
 
-        # Healing actions target self and allies (not enemies, not at full health for healing)
+        # Healing actions target self and allies.
         if self.category == ActionCategory.HEALING:
-            if target == actor:
-                return target.hp < target.HP_MAX
-            if not is_oponent(actor.char_type, target.char_type):
-                return target.hp < target.HP_MAX
-            return False
+            return target == actor or not is_oponent(actor.char_type, target.char_type)
 
         # Buff actions target self and allies.
         if self.category == ActionCategory.BUFF:
@@ -580,6 +590,46 @@ class BaseAction:
         # Unknown category - default to no targeting.
         return False
 
+    def requires_wounded_target(self, actor: Any, target: Any) -> bool:
+        """Check if the target must be below its maximum HP to be targeted,
+        as for healing actions without a matching target restriction.
+
+        Args:
+            actor (Any): The character performing the action.
+            target (Any): The potential target character.
+
+        Returns:
+            bool: True if only a wounded target is valid.
+        """
+        from core.constants import ActionCategory
+
+        return self.category == ActionCategory.HEALING and not (
+            self._matches_target_restrictions(actor, target)
+        )
+
+    def _matches_target_restrictions(self, actor: Any, target: Any) -> bool:
+        """Check if any target restriction of this action allows the target.
+
+        Args:
+            actor (Any): The character performing the action.
+            target (Any): The potential target character.
+
+        Returns:
+            bool: True on the first matching restriction (OR logic).
+        """
+        for restriction in self.target_restrictions:
+            if restriction == "SELF" and actor == target:
+                return True
+            if restriction == "ALLY" and not is_oponent(
+                actor.char_type, target.char_type
+            ):
+                return True
+            if restriction == "ENEMY" and is_oponent(actor.char_type, target.char_type):
+                return True
+            if restriction == "ANY":
+                return True
+        return False
+
     # ============================================================================
     # UTILITY METHODS
     # ============================================================================
@@ -127,8 +127,7 @@ class Spell(BaseAction):
             int: Number of targets (minimum 1, even for invalid expressions).
         """
         if self.target_expr:
-            variables = actor.get_expression_variables()
-            variables["MIND"] = mind_level
+            variables = actor.get_expression_variables(mind_level)
             # Evaluate the multi-target expression to get the number of targets.
             return evaluate_expression(self.target_expr, variables)
         return 1
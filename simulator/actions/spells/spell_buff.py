@@ -8,12 +8,10 @@ from core.constants import (
     ActionCategory,
     ActionType,
     BonusType,
-    get_effect_color,
 )
 from catchery import *
 from core.utils import (
     substitute_variables,
-    cprint,
 )
 from effects.base_effect import Effect
 from effects.modifier_effect import ModifierEffect
@@ -114,25 +112,9 @@ class SpellBuff(Spell):
         if self.requires_concentration:
             actor.concentration_module.break_concentration()
 
-        # Format character strings for output.
-        actor_str, target_str = self._get_display_strings(actor, target)
-
-        # Apply the beneficial effect
-        effect_applied = False
+        # Apply the beneficial effect, which reports whether it was applied.
         if self.effect:
-            effect_applied = self._common_apply_effect(
-                actor, target, self.effect, mind_level
-            )
-
-        # Display enhancement results
-        msg = f"    ✨ {actor_str} casts [bold]{self.name}[/] on {target_str} "
-        if effect_applied:
-            msg += f"applying [{get_effect_color(self.effect)}]{self.effect.name}[/]"
-        else:
-            msg += f"but fails to apply [{get_effect_color(self.effect)}]{self.effect.name}[/]"
-        msg += "."
-
-        cprint(msg)
+            self._common_apply_effect(actor, target, self.effect, mind_level)
 
         return True
 
@@ -155,8 +137,7 @@ class SpellBuff(Spell):
         if mind_level is None:
             mind_level = 1
 
-        variables = actor.get_expression_variables()
-        variables["MIND"] = mind_level
+        variables = actor.get_expression_variables(mind_level)
         expressions: dict[BonusType, str] = {}
 
         # Handle effects that have modifiers (ModifierEffect)
@@ -8,12 +8,10 @@ from core.constants import (
     ActionCategory,
     ActionType,
     BonusType,
-    get_effect_color,
 )
 from catchery import *
 from core.utils import (
     substitute_variables,
-    cprint,
 )
 from effects.base_effect import Effect
 from combat.damage import DamageComponent
@@ -113,34 +111,9 @@ class SpellDebuff(Spell):
         if self.requires_concentration:
             actor.concentration_module.break_concentration()
 
-        # Format character strings for output.
-        actor_str, target_str = self._get_display_strings(actor, target)
-
-        # Apply the detrimental effect
-        effect_applied = False
-        save_result = None
+        # Apply the detrimental effect, which reports whether it was applied.
         if self.effect:
-            effect_applied = self._common_apply_effect(
-                actor, target, self.effect, mind_level
-            )
-
-            # Check if target made a successful save (effect-dependent)
-            if hasattr(self.effect, "save_type") and hasattr(self.effect, "save_dc"):
-                # This would be handled within apply_effect, but we can track the result
-                # for better feedback messages
-                pass
-
-        # Display debuff results with save information
-        msg = f"    🔮 {actor_str} casts [bold]{self.name}[/] on {target_str} "
-        if effect_applied:
-            msg += f"applying [{get_effect_color(self.effect)}]{self.effect.name}[/]"
-        else:
-            msg += f"but fails to apply [{get_effect_color(self.effect)}]{self.effect.name}[/]"
-            if save_result:
-                msg += f" (saved)"
-        msg += "."
-
-        cprint(msg)
+            self._common_apply_effect(actor, target, self.effect, mind_level)
 
         return True
 
@@ -163,8 +136,7 @@ class SpellDebuff(Spell):
         if mind_level is None:
             mind_level = 1
 
-        variables = actor.get_expression_variables()
-        variables["MIND"] = mind_level
+        variables = actor.get_expression_variables(mind_level)
         expressions: dict[BonusType, str] = {}
 
         # Handle effects that have modifiers (ModifierEffect)
@@ -4,20 +4,14 @@ from logging import debug
 from typing import Any
 
 from actions.spells.base_spell import Spell
-from core.constants import (
-    ActionCategory,
-    ActionType,
-    GLOBAL_VERBOSE_LEVEL,
-    get_effect_color,
-)
+from combat.events import CombatEvent, CombatEventType, emit_event, wants_event
+from core.constants import ActionCategory, ActionType
 from catchery import *
 from core.utils import (
     parse_expr_and_assume_max_roll,
     parse_expr_and_assume_min_roll,
     roll_and_describe,
     simplify_expression,
-    substitute_variables,
-    cprint,
 )
 from effects.base_effect import Effect, ensure_effect
 
@@ -127,12 +121,8 @@ class SpellHeal(Spell):
         if self.requires_concentration:
             actor.concentration_module.break_concentration()
 
-        # Format character strings for output.
-        actor_str, target_str = self._get_display_strings(actor, target)
-
         # Calculate healing with level scaling
-        variables = actor.get_expression_variables()
-        variables["MIND"] = mind_level
+        variables = actor.get_expression_variables(mind_level)
         heal_value, heal_desc, _ = roll_and_describe(self.heal_roll, variables)
 
         # Apply healing to target (limited by max HP)
@@ -145,19 +135,22 @@ class SpellHeal(Spell):
                 actor, target, self.effect, mind_level
             )
 
-        # Display healing results
-        msg = f"    ✳️ {actor_str} casts [bold]{self.name}[/] on {target_str}"
-        msg += f" healing for [bold green]{actual_healed}[/]"
-        if GLOBAL_VERBOSE_LEVEL >= 1:
-            msg += f" ({heal_desc})"
-        if effect_applied and self.effect:
-            msg += (
-                f" and applying [{get_effect_color(self.effect)}]{self.effect.name}[/]"
+        # Report the results.
+        if wants_event(CombatEventType.HEAL):
+            emit_event(
+                CombatEvent(
+                    CombatEventType.HEAL,
+                    actor=actor,
+                    target=target,
+                    action=self,
+                    mind_level=mind_level,
+                    base=heal_value,
+                    amount=actual_healed,
+                    description=heal_desc,
+                    effect=self.effect,
+                    effect_applied=effect_applied,
+                )
             )
-        elif self.effect and not effect_applied:
-            msg += f" but failing to apply [{get_effect_color(self.effect)}]{self.effect.name}[/]"
-        msg += "."
-        cprint(msg)
 
         return True
 
@@ -178,8 +171,7 @@ class SpellHeal(Spell):
         if mind_level is None:
             mind_level = 1
 
-        variables = actor.get_expression_variables()
-        variables["MIND"] = mind_level
+        variables = actor.get_expression_variables(mind_level)
         return simplify_expression(self.heal_roll, variables)
 
     def get_min_heal(self, actor: Any, mind_level: int = 1) -> int:
@@ -195,11 +187,8 @@ class SpellHeal(Spell):
         if mind_level is None:
             mind_level = 1
 
-        variables = actor.get_expression_variables()
-        variables["MIND"] = mind_level
-        return parse_expr_and_assume_min_roll(
-            substitute_variables(self.heal_roll, variables)
-        )
+        variables = actor.get_expression_variables(mind_level)
+        return parse_expr_and_assume_min_roll(self.heal_roll, variables)
 
     def get_max_heal(self, actor: Any, mind_level: int = 1) -> int:
         """Calculate the maximum possible healing for the spell.
@@ -214,8 +203,5 @@ class SpellHeal(Spell):
         if mind_level is None:
             mind_level = 1
 
-        variables = actor.get_expression_variables()
-        variables["MIND"] = mind_level
-        return parse_expr_and_assume_max_roll(
-            substitute_variables(self.heal_roll, variables)
-        )
+        variables = actor.get_expression_variables(mind_level)
+        return parse_expr_and_assume_max_roll(self.heal_roll, variables)
@@ -5,19 +5,17 @@ from typing import Any
 
 from actions.spells.base_spell import Spell
 from combat.damage import DamageComponent, roll_damage_components
+from combat.events import CombatEvent, CombatEventType, emit_event, wants_event
 from core.constants import (
     ActionCategory,
     ActionType,
     BonusType,
-    GLOBAL_VERBOSE_LEVEL,
-    get_effect_color,
 )
 from catchery import *
 from core.utils import (
     parse_expr_and_assume_max_roll,
     parse_expr_and_assume_min_roll,
     substitute_variables,
-    cprint,
 )
 from effects.base_effect import Effect
 
@@ -133,9 +131,6 @@ class SpellAttack(Spell):
         if self.requires_concentration:
             actor.concentration_module.break_concentration()
 
-        # Format character strings for output.
-        actor_str, target_str = self._get_display_strings(actor, target)
-
         # Calculate spell attack components
         spell_attack_bonus = actor.get_spell_attack_bonus(self.level)
         attack_modifier = actor.effects_module.get_modifier(BonusType.ATTACK)
@@ -148,23 +143,36 @@ class SpellAttack(Spell):
         # Determine special outcomes
         is_crit = d20_roll == 20
         is_fumble = d20_roll == 1
+        if wants_event(CombatEventType.ATTACK_ROLL):
+            emit_event(
+                CombatEvent(
+                    CombatEventType.ATTACK_ROLL,
+                    actor=actor,
+                    target=target,
+                    action=self,
+                    mind_level=mind_level,
+                    total=attack_total,
+                    description=attack_roll_desc,
+                    ac=target.AC,
+                )
+            )
 
-        msg = f"    🎯 {actor_str} casts [bold]{self.name}[/] on {target_str}"
-
-        # Handle fumble (always misses)
-        if is_fumble:
-            if GLOBAL_VERBOSE_LEVEL >= 1:
-                msg += f" rolled ({attack_roll_desc}) [magenta]{attack_total}[/] vs AC [yellow]{target.AC}[/]"
-            msg += " and [magenta]fumble![/]"
-            cprint(msg)
-            return True
-
-        # Handle miss (unless critical hit)
-        if attack_total < target.AC and not is_crit:
-            if GLOBAL_VERBOSE_LEVEL >= 1:
-                msg += f" rolled ({attack_roll_desc}) [red]{attack_total}[/] vs AC [yellow]{target.AC}[/]"
-            msg += " and [red]miss![/]"
-            cprint(msg)
+        # Handle fumble (always misses) and miss (unless critical hit)
+        if is_fumble or (attack_total < target.AC and not is_crit):
+            if wants_event(CombatEventType.MISS):
+                emit_event(
+                    CombatEvent(
+                        CombatEventType.MISS,
+                        actor=actor,
+                        target=target,
+                        action=self,
+                        mind_level=mind_level,
+                        total=attack_total,
+                        description=attack_roll_desc,
+                        ac=target.AC,
+                        fumble=is_fumble,
+                    )
+                )
             return True
 
         # Handle successful hit - calculate and apply damage
@@ -183,25 +191,25 @@ class SpellAttack(Spell):
                 actor, target, self.effect, mind_level
             )
 
-        # Display combat results with appropriate detail level
-        if GLOBAL_VERBOSE_LEVEL == 0:
-            msg += f" dealing {total_damage} damage"
-            if is_dead:
-                msg += f" defeating {target_str}"
-            elif effect_applied and self.effect:
-                msg += f" and applying [{get_effect_color(self.effect)}]{self.effect.name}[/]"
-            msg += "."
-        elif GLOBAL_VERBOSE_LEVEL >= 1:
-            msg += f" rolled ({attack_roll_desc}) {attack_total} vs AC [yellow]{target.AC}[/] → "
-            msg += "[magenta]crit![/]\n" if is_crit else "[green]hit![/]\n"
-            msg += f"        Dealing {total_damage} damage to {target_str} → "
-            msg += " + ".join(damage_details) + ".\n"
-            if is_dead:
-                msg += f"        {target_str} is defeated."
-            elif effect_applied and self.effect:
-                msg += f"        {target_str} is affected by "
-                msg += f"[{get_effect_color(self.effect)}]{self.effect.name}[/]."
-        cprint(msg)
+        if wants_event(CombatEventType.HIT):
+            emit_event(
+                CombatEvent(
+                    CombatEventType.HIT,
+                    actor=actor,
+                    target=target,
+                    action=self,
+                    mind_level=mind_level,
+                    total=attack_total,
+                    description=attack_roll_desc,
+                    ac=target.AC,
+                    critical=is_crit,
+                    amount=total_damage,
+                    damage=damage_details,
+                    defeated=is_dead,
+                    effect=self.effect,
+                    effect_applied=effect_applied,
+                )
+            )
 
         return True
 
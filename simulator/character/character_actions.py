@@ -7,6 +7,7 @@ from actions.base_action import BaseAction
 from actions.attacks import BaseAttack, NaturalAttack, WeaponAttack
 from actions.spells import Spell
 from core.constants import ActionType
+from core.scheduler import ExpiryScheduler
 from catchery import *
 
 if TYPE_CHECKING:
@@ -30,11 +31,26 @@ class CharacterActions:
             "standard_action_used": False,
             "bonus_action_used": False,
         }
+        # Clock of the cooldowns, the character's `cooldowns` map each action
+        # name to the turn of this clock on which its cooldown ends.
+        self.cooldown_scheduler: ExpiryScheduler = ExpiryScheduler()
+        # Available actions of each kind, computed on first use. The spells
+        # also depend on the mind, which is part of their key.
+        self._available: dict[Any, Any] = {}
+
+    def invalidate(self) -> None:
+        """Discard the cached available actions.
+
+        Must be called whenever the turn flags, the cooldowns, the known
+        actions, the weapons or the incapacitation of the character change.
+        """
+        self._available.clear()
 
     def reset_turn_flags(self) -> None:
         """Reset the turn flags for the character."""
         self.turn_flags["standard_action_used"] = False
         self.turn_flags["bonus_action_used"] = False
+        self._available.clear()
 
     def use_action_type(self, action_type: ActionType) -> None:
         """Mark an action type as used for the current turn.
@@ -46,6 +62,7 @@ class CharacterActions:
             self.turn_flags["standard_action_used"] = True
         elif action_type == ActionType.BONUS:
             self.turn_flags["bonus_action_used"] = True
+        self._available.clear()
 
     def has_action_type(self, action_type: ActionType) -> bool:
         """Check if the character can use a specific action type this turn.
@@ -72,7 +89,10 @@ class CharacterActions:
         Returns:
             List[NaturalAttack]: A list of natural weapon attacks.
         """
-        result: List[NaturalAttack] = []
+        result: List[NaturalAttack] | None = self._available.get("natural_attacks")
+        if result is not None:
+            return list(result)
+        result = []
         # Iterate through the natural weapons and check if they are available.
         for weapon in self._character.natural_weapons:
             for attack in weapon.attacks:
@@ -83,7 +103,8 @@ class CharacterActions:
                 # Only include NaturalAttack instances
                 if isinstance(attack, NaturalAttack):
                     result.append(attack)
-        return result
+        self._available["natural_attacks"] = result
+        return list(result)
 
     def get_available_weapon_attacks(self) -> List["WeaponAttack"]:
         """Return a list of weapon attacks that the character can use this turn.
@@ -91,7 +112,10 @@ class CharacterActions:
         Returns:
             List[WeaponAttack]: A list of weapon attacks.
         """
-        result: List[WeaponAttack] = []
+        result: List[WeaponAttack] | None = self._available.get("weapon_attacks")
+        if result is not None:
+            return list(result)
+        result = []
         # Iterate through the equipped weapons and check if they are available.
         for weapon in self._character.equipped_weapons:
             for attack in weapon.attacks:
@@ -102,7 +126,8 @@ class CharacterActions:
                 # Only include WeaponAttack instances
                 if isinstance(attack, WeaponAttack):
                     result.append(attack)
-        return result
+        self._available["weapon_attacks"] = result
+        return list(result)
 
     def get_available_attacks(self) -> List[BaseAction]:
         """Return a list of all attacks (weapon + natural) that the character can use this turn.
@@ -121,13 +146,17 @@ class CharacterActions:
         Returns:
             List[BaseAction]: A list of available actions.
         """
-        available_actions: List[BaseAction] = []
+        available_actions: List[BaseAction] | None = self._available.get("actions")
+        if available_actions is not None:
+            return list(available_actions)
+        available_actions = []
         for action in self._character.actions.values():
             if not self.is_on_cooldown(action) and self.has_action_type(
                 action.action_type
             ):
                 available_actions.append(action)
-        return available_actions
+        self._available["actions"] = available_actions
+        return list(available_actions)
 
     def get_available_spells(self) -> List[Spell]:
         """Return a list of spells that the character can use this turn.
@@ -135,7 +164,11 @@ class CharacterActions:
         Returns:
             List[Spell]: A list of available spells.
         """
-        available_spells: List[Spell] = []
+        key = ("spells", self._character.mind)
+        available_spells: List[Spell] | None = self._available.get(key)
+        if available_spells is not None:
+            return list(available_spells)
+        available_spells = []
         for spell in self._character.spells.values():
             if not self.is_on_cooldown(spell) and self.has_action_type(
                 spell.action_type
@@ -145,7 +178,8 @@ class CharacterActions:
                     spell.mind_cost[0] if spell.mind_cost else 0
                 ):
                     available_spells.append(spell)
-        return available_spells
+        self._available[key] = available_spells
+        return list(available_spells)
 
     def turn_done(self) -> bool:
         """Check if the character has used both a standard and bonus action this turn.
@@ -153,13 +187,17 @@ class CharacterActions:
         Returns:
             bool: True if the character's turn is done, False if they can still act.
         """
-        available_actions: List[BaseAction] = (
-            self.get_available_actions() + self.get_available_spells()
-        )
-        # Check if the character has any bonus actions available.
-        has_bonus_actions: bool = any(
-            action.action_type == ActionType.BONUS for action in available_actions
-        )
+        key = ("has_bonus_actions", self._character.mind)
+        has_bonus_actions: bool | None = self._available.get(key)
+        if has_bonus_actions is None:
+            available_actions: List[BaseAction] = (
+                self.get_available_actions() + self.get_available_spells()
+            )
+            # Check if the character has any bonus actions available.
+            has_bonus_actions = any(
+                action.action_type == ActionType.BONUS for action in available_actions
+            )
+            self._available[key] = has_bonus_actions
         if has_bonus_actions and not self.turn_flags["bonus_action_used"]:
             return False
         return self.turn_flags["standard_action_used"]
@@ -171,7 +209,9 @@ class CharacterActions:
             action (BaseAction): The action to add a cooldown to.
         """
         if action.name not in self._character.cooldowns and action.has_cooldown():
-            self._character.cooldowns[action.name] = action.get_cooldown()
+            entry = self.cooldown_scheduler.schedule(action.name, action.get_cooldown())
+            self._character.cooldowns[action.name] = entry.expires_at
+            self._available.clear()
 
     def is_on_cooldown(self, action: BaseAction) -> bool:
         """Check if an action is currently on cooldown.
@@ -182,7 +222,21 @@ class CharacterActions:
         Returns:
             bool: True if the action is on cooldown, False otherwise.
         """
-        return self._character.cooldowns.get(action.name, 0) > 0
+        return self.get_cooldown_remaining(action.name) > 0
+
+    def get_cooldown_remaining(self, action_name: str) -> int:
+        """Return the remaining turns of cooldown of an action.
+
+        Args:
+            action_name (str): The name of the action.
+
+        Returns:
+            int: The remaining turns, 0 if the action is not on cooldown.
+        """
+        expires_at = self._character.cooldowns.get(action_name)
+        if expires_at is None:
+            return 0
+        return max(expires_at - self.cooldown_scheduler.now, 0)
 
     def initialize_uses(self, action: BaseAction) -> None:
         """Initialize the uses of an action to its maximum uses.
@@ -247,16 +301,35 @@ class CharacterActions:
     def turn_update(self) -> None:
         """Update the duration of all active effects and cooldowns."""
         self._character.effects_module.turn_update()
-        # Iterate the cooldowns and decrement them.
-        for action_name in list(self._character.cooldowns.keys()):
-            if self._character.cooldowns[action_name] > 0:
-                self._character.cooldowns[action_name] -= 1
-        # Clear expired cooldowns.
-        self._character.cooldowns = {
-            action_name: cd
-            for action_name, cd in self._character.cooldowns.items()
-            if cd > 0
-        }
+        # Clear the cooldowns ending on this turn.
+        for action_name in self.cooldown_scheduler.advance():
+            self._character.cooldowns.pop(action_name, None)
+            self._available.clear()
+
+    def get_state(self) -> tuple[bool, bool, Any]:
+        """Return the turn state, to restore it later with `set_state`.
+
+        Returns:
+            tuple[bool, bool, Any]: The turn flags and the state of the
+                cooldown clock.
+        """
+        return (
+            self.turn_flags["standard_action_used"],
+            self.turn_flags["bonus_action_used"],
+            self.cooldown_scheduler.get_state(),
+        )
+
+    def set_state(self, state: tuple[bool, bool, Any]) -> None:
+        """Restore a turn state returned by `get_state`.
+
+        Args:
+            state (tuple[bool, bool, Any]): The state.
+        """
+        standard_used, bonus_used, cooldowns = state
+        self.turn_flags["standard_action_used"] = standard_used
+        self.turn_flags["bonus_action_used"] = bonus_used
+        self.cooldown_scheduler.set_state(cooldowns)
+        self._available.clear()
 
     def learn_action(self, action: BaseAction) -> None:
         """Add an Action object to the character's known actions.
@@ -267,6 +340,7 @@ class CharacterActions:
         if not action.name.lower() in self._character.actions:
             self._character.actions[action.name.lower()] = action
             debug(f"{self._character.name} learned {action.name}!")
+            self._available.clear()
 
     def unlearn_action(self, action: BaseAction) -> None:
         """Remove an Action object from the character's known actions.
@@ -277,6 +351,7 @@ class CharacterActions:
         if action.name.lower() in self._character.actions:
             del self._character.actions[action.name.lower()]
             debug(f"{self._character.name} unlearned {action.name}!")
+            self._available.clear()
 
     def learn_spell(self, spell: Spell) -> None:
         """
@@ -288,6 +363,7 @@ class CharacterActions:
         if not spell.name.lower() in self._character.spells:
             self._character.spells[spell.name.lower()] = spell
             debug(f"{self._character.name} learned {spell.name}!")
+            self._available.clear()
 
     def unlearn_spell(self, spell: Spell) -> None:
         """
@@ -299,3 +375,4 @@ class CharacterActions:
         if spell.name.lower() in self._character.spells:
             del self._character.spells[spell.name.lower()]
             debug(f"{self._character.name} unlearned {spell.name}!")
+            self._available.clear()
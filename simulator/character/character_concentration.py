@@ -1,8 +1,8 @@
 """Character concentration management module for D&D 5e-style spellcasting."""
 
-from typing import Any, Dict, List, Optional
-from core.utils import cprint
+from typing import Any, Callable, Dict, List, Optional
 from actions.spells import Spell
+from combat.events import CombatEvent, CombatEventType, emit_event, wants_event
 
 
 class ConcentrationSpell:
@@ -138,17 +138,8 @@ class CharacterConcentration:
         oldest_spell_key = next(iter(self.concentration_spells))
         oldest_conc_spell = self.concentration_spells[oldest_spell_key]
 
-        # Show message about breaking concentration
-        target_names = [target.name for target in oldest_conc_spell.targets]
-        if len(target_names) == 1:
-            cprint(
-                f"    :no_entry: [bold yellow]{oldest_conc_spell.spell.name}[/] concentration broken on [bold]{target_names[0]}[/] (concentration limit reached)."
-            )
-        else:
-            targets_str = ", ".join(target_names)
-            cprint(
-                f"    :no_entry: [bold yellow]{oldest_conc_spell.spell.name}[/] concentration broken on [bold]{targets_str}[/] (concentration limit reached)."
-            )
+        # Report the broken concentration
+        self._report_broken(oldest_conc_spell, "concentration limit reached")
 
         # Remove all effects for this concentration spell
         for active_effect in oldest_conc_spell.active_effects:
@@ -157,6 +148,24 @@ class CharacterConcentration:
         # Remove the concentration spell
         del self.concentration_spells[oldest_spell_key]
 
+    def _report_broken(self, conc_spell: ConcentrationSpell, reason: str = "") -> None:
+        """Emit the CONCENTRATION_BROKEN event of a concentration spell.
+
+        Args:
+            conc_spell: The concentration spell being broken
+            reason: Why the concentration was broken, if not by the caster
+        """
+        if wants_event(CombatEventType.CONCENTRATION_BROKEN):
+            emit_event(
+                CombatEvent(
+                    CombatEventType.CONCENTRATION_BROKEN,
+                    actor=conc_spell.caster,
+                    action=conc_spell.spell,
+                    targets=list(conc_spell.targets),
+                    description=reason,
+                )
+            )
+
     def break_concentration(self, spell: Optional[Spell] = None) -> bool:
         """Break concentration on a specific spell or all concentration spells.
 
@@ -172,17 +181,8 @@ class CharacterConcentration:
             if spell_key in self.concentration_spells:
                 conc_spell = self.concentration_spells[spell_key]
 
-                # Show message
-                target_names = [target.name for target in conc_spell.targets]
-                if len(target_names) == 1:
-                    cprint(
-                        f"    :no_entry: [bold yellow]{spell.name}[/] concentration broken on [bold]{target_names[0]}[/]."
-                    )
-                else:
-                    targets_str = ", ".join(target_names)
-                    cprint(
-                        f"    :no_entry: [bold yellow]{spell.name}[/] concentration broken on [bold]{targets_str}[/]."
-                    )
+                # Report the broken concentration
+                self._report_broken(conc_spell)
 
                 # Remove all effects for this spell
                 for active_effect in conc_spell.active_effects:
@@ -194,31 +194,14 @@ class CharacterConcentration:
         else:
             # Break all concentration
             if self.concentration_spells:
-                spell_info = []
-                for conc_spell in self.concentration_spells.values():
-                    target_names = [target.name for target in conc_spell.targets]
-                    spell_info.append((conc_spell.spell.name, target_names))
+                for conc_spell in list(self.concentration_spells.values()):
+                    # Report the broken concentration
+                    self._report_broken(conc_spell)
 
                     # Remove all effects
                     for active_effect in conc_spell.active_effects:
                         active_effect.target.effects_module.remove_effect(active_effect)
 
-                # Show message
-                if len(spell_info) == 1:
-                    spell_name, target_names = spell_info[0]
-                    targets_str = ", ".join(target_names)
-                    cprint(
-                        f"    :no_entry: [bold yellow]{spell_name}[/] concentration broken on [bold]{targets_str}[/]."
-                    )
-                else:
-                    spell_descriptions = [
-                        f"{name} on {', '.join(targets)}"
-                        for name, targets in spell_info
-                    ]
-                    cprint(
-                        f"    :no_entry: All concentration broken: [bold yellow]{'; '.join(spell_descriptions)}[/]."
-                    )
-
                 # Clear all concentration
                 self.concentration_spells.clear()
                 return True
@@ -240,3 +223,57 @@ class CharacterConcentration:
             List[ConcentrationSpell]: A list containing all active concentration spells
         """
         return list(self.concentration_spells.values())
+
+    def get_state(self, encode: Callable[[Any], Any]) -> tuple:
+        """Capture the concentration spells, to restore them later with `set_state`.
+
+        The active effects are referenced by their target and their position
+        among the active effects of the target.
+
+        Args:
+            encode: Maps the targets to references that `set_state` can resolve
+
+        Returns:
+            tuple: The state
+        """
+        state = []
+        for spell_key, conc_spell in self.concentration_spells.items():
+            effects = []
+            for active_effect in conc_spell.active_effects:
+                target_effects = active_effect.target.effects_module.active_effects
+                if active_effect in target_effects:
+                    effects.append(
+                        (
+                            encode(active_effect.target),
+                            target_effects.index(active_effect),
+                        )
+                    )
+            state.append(
+                (
+                    spell_key,
+                    conc_spell.spell,
+                    conc_spell.mind_level,
+                    tuple(encode(target) for target in conc_spell.targets),
+                    tuple(effects),
+                )
+            )
+        return tuple(state)
+
+    def set_state(self, state: tuple, decode: Callable[[Any], Any]) -> None:
+        """Restore a state returned by `get_state`.
+
+        The effects of the targets must be restored first.
+
+        Args:
+            state: The state
+            decode: Resolves the references to the targets
+        """
+        self.concentration_spells = {}
+        for spell_key, spell, mind_level, targets, effects in state:
+            conc_spell = ConcentrationSpell(spell, self._character, mind_level)
+            conc_spell.targets = [decode(target) for target in targets]
+            conc_spell.active_effects = [
+                decode(target).effects_module.active_effects[index]
+                for target, index in effects
+            ]
+            self.concentration_spells[spell_key] = conc_spell
@@ -1,13 +1,22 @@
 # Revised effects_module.py (per-BonusType tracking, 5e-style strict)
 
-from typing import Any, Generator, Iterator, Optional
+import math
+from copy import copy
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Generator, Iterator, Optional
 from core.constants import *
-from core.utils import cprint, get_max_roll
+from core.scheduler import ExpiryScheduler, ScheduledExpiry
+from core.utils import get_max_roll
 from catchery import *
 from combat.damage import DamageComponent
+from combat.events import CombatEvent, CombatEventType, emit_event, wants_event
 from effects import *
 
 
+# Bonus types whose modifiers are plain numbers.
+FLAT_BONUS_TYPES = (BonusType.HP, BonusType.MIND, BonusType.AC, BonusType.INITIATIVE)
+
+
 class ActiveEffect:
     """
     Represents an active effect applied to a character, including its source, target, effect details, mind level, and duration.
@@ -20,7 +29,49 @@ class ActiveEffect:
         self.target: Any = target  # The recipient
         self.effect: Effect = effect
         self.mind_level: int = mind_level
-        self.duration: int | None = effect.duration
+        # Whether the effect is currently active on the target.
+        self.active: bool = False
+        # The scheduled expiry, for effects with a duration that are active.
+        self.expiry: ScheduledExpiry | None = None
+        self._scheduler: ExpiryScheduler | None = None
+
+    @property
+    def duration(self) -> int | None:
+        """The remaining turns of the effect, None for indefinite effects."""
+        if self.expiry is None or self._scheduler is None:
+            return self.effect.duration
+        return self._scheduler.remaining(self.expiry)
+
+
+def _has_turn_update(effect: Effect) -> bool:
+    """Whether the effect does something on each turn, besides expiring."""
+    return type(effect).turn_update is not Effect.turn_update
+
+
+def _low_health_limit(threshold: float, hp_max: int) -> int:
+    """The highest HP at which the HP ratio is at most the threshold, -1 if none."""
+    if hp_max <= 0:
+        return 0
+    limit = min(max(math.floor(threshold * hp_max), -1), hp_max)
+    # Correct floating point rounding, using the same test as TriggerCondition.
+    while limit < hp_max and (limit + 1) / hp_max <= threshold:
+        limit += 1
+    while limit >= 0 and limit / hp_max > threshold:
+        limit -= 1
+    return limit
+
+
+def _high_health_limit(threshold: float, hp_max: int) -> int:
+    """The lowest HP at which the HP ratio is at least the threshold, HP_MAX + 1 if none."""
+    if hp_max <= 0:
+        return 0 if threshold <= 0 else 1
+    limit = max(min(math.ceil(threshold * hp_max), hp_max + 1), 0)
+    # Correct floating point rounding, using the same test as TriggerCondition.
+    while limit > 0 and (limit - 1) / hp_max >= threshold:
+        limit -= 1
+    while limit <= hp_max and limit / hp_max < threshold:
+        limit += 1
+    return limit
 
 
 class CharacterEffects:
@@ -33,6 +84,31 @@ class CharacterEffects:
         self.active_effects: list[ActiveEffect] = []
         self.active_modifiers: dict[BonusType, ActiveEffect] = {}
         self.passive_effects: list[Effect] = []
+        # Expiry of the active effects, counted in turns of the owner.
+        self.scheduler: ExpiryScheduler = ExpiryScheduler()
+        # Active effects that must be updated on every turn.
+        self._ticking_effects: list[ActiveEffect] = []
+        # Resolved value and strength of each active modifier, by bonus type.
+        self._modifier_table: dict[BonusType, Any] = {}
+        self._modifier_strengths: dict[BonusType, int] = {}
+        # Best damage modifier of each damage type, with its mind level and
+        # maximum roll.
+        self._damage_table: dict[DamageType, tuple[DamageComponent, int, int]] = {}
+        # Number of active effects preventing the owner from taking actions.
+        self._incapacitations: int = 0
+        # Active and passive trigger effects, by trigger type.
+        self._triggers: dict[TriggerType, list[ActiveEffect]] = {}
+        self._passive_triggers: dict[TriggerType, list[TriggerEffect]] = {}
+        # The trigger bus of the combat the owner takes part in, if any.
+        self.trigger_bus: Any = None
+        # Passive health threshold triggers, as absolute HP limits in ascending
+        # order, computed for the maximum HP in `_health_limits_hp_max`.
+        self._low_health_limits: list[int] = []
+        self._low_health_triggers: list[tuple[int, TriggerEffect]] = []
+        self._high_health_limits: list[int] = []
+        self._high_health_triggers: list[tuple[int, TriggerEffect]] = []
+        self._custom_health_triggers: list[tuple[int, TriggerEffect]] = []
+        self._health_limits_hp_max: int | None = None
 
     # === Effect Management ===
 
@@ -46,7 +122,7 @@ class CharacterEffects:
             source (Any): The source of the effect (e.g., the caster).
             effect (Effect): The effect to add.
             mind_level (int): The mind level of the effect.
-            spell (Optional[Any], optional): The spell associated with the effect, if any. Defaults to None.
+            spell (Optional[Any], optional): The spell or ability applying the effect, if any. Defaults to None.
 
         Returns:
             bool: True if the effect was added successfully, False otherwise.
@@ -76,6 +152,10 @@ class CharacterEffects:
                     0, int(mind_level) if isinstance(mind_level, (int, float)) else 0
                 )
 
+            if isinstance(effect, TriggerEffect):
+                # The trigger counters belong to this application of the
+                # effect, not to the effect shared by every character.
+                effect = copy(effect)
             new_effect = ActiveEffect(source, self.owner, effect, mind_level)
 
             # Check concentration limit if this effect requires concentration
@@ -94,22 +174,20 @@ class CharacterEffects:
                 if self.has_effect(effect):
                     return False
 
-            elif isinstance(effect, TriggerEffect) and effect.trigger_condition.trigger_type.value == "on_hit":
+            elif isinstance(effect, TriggerEffect) and effect.trigger_condition.trigger_type == TriggerType.ON_HIT:
                 # Only allow one OnHit trigger spell at a time (like D&D 5e smite spells)
                 # Remove any existing OnHit trigger effects first
-                existing_triggers = [
-                    ae
-                    for ae in self.active_effects
-                    if isinstance(ae.effect, TriggerEffect) and ae.effect.trigger_condition.trigger_type.value == "on_hit"
-                ]
-                for existing_trigger in existing_triggers:
+                for existing_trigger in self.get_triggers(TriggerType.ON_HIT):
                     self.remove_effect(existing_trigger)
-                    # Show message about replacing the old trigger
-                    from core.utils import cprint
-
-                    cprint(
-                        f"    ⚠️  {effect.name} replaces {existing_trigger.effect.name}."
-                    )
+                    if wants_event(CombatEventType.EFFECT_REPLACED):
+                        emit_event(
+                            CombatEvent(
+                                CombatEventType.EFFECT_REPLACED,
+                                target=self.owner,
+                                effect=effect,
+                                replaced=existing_trigger.effect,
+                            )
+                        )
 
             elif isinstance(effect, ModifierEffect):
                 for modifier in effect.modifiers:
@@ -118,10 +196,11 @@ class CharacterEffects:
                     if existing:
                         if self._get_modifier_strength(
                             new_effect, bonus_type
-                        ) <= self._get_modifier_strength(existing, bonus_type):
+                        ) <= self._modifier_strengths[bonus_type]:
                             return False
                         self.remove_effect(existing)
-                    self.active_modifiers[bonus_type] = new_effect
+                    self._set_active_modifier(bonus_type, new_effect)
+                    self.owner.stats_module.invalidate(abilities=False)
 
             # Handle incapacitating effects
             if isinstance(effect, IncapacitatingEffect):
@@ -136,6 +215,35 @@ class CharacterEffects:
                     self.remove_effect(existing)
 
             self.active_effects.append(new_effect)
+            new_effect.active = True
+            if isinstance(effect, IncapacitatingEffect):
+                if effect.prevents_actions():
+                    self._incapacitations += 1
+                self.owner.actions_module.invalidate()
+            if effect.duration is not None:
+                new_effect.expiry = self.scheduler.schedule(new_effect, effect.duration)
+                new_effect._scheduler = self.scheduler
+            if _has_turn_update(effect):
+                self._ticking_effects.append(new_effect)
+            if isinstance(effect, TriggerEffect):
+                trigger_type = effect.trigger_condition.trigger_type
+                self._triggers.setdefault(trigger_type, []).append(new_effect)
+                if self.trigger_bus is not None:
+                    self.trigger_bus.subscribe_trigger(self.owner, trigger_type)
+            if isinstance(effect, ModifierEffect):
+                self._add_damage_modifier(new_effect)
+            if wants_event(CombatEventType.EFFECT_APPLIED):
+                emit_event(
+                    CombatEvent(
+                        CombatEventType.EFFECT_APPLIED,
+                        actor=source,
+                        target=self.owner,
+                        action=spell,
+                        effect=effect,
+                        mind_level=mind_level,
+                        effect_applied=True,
+                    )
+                )
             return True
 
         except Exception as e:
@@ -193,7 +301,7 @@ class CharacterEffects:
         """
         try:
             if effect in self.active_effects:
-                self.active_effects.remove(effect)
+                self._discard_effect(effect)
                 return True
             return False
         except Exception as e:
@@ -221,6 +329,12 @@ class CharacterEffects:
         """
         if effect not in self.passive_effects:
             self.passive_effects.append(effect)
+            if isinstance(effect, TriggerEffect):
+                trigger_type = effect.trigger_condition.trigger_type
+                self._passive_triggers.setdefault(trigger_type, []).append(effect)
+                self._health_limits_hp_max = None
+                if self.trigger_bus is not None:
+                    self.trigger_bus.subscribe_trigger(self.owner, trigger_type)
             return True
         return False
 
@@ -236,9 +350,27 @@ class CharacterEffects:
         """
         if effect in self.passive_effects:
             self.passive_effects.remove(effect)
+            if isinstance(effect, TriggerEffect):
+                trigger_type = effect.trigger_condition.trigger_type
+                self._passive_triggers[trigger_type].remove(effect)
+                self._health_limits_hp_max = None
+                if self.trigger_bus is not None:
+                    self.trigger_bus.unsubscribe_trigger(self.owner, trigger_type)
             return True
         return False
 
+    def get_passive_triggers(self, trigger_type: TriggerType) -> list[TriggerEffect]:
+        """
+        Get the passive trigger effects of the given trigger type.
+
+        Args:
+            trigger_type (TriggerType): The trigger type.
+
+        Returns:
+            list[TriggerEffect]: The passive trigger effects, in the order they were added.
+        """
+        return self._passive_triggers.get(trigger_type, [])
+
     def check_passive_triggers(self) -> list[str]:
         """Check all passive effects for trigger conditions and activate them.
         
@@ -247,38 +379,132 @@ class CharacterEffects:
         """
         activation_messages = []
 
-        for effect in self.passive_effects:
-            # Check for low health triggers using the new TriggerEffect system
-            if isinstance(effect, TriggerEffect) and effect.trigger_condition.trigger_type.value == "on_low_health":
+        # Check for low health triggers using the new TriggerEffect system.
+        # Triggered effects may change the passive effects, iterate over a copy.
+        for trigger_effect in list(self.get_passive_triggers(TriggerType.ON_LOW_HEALTH)):
+            # Create event data for health check
+            event_data = {
+                "event_type": "health_check",
+                "character": self.owner
+            }
 
-                trigger_effect: TriggerEffect = effect  # type: ignore
+            if trigger_effect.check_trigger(self.owner, event_data):
+                activation_messages.append(
+                    self._activate_passive_trigger(trigger_effect, event_data)
+                )
 
-                # Create event data for health check
-                event_data = {
-                    "event_type": "health_check",
-                    "character": self.owner
-                }
+        return activation_messages
 
-                if trigger_effect.check_trigger(self.owner, event_data):
-                    # Activate the trigger
-                    damage_bonuses, trigger_effects_with_levels = (
-                        trigger_effect.activate_trigger(self.owner, event_data)
-                    )
+    def check_health_triggers(self, previous_hp: int) -> list[str]:
+        """Activate the passive health threshold triggers crossed by a change of HP.
 
-                    # Apply triggered effects to self
-                    for triggered_effect, mind_level in trigger_effects_with_levels:
-                        if triggered_effect.can_apply(self.owner, self.owner):
-                            self.add_effect(self.owner, triggered_effect, mind_level)
+        Damage activates the low health triggers whose threshold lies between
+        the previous and the current HP, healing activates the high health
+        ones. Triggers with a custom condition are checked on every change.
 
-                    # Create activation message
-                    from core.constants import get_effect_color
+        Args:
+            previous_hp (int): The HP before the damage or the healing.
 
-                    activation_messages.append(
-                        f"🔥 {self.owner.name}'s [bold][{get_effect_color(effect)}]{effect.name}[/][/] activates!"
-                    )
+        Returns:
+            list[str]: Messages for effects that were triggered this check.
+        """
+        hp = self.owner.hp
+        if hp == previous_hp:
+            return []
+        self._update_health_limits()
+        if hp < previous_hp:
+            limits, triggers = self._low_health_limits, self._low_health_triggers
+            first, last = bisect_left(limits, hp), bisect_left(limits, previous_hp)
+        else:
+            limits, triggers = self._high_health_limits, self._high_health_triggers
+            first, last = bisect_right(limits, previous_hp), bisect_right(limits, hp)
+        if first == last and not self._custom_health_triggers:
+            return []
+
+        # Crossed thresholds already meet their condition, custom conditions
+        # are evaluated. Activate them in the order they were added.
+        candidates = [(order, trigger, True) for order, trigger in triggers[first:last]]
+        candidates.extend(
+            (order, trigger, False) for order, trigger in self._custom_health_triggers
+        )
+        candidates.sort(key=lambda candidate: candidate[0])
 
+        activation_messages = []
+        for _, trigger_effect, crossed in candidates:
+            event_data = {
+                "event_type": "health_check",
+                "character": self.owner
+            }
+            if crossed:
+                if not trigger_effect.can_trigger():
+                    continue
+            elif not trigger_effect.check_trigger(self.owner, event_data):
+                continue
+            activation_messages.append(
+                self._activate_passive_trigger(trigger_effect, event_data)
+            )
         return activation_messages
 
+    def _update_health_limits(self) -> None:
+        """Recomputes the HP limits of the health threshold triggers, if the
+        passive effects or the maximum HP changed since they were computed."""
+        hp_max = self.owner.HP_MAX
+        if self._health_limits_hp_max == hp_max:
+            return
+        self._health_limits_hp_max = hp_max
+        low: list[tuple[int, int, TriggerEffect]] = []
+        high: list[tuple[int, int, TriggerEffect]] = []
+        self._custom_health_triggers = []
+        for order, effect in enumerate(self.passive_effects):
+            if not isinstance(effect, TriggerEffect):
+                continue
+            condition = effect.trigger_condition
+            if condition.trigger_type not in (
+                TriggerType.ON_LOW_HEALTH,
+                TriggerType.ON_HIGH_HEALTH,
+            ):
+                continue
+            if condition.custom_condition:
+                self._custom_health_triggers.append((order, effect))
+            elif condition.trigger_type == TriggerType.ON_LOW_HEALTH:
+                limit = _low_health_limit(condition.threshold or 0.25, hp_max)
+                low.append((limit, order, effect))
+            else:
+                limit = _high_health_limit(condition.threshold or 0.75, hp_max)
+                high.append((limit, order, effect))
+        low.sort(key=lambda entry: entry[:2])
+        high.sort(key=lambda entry: entry[:2])
+        self._low_health_limits = [limit for limit, _, _ in low]
+        self._low_health_triggers = [(order, effect) for _, order, effect in low]
+        self._high_health_limits = [limit for limit, _, _ in high]
+        self._high_health_triggers = [(order, effect) for _, order, effect in high]
+
+    def _activate_passive_trigger(
+        self, trigger_effect: TriggerEffect, event_data: dict[str, Any]
+    ) -> str:
+        """Activates a passive trigger, applying its effects to the owner.
+
+        Args:
+            trigger_effect (TriggerEffect): The trigger.
+            event_data (dict[str, Any]): Context about the triggering event.
+
+        Returns:
+            str: The activation message.
+        """
+        damage_bonuses, trigger_effects_with_levels = trigger_effect.activate_trigger(
+            self.owner, event_data
+        )
+
+        # Apply triggered effects to self
+        for triggered_effect, mind_level in trigger_effects_with_levels:
+            if triggered_effect.can_apply(self.owner, self.owner):
+                self.add_effect(self.owner, triggered_effect, mind_level)
+
+        # Create activation message
+        from core.constants import get_effect_color
+
+        return f"🔥 {self.owner.name}'s [bold][{get_effect_color(trigger_effect)}]{trigger_effect.name}[/][/] activates!"
+
     # === Regular Effect Management ===
 
     def get_effect_remaining_duration(self, effect: Effect) -> int | None:
@@ -296,6 +522,15 @@ class CharacterEffects:
                 return ae.duration
         return 0
 
+    def is_incapacitated(self) -> bool:
+        """
+        Check if an active effect prevents the owner from taking actions.
+
+        Returns:
+            bool: True if the owner is incapacitated, False otherwise.
+        """
+        return self._incapacitations > 0
+
     def has_effect(self, effect: Effect) -> bool:
         """
         Check if a specific effect is currently active.
@@ -330,10 +565,9 @@ class CharacterEffects:
             candidate = ActiveEffect(source, self.owner, effect, mind_level)
             for modifier in effect.modifiers:
                 bonus_type = modifier.bonus_type
-                existing = self.active_modifiers.get(bonus_type)
-                if not existing or self._get_modifier_strength(
+                if bonus_type not in self.active_modifiers or self._get_modifier_strength(
                     candidate, bonus_type
-                ) > self._get_modifier_strength(existing, bonus_type):
+                ) > self._modifier_strengths[bonus_type]:
                     return True
             return False
 
@@ -363,46 +597,11 @@ class CharacterEffects:
         Returns:
             Any: The modifier value, which can be an integer, list, or 0.
         """
-        ae = self.active_modifiers.get(bonus_type)
-        if not ae:
-            return (
-                0
-                if bonus_type
-                in [BonusType.HP, BonusType.MIND, BonusType.AC, BonusType.INITIATIVE]
-                else []
-            )
-        if not isinstance(ae.effect, ModifierEffect):
-            return 0
-
-        # Find the modifier for the specific bonus type
-        modifier = None
-        for mod in ae.effect.modifiers:
-            if mod.bonus_type == bonus_type:
-                modifier = mod
-                break
-
-        if not modifier:
-            return 0
-
-        if bonus_type in [
-            BonusType.HP,
-            BonusType.MIND,
-            BonusType.AC,
-            BonusType.INITIATIVE,
-        ]:
-            if isinstance(modifier.value, int):
-                return modifier.value
-            elif isinstance(modifier.value, str):
-                return int(modifier.value)
-            else:
-                # DamageComponent - shouldn't happen for these bonus types
-                return 0
-        elif bonus_type == BonusType.ATTACK:
-            return [modifier.value]
-        elif bonus_type == BonusType.DAMAGE:
-            return (
-                [modifier.value] if isinstance(modifier.value, DamageComponent) else []
-            )
+        if bonus_type in self._modifier_table:
+            value = self._modifier_table[bonus_type]
+            # Lists are copied, so callers cannot alter the cached table.
+            return list(value) if isinstance(value, list) else value
+        return 0 if bonus_type in FLAT_BONUS_TYPES else []
 
     def get_damage_modifiers(self) -> list[tuple[DamageComponent, int]]:
         """
@@ -411,65 +610,120 @@ class CharacterEffects:
         Returns:
             list[tuple[DamageComponent, int]]: List of (DamageComponent, mind_level) tuples for the best modifier of each type.
         """
-        best_by_type: dict[DamageType, tuple[DamageComponent, int]] = {}
+        return [
+            (component, mind_level)
+            for component, mind_level, _ in self._damage_table.values()
+        ]
 
-        for ae in self.active_effects:
-            if not isinstance(ae.effect, ModifierEffect):
-                continue
+    def _set_active_modifier(self, bonus_type: BonusType, ae: ActiveEffect) -> None:
+        """
+        Makes an effect the active modifier of a bonus type, resolving its value.
 
-            # Find damage modifier in the effect
-            damage_modifier = None
-            for modifier in ae.effect.modifiers:
-                if modifier.bonus_type == BonusType.DAMAGE:
-                    damage_modifier = modifier
-                    break
+        Args:
+            bonus_type (BonusType): The bonus type.
+            ae (ActiveEffect): The effect providing the modifier.
+        """
+        self.active_modifiers[bonus_type] = ae
+        self._modifier_table[bonus_type] = self._resolve_modifier(ae, bonus_type)
+        self._modifier_strengths[bonus_type] = self._get_modifier_strength(
+            ae, bonus_type
+        )
 
-            if not damage_modifier or not isinstance(
-                damage_modifier.value, DamageComponent
-            ):
-                continue
+    def _add_damage_modifier(self, ae: ActiveEffect) -> None:
+        """
+        Updates the best damage modifiers with the ones of a new effect.
 
-            mod = damage_modifier.value
-            variables = ae.source.get_expression_variables()
-            variables["MIND"] = ae.mind_level
-            new_max = get_max_roll(mod.damage_roll, variables)
-            current = best_by_type.get(mod.damage_type)
-            current_max = (
-                get_max_roll(current[0].damage_roll, variables) if current else -1
+        Args:
+            ae (ActiveEffect): The effect.
+        """
+        modifier = self._find_modifier(ae.effect, BonusType.DAMAGE)
+        if not modifier or not isinstance(modifier.value, DamageComponent):
+            return
+        component = modifier.value
+        variables = ae.source.get_expression_variables(ae.mind_level)
+        new_max = get_max_roll(component.damage_roll, variables)
+        current = self._damage_table.get(component.damage_type)
+        if current is None or new_max > current[2]:
+            self._damage_table[component.damage_type] = (
+                component,
+                ae.mind_level,
+                new_max,
             )
-            if new_max > current_max:
-                best_by_type[mod.damage_type] = (mod, ae.mind_level)
 
-        return list(best_by_type.values())
+    def _discard_effect(self, ae: ActiveEffect) -> None:
+        """
+        Removes an active effect, its scheduled expiry and its modifiers.
+
+        Args:
+            ae (ActiveEffect): The effect, which must be active.
+        """
+        self.active_effects.remove(ae)
+        ae.active = False
+        self.scheduler.cancel(ae.expiry)
+        if _has_turn_update(ae.effect):
+            self._ticking_effects.remove(ae)
+        if isinstance(ae.effect, TriggerEffect):
+            trigger_type = ae.effect.trigger_condition.trigger_type
+            self._triggers[trigger_type].remove(ae)
+            if self.trigger_bus is not None:
+                self.trigger_bus.unsubscribe_trigger(self.owner, trigger_type)
+        if isinstance(ae.effect, ModifierEffect):
+            self._release_modifiers(ae)
+        if isinstance(ae.effect, IncapacitatingEffect):
+            if ae.effect.prevents_actions():
+                self._incapacitations -= 1
+            self.owner.actions_module.invalidate()
+
+    def _release_modifiers(self, ae: ActiveEffect) -> None:
+        """
+        Removes the modifiers of an effect that is no longer active. Each bonus
+        type it provided falls back to the first active effect providing it.
+
+        Args:
+            ae (ActiveEffect): The removed effect.
+        """
+        freed = [bt for bt, active in self.active_modifiers.items() if active is ae]
+        for bonus_type in freed:
+            del self.active_modifiers[bonus_type]
+            del self._modifier_table[bonus_type]
+            del self._modifier_strengths[bonus_type]
+            for other in self.active_effects:
+                if self._find_modifier(other.effect, bonus_type):
+                    self._set_active_modifier(bonus_type, other)
+                    break
+        if self._find_modifier(ae.effect, BonusType.DAMAGE):
+            self._damage_table.clear()
+            for other in self.active_effects:
+                self._add_damage_modifier(other)
+        if freed:
+            self.owner.stats_module.invalidate(abilities=False)
 
     def turn_update(self) -> None:
         """
         Update the effects for a turn, applying any changes and removing expired effects.
+
+        Only the effects that act on each turn (e.g., damage over time) are
+        visited; the expired ones are taken from the scheduler.
         """
-        updated = []
-        for ae in self.active_effects:
-            ae.effect.turn_update(ae.source, self.owner, ae.mind_level)
-            
-            # Only decrement duration if it's not None (indefinite effects)
-            if ae.duration is not None:
-                ae.duration -= 1
-                
-            # Keep effect if duration is None (indefinite) or still has time remaining
-            if ae.duration is None or ae.duration > 0:
-                updated.append(ae)
-            else:
-                cprint(
-                    f"    :hourglass_done: [bold yellow]{ae.effect.name}[/] has expired on [bold]{self.owner.name}[/]."
+        for ae in list(self._ticking_effects):
+            # Skip effects removed by the update of a previous one.
+            if ae.active:
+                ae.effect.turn_update(ae.source, self.owner, ae.mind_level)
+        # Passive triggers never expire, but their cooldowns and per-turn
+        # limits still follow the turns of the owner.
+        for triggers in self._passive_triggers.values():
+            for trigger in triggers:
+                trigger.turn_update(self.owner, self.owner)
+        for ae in self.scheduler.advance():
+            self._discard_effect(ae)
+            if wants_event(CombatEventType.EFFECT_EXPIRED):
+                emit_event(
+                    CombatEvent(
+                        CombatEventType.EFFECT_EXPIRED,
+                        target=self.owner,
+                        effect=ae.effect,
+                    )
                 )
-        self.active_effects = updated
-        # Rebuild active_modifiers
-        self.active_modifiers.clear()
-        for ae in self.active_effects:
-            if isinstance(ae.effect, ModifierEffect):
-                for modifier in ae.effect.modifiers:
-                    bt = modifier.bonus_type
-                    if bt not in self.active_modifiers:
-                        self.active_modifiers[bt] = ae
 
     # === Helpers ===
 
@@ -484,21 +738,11 @@ class CharacterEffects:
         Returns:
             int: The strength value of the modifier.
         """
-        if not isinstance(ae.effect, ModifierEffect):
-            return 0
-
-        # Find the modifier for the specific bonus type
-        modifier = None
-        for mod in ae.effect.modifiers:
-            if mod.bonus_type == bonus_type:
-                modifier = mod
-                break
-
+        modifier = self._find_modifier(ae.effect, bonus_type)
         if not modifier:
             return 0
 
-        variables = ae.source.get_expression_variables()
-        variables["MIND"] = ae.mind_level
+        variables = ae.source.get_expression_variables(ae.mind_level)
 
         if bonus_type in [
             BonusType.HP,
@@ -528,6 +772,56 @@ class CharacterEffects:
                 return get_max_roll(modifier.value.damage_roll, variables)
         return 0
 
+    @staticmethod
+    def _find_modifier(effect: Effect, bonus_type: BonusType) -> Optional[Modifier]:
+        """
+        Helper to find the modifier of an effect for a specific bonus type.
+
+        Args:
+            effect (Effect): The effect.
+            bonus_type (BonusType): The bonus type.
+
+        Returns:
+            Optional[Modifier]: The first matching modifier, if any.
+        """
+        if not isinstance(effect, ModifierEffect):
+            return None
+        for modifier in effect.modifiers:
+            if modifier.bonus_type == bonus_type:
+                return modifier
+        return None
+
+    def _resolve_modifier(self, ae: ActiveEffect, bonus_type: BonusType) -> Any:
+        """
+        Helper to resolve the value a modifier contributes to `get_modifier`.
+
+        Args:
+            ae (ActiveEffect): The active effect providing the modifier.
+            bonus_type (BonusType): The bonus type.
+
+        Returns:
+            Any: The modifier value, which can be an integer, list, or 0.
+        """
+        modifier = self._find_modifier(ae.effect, bonus_type)
+        if not modifier:
+            return 0
+
+        if bonus_type in FLAT_BONUS_TYPES:
+            if isinstance(modifier.value, int):
+                return modifier.value
+            elif isinstance(modifier.value, str):
+                return int(modifier.value)
+            else:
+                # DamageComponent - shouldn't happen for these bonus types
+                return 0
+        elif bonus_type == BonusType.ATTACK:
+            return [modifier.value]
+        elif bonus_type == BonusType.DAMAGE:
+            return (
+                [modifier.value] if isinstance(modifier.value, DamageComponent) else []
+            )
+        return None
+
     def _iterate_active_effects(self) -> Iterator[ActiveEffect]:
         """
         Iterator over all active effects.
@@ -539,6 +833,84 @@ class CharacterEffects:
 
     # === OnHit Trigger Management (TriggerEffect) ===
 
+    def get_triggers(self, trigger_type: TriggerType) -> list[ActiveEffect]:
+        """
+        Get all active TriggerEffect effects with the given trigger type.
+
+        Args:
+            trigger_type (TriggerType): The trigger type.
+
+        Returns:
+            list[ActiveEffect]: A copy of the list of active trigger effects,
+                in the order they were added.
+        """
+        return list(self._triggers.get(trigger_type, ()))
+
+    def count_triggers(self, trigger_type: TriggerType) -> int:
+        """
+        Count the active and passive TriggerEffect effects with the given trigger type.
+
+        Args:
+            trigger_type (TriggerType): The trigger type.
+
+        Returns:
+            int: The number of trigger effects.
+        """
+        return len(self._triggers.get(trigger_type, ())) + len(
+            self._passive_triggers.get(trigger_type, ())
+        )
+
+    def activate_triggers(
+        self, trigger_type: TriggerType, event_data: dict[str, Any]
+    ) -> list[TriggerEffect]:
+        """
+        Activate the active and passive triggers of a type whose condition is
+        met by an event. Their effects are applied to the owner, and the active
+        triggers consuming on trigger are removed.
+
+        Args:
+            trigger_type (TriggerType): The trigger type.
+            event_data (dict[str, Any]): Context about the triggering event.
+
+        Returns:
+            list[TriggerEffect]: The triggers that activated.
+        """
+        activated: list[TriggerEffect] = []
+        candidates: list[tuple[TriggerEffect, ActiveEffect | None]] = [
+            (ae.effect, ae) for ae in self.get_triggers(trigger_type)  # type: ignore
+        ]
+        candidates.extend(
+            (trigger, None) for trigger in list(self.get_passive_triggers(trigger_type))
+        )
+        for trigger, ae in candidates:
+            # Skip effects removed by the activation of a previous one.
+            if ae is not None and not ae.active:
+                continue
+            if ae is not None:
+                event_data["mind_level"] = ae.mind_level
+            else:
+                event_data.pop("mind_level", None)
+            if not trigger.check_trigger(self.owner, event_data):
+                continue
+            _, trigger_effects_with_levels = trigger.activate_trigger(
+                self.owner, event_data
+            )
+            activated.append(trigger)
+            if wants_event(CombatEventType.TRIGGER_ACTIVATED):
+                emit_event(
+                    CombatEvent(
+                        CombatEventType.TRIGGER_ACTIVATED,
+                        actor=self.owner,
+                        effect=trigger,
+                    )
+                )
+            for triggered_effect, mind_level in trigger_effects_with_levels:
+                if triggered_effect.can_apply(self.owner, self.owner):
+                    self.add_effect(self.owner, triggered_effect, mind_level)
+            if ae is not None and trigger.consumes_on_trigger:
+                self.remove_effect(ae)
+        return activated
+
     def get_on_hit_triggers(self) -> list[ActiveEffect]:
         """
         Get all active TriggerEffect effects with on_hit condition.
@@ -546,11 +918,7 @@ class CharacterEffects:
         Returns:
             list[ActiveEffect]: List of active OnHit trigger effects.
         """
-        triggers = []
-        for ae in self.active_effects:
-            if isinstance(ae.effect, TriggerEffect) and ae.effect.trigger_condition.trigger_type.value == "on_hit":
-                triggers.append(ae)
-        return triggers
+        return self.get_triggers(TriggerType.ON_HIT)
 
     def trigger_on_hit_effects(
         self, target: Any
@@ -610,3 +978,119 @@ class CharacterEffects:
             self.remove_effect(ae)
 
         return damage_bonuses, effects_to_apply, consumed_triggers
+
+    # === State ===
+
+    def get_state(self, encode: Callable[[Any], Any]) -> tuple:
+        """
+        Capture the active effects and the trigger counters, to restore them
+        later with `set_state`. The passive effects are content of the owner,
+        only their counters are captured.
+
+        Args:
+            encode (Callable[[Any], Any]): Maps the sources of the effects to
+                references that `set_state` can resolve.
+
+        Returns:
+            tuple: The state.
+        """
+        index = {id(ae): i for i, ae in enumerate(self.active_effects)}
+        now, sequence, entries = self.scheduler.get_state()
+        return (
+            tuple(
+                (
+                    encode(ae.source),
+                    ae.effect,
+                    ae.mind_level,
+                    ae.effect.get_state() if isinstance(ae.effect, TriggerEffect) else None,
+                )
+                for ae in self.active_effects
+            ),
+            tuple((bt, index[id(ae)]) for bt, ae in self.active_modifiers.items()),
+            dict(self._modifier_table),
+            dict(self._modifier_strengths),
+            dict(self._damage_table),
+            (
+                now,
+                sequence,
+                tuple((at, seq, index[id(ae)]) for at, seq, ae in entries),
+            ),
+            tuple(
+                effect.get_state()
+                for effect in self.passive_effects
+                if isinstance(effect, TriggerEffect)
+            ),
+        )
+
+    def set_state(self, state: tuple, decode: Callable[[Any], Any]) -> None:
+        """
+        Restore a state returned by `get_state`, replacing the active effects.
+
+        Args:
+            state (tuple): The state.
+            decode (Callable[[Any], Any]): Resolves the references to the
+                sources of the effects.
+        """
+        (
+            effects,
+            modifiers,
+            modifier_table,
+            modifier_strengths,
+            damage_table,
+            (now, sequence, entries),
+            passive_counters,
+        ) = state
+
+        # Drop the current active effects.
+        for ae in self.active_effects:
+            ae.active = False
+        if self.trigger_bus is not None:
+            for trigger_type, triggers in self._triggers.items():
+                for _ in triggers:
+                    self.trigger_bus.unsubscribe_trigger(self.owner, trigger_type)
+
+        self.active_effects = []
+        self._ticking_effects = []
+        self._triggers = {}
+        self._incapacitations = 0
+        for source, effect, mind_level, counters in effects:
+            if counters is not None:
+                # Like `add_effect`, give the active effect its own counters.
+                effect = copy(effect)
+                effect.set_state(counters)
+            ae = ActiveEffect(decode(source), self.owner, effect, mind_level)
+            ae.active = True
+            self.active_effects.append(ae)
+            if _has_turn_update(effect):
+                self._ticking_effects.append(ae)
+            if isinstance(effect, IncapacitatingEffect) and effect.prevents_actions():
+                self._incapacitations += 1
+            if isinstance(effect, TriggerEffect):
+                trigger_type = effect.trigger_condition.trigger_type
+                self._triggers.setdefault(trigger_type, []).append(ae)
+                if self.trigger_bus is not None:
+                    self.trigger_bus.subscribe_trigger(self.owner, trigger_type)
+
+        handles = self.scheduler.set_state(
+            (
+                now,
+                sequence,
+                tuple((at, seq, self.active_effects[i]) for at, seq, i in entries),
+            )
+        )
+        for handle in handles:
+            handle.item.expiry = handle
+            handle.item._scheduler = self.scheduler
+
+        self.active_modifiers = {bt: self.active_effects[i] for bt, i in modifiers}
+        self._modifier_table = dict(modifier_table)
+        self._modifier_strengths = dict(modifier_strengths)
+        self._damage_table = dict(damage_table)
+
+        passive_triggers = (
+            effect for effect in self.passive_effects if isinstance(effect, TriggerEffect)
+        )
+        for trigger, counters in zip(passive_triggers, passive_counters):
+            trigger.set_state(counters)
+        self._health_limits_hp_max = None
+        self.owner.actions_module.invalidate()
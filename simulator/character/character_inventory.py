@@ -94,6 +94,8 @@ class CharacterInventory:
             debug(f"Equipping weapon: {weapon.name} for {self._character.name}")
             # Add the weapon to the character's weapon list.
             self._character.equipped_weapons.append(weapon)
+            self._character.stats_module.invalidate(abilities=False)
+            self._character.actions_module.invalidate()
             return True
         log_warning(
             f"{self._character.name} cannot equip {weapon.name}",
@@ -115,6 +117,8 @@ class CharacterInventory:
             debug(f"Unequipping weapon: {weapon.name} from {self._character.name}")
             # Remove the weapon from the character's weapon list.
             self._character.equipped_weapons.remove(weapon)
+            self._character.stats_module.invalidate(abilities=False)
+            self._character.actions_module.invalidate()
             return True
         log_warning(
             f"{self._character.name} does not have {weapon.name} equipped",
@@ -175,6 +179,7 @@ class CharacterInventory:
             debug(f"Equipping armor: {armor.name} for {self._character.name}")
             # Add the armor to the character's armor list.
             self._character.equipped_armor.append(armor)
+            self._character.stats_module.invalidate(abilities=False)
             return True
         log_warning(
             f"{self._character.name} cannot equip {armor.name} because the armor slot is already occupied",
@@ -200,6 +205,7 @@ class CharacterInventory:
             debug(f"Unequipping armor: {armor.name} from {self._character.name}")
             # Remove the armor from the character's armor list.
             self._character.equipped_armor.remove(armor)
+            self._character.stats_module.invalidate(abilities=False)
             return True
         log_warning(
             f"{self._character.name} does not have {armor.name} equipped",
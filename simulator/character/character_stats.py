@@ -1,6 +1,7 @@
 """Character statistics and calculated properties module."""
 
-from typing import Dict, Any, TYPE_CHECKING
+from collections.abc import Mapping
+from typing import Callable, Dict, Any, Iterator, Optional, TYPE_CHECKING
 from core.constants import BonusType
 from core.utils import get_stat_modifier
 
@@ -11,9 +12,99 @@ if TYPE_CHECKING:
     from items.armor import Armor
 
 
+class ExpressionVariables(Mapping):
+    """
+    Read-only mapping of the variables a character provides to expressions.
+
+    The base values are shared and never modified; per-call variables such as
+    MIND are layered on top without copying them.
+    """
+
+    __slots__ = ("_values", "_overrides")
+
+    def __init__(
+        self, values: Dict[str, int], overrides: Optional[Dict[str, int]] = None
+    ) -> None:
+        """
+        Initialize the mapping.
+
+        Args:
+            values (Dict[str, int]): The base values, which must not change.
+            overrides (Optional[Dict[str, int]]): Values taking precedence over
+                the base ones. Defaults to None.
+        """
+        self._values: Dict[str, int] = values
+        self._overrides: Optional[Dict[str, int]] = overrides
+
+    def with_mind(self, mind_level: Optional[int]) -> "ExpressionVariables":
+        """
+        Returns a view with the MIND variable set.
+
+        Args:
+            mind_level (Optional[int]): The mind level, None leaves it unset.
+
+        Returns:
+            ExpressionVariables: The view.
+        """
+        if mind_level is None:
+            return self
+        return ExpressionVariables(self._values, {"MIND": mind_level})
+
+    def with_variables(self, variables: Dict[str, int]) -> "ExpressionVariables":
+        """
+        Returns a view with some extra variables set.
+
+        Args:
+            variables (Dict[str, int]): The extra variables.
+
+        Returns:
+            ExpressionVariables: The view.
+        """
+        if not variables:
+            return self
+        # Expressions use upper-case names.
+        variables = {key.upper(): value for key, value in variables.items()}
+        if self._overrides:
+            variables = {**self._overrides, **variables}
+        return ExpressionVariables(self._values, variables)
+
+    def __getitem__(self, key: str) -> int:
+        if self._overrides and key in self._overrides:
+            return self._overrides[key]
+        return self._values[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if self._overrides and key in self._overrides:
+            return self._overrides[key]
+        return self._values.get(key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._values or bool(self._overrides and key in self._overrides)
+
+    def __iter__(self) -> Iterator[str]:
+        if not self._overrides:
+            return iter(self._values)
+        return iter({**self._values, **self._overrides})
+
+    def __len__(self) -> int:
+        if not self._overrides:
+            return len(self._values)
+        return len({**self._values, **self._overrides})
+
+    def __repr__(self) -> str:
+        return f"ExpressionVariables({dict(self)})"
+
+
 class CharacterStats:
     """
     Handles all stat calculations and derived properties for a Character, including ability modifiers, HP, AC, initiative, and utility stat expressions.
+
+    The derived stats (HP_MAX, MIND_MAX, AC, INITIATIVE, CONCENTRATION_LIMIT)
+    are cached until `invalidate()` is called, which happens whenever the
+    equipment or the active modifier effects change. The expression variables
+    are cached as well, and only depend on the ability scores. Code that edits
+    `stats`, `levels` or `spellcasting_ability` directly must call
+    `invalidate()` itself.
     """
     def __init__(self, character_ref) -> None:
         """
@@ -23,7 +114,50 @@ class CharacterStats:
             character_ref: The Character instance this stats module belongs to.
         """
         self._character = character_ref
-    
+        # Incremented on every invalidation, so other caches can key on it.
+        self.version: int = 0
+        # Cached derived stats, by name.
+        self._cache: Dict[str, int] = {}
+        # Cached expression variables.
+        self._variables: Optional[ExpressionVariables] = None
+        # Cached outcome estimates of the actions of the character, filled by
+        # `combat.expected_damage`.
+        self.estimates: Dict[Any, Any] = {}
+
+    # ============================================================================
+    # CACHE MANAGEMENT
+    # ============================================================================
+
+    def invalidate(self, abilities: bool = True) -> None:
+        """
+        Discards the cached derived stats and bumps the version counter.
+
+        Args:
+            abilities (bool): Whether the ability scores may have changed too,
+                which also discards the expression variables. Defaults to True.
+        """
+        self.version += 1
+        self._cache.clear()
+        self.estimates.clear()
+        if abilities:
+            self._variables = None
+
+    def _cached(self, name: str, compute: Callable[[], int]) -> int:
+        """
+        Returns a cached derived stat, computing it if needed.
+
+        Args:
+            name (str): The name of the stat.
+            compute (Callable[[], int]): Computes the stat.
+
+        Returns:
+            int: The value of the stat.
+        """
+        value = self._cache.get(name)
+        if value is None:
+            value = self._cache[name] = compute()
+        return value
+
     # ============================================================================
     # ABILITY SCORE MODIFIERS (D&D 5e Standard)
     # ============================================================================
@@ -113,6 +247,10 @@ class CharacterStats:
         Returns:
             int: The maximum HP value.
         """
+        return self._cached("HP_MAX", self._compute_hp_max)
+
+    def _compute_hp_max(self) -> int:
+        """Computes HP_MAX, see the property of the same name."""
         hp_max: int = 0
         # Add the class levels' HP multipliers to the max HP.
         for cls, lvl in self._character.levels.items():
@@ -129,6 +267,10 @@ class CharacterStats:
         Returns:
             int: The maximum Mind value.
         """
+        return self._cached("MIND_MAX", self._compute_mind_max)
+
+    def _compute_mind_max(self) -> int:
+        """Computes MIND_MAX, see the property of the same name."""
         mind_max: int = 0
         # Add the class levels' Mind multipliers to the max Mind.
         for cls, lvl in self._character.levels.items():
@@ -145,6 +287,10 @@ class CharacterStats:
         Returns:
             int: The total AC value.
         """
+        return self._cached("AC", self._compute_ac)
+
+    def _compute_ac(self) -> int:
+        """Computes AC, see the property of the same name."""
         # Base AC is 10 + DEX modifier.
         base_ac = 10 + self.DEX
 
@@ -167,6 +313,10 @@ class CharacterStats:
         Returns:
             int: The total initiative value.
         """
+        return self._cached("INITIATIVE", self._compute_initiative)
+
+    def _compute_initiative(self) -> int:
+        """Computes INITIATIVE, see the property of the same name."""
         # Base initiative is DEX modifier.
         initiative = self.DEX
         # Add any initiative bonuses from active effects.
@@ -181,6 +331,10 @@ class CharacterStats:
         Returns:
             int: Maximum concentration effects.
         """
+        return self._cached("CONCENTRATION_LIMIT", self._compute_concentration_limit)
+
+    def _compute_concentration_limit(self) -> int:
+        """Computes CONCENTRATION_LIMIT, see the property of the same name."""
         base_limit = max(1, 1 + (self.SPELLCASTING // 2))
         concentration_bonus = self._character.effects_module.get_modifier(BonusType.CONCENTRATION)
 
@@ -201,19 +355,29 @@ class CharacterStats:
     # UTILITY METHODS
     # ============================================================================
 
-    def get_expression_variables(self) -> Dict[str, int]:
+    def get_expression_variables(
+        self, mind_level: Optional[int] = None
+    ) -> ExpressionVariables:
         """
-        Returns a dictionary of the character's modifiers for use in expressions.
+        Returns the character's modifiers for use in expressions.
+
+        Args:
+            mind_level (Optional[int]): The value of the MIND variable, if any.
 
         Returns:
-            Dict[str, int]: A dictionary containing the character's modifiers.
+            ExpressionVariables: A read-only mapping of the character's modifiers.
         """
-        return {
-            "SPELLCASTING": self.SPELLCASTING,
-            "STR": self.STR,
-            "DEX": self.DEX,
-            "CON": self.CON,
-            "INT": self.INT,
-            "WIS": self.WIS,
-            "CHA": self.CHA,
-        }
+        variables = self._variables
+        if variables is None:
+            variables = self._variables = ExpressionVariables(
+                {
+                    "SPELLCASTING": self.SPELLCASTING,
+                    "STR": self.STR,
+                    "DEX": self.DEX,
+                    "CON": self.CON,
+                    "INT": self.INT,
+                    "WIS": self.WIS,
+                    "CHA": self.CHA,
+                }
+            )
+        return variables.with_mind(mind_level)
@@ -1,11 +1,13 @@
 from logging import debug
+from copy import copy
 from pathlib import Path
-from typing import Any, Optional, Tuple
+from typing import Any, Callable, Optional, Tuple
 
 from actions.base_action import BaseAction
 from actions.attacks import BaseAttack, NaturalAttack, WeaponAttack
 from actions.spells import Spell
 from catchery import *
+from combat.events import CombatEvent, CombatEventType, emit_event, wants_event
 from core.constants import (
     ActionType,
     ArmorSlot,
@@ -15,11 +17,11 @@ from core.constants import (
 )
 from core.utils import get_stat_modifier
 from effects.base_effect import Effect
-from effects.incapacitating_effect import IncapacitatingEffect
+from effects.trigger_effect import TriggerType
 from character.character_effects import CharacterEffects
 from character.character_class import CharacterClass
 from character.character_race import CharacterRace
-from character.character_stats import CharacterStats
+from character.character_stats import CharacterStats, ExpressionVariables
 from character.character_inventory import CharacterInventory
 from character.character_actions import CharacterActions
 from character.character_serialization import CharacterSerialization
@@ -96,6 +98,16 @@ class Character:
         # List of spells
         self.spells: dict[str, Spell] = dict()
 
+        self._init_instance()
+
+    def _init_instance(self, passive_effects: Optional[list[Effect]] = None) -> None:
+        """Creates the modules and the combat state of the character, shared
+        by `__init__` and `spawn`.
+
+        Args:
+            passive_effects (Optional[list[Effect]]): Passive effects to copy
+                onto the character. Defaults to None, for no passive effects.
+        """
         # Manages active effects on the character.
         self.effects_module: CharacterEffects = CharacterEffects(self)
 
@@ -112,13 +124,24 @@ class Character:
         # Initialize concentration module for spell concentration management
         self.concentration_module = CharacterConcentration(self)
 
-        # Keep track of abilitiies cooldown.
+        # Passive effects keep their trigger counters, so each character needs
+        # its own copy of them.
+        for effect in passive_effects or []:
+            self.add_passive_effect(copy(effect))
+
+        # Keep track of abilitiies cooldown, as the turn on which they end.
         self.cooldowns: dict[str, int] = {}
         # Keep track of the uses of abilities.
         self.uses: dict[str, int] = {}
         # Maximum HP and Mind.
         self.hp: int = self.stats_module.HP_MAX
         self.mind: int = self.stats_module.MIND_MAX
+        # Damage dealt and taken, used for combat statistics.
+        self.damage_dealt: int = 0
+        self.damage_taken: int = 0
+        # The combat the character takes part in, if any, told when the
+        # character dies or is revived.
+        self.combat: Any = None
 
     # ============================================================================
     # DELEGATED STAT PROPERTIES
@@ -180,9 +203,11 @@ class Character:
         """Calculates the character's initiative based on dexterity and any active effects."""
         return self.stats_module.INITIATIVE
 
-    def get_expression_variables(self) -> dict[str, int]:
-        """Returns a dictionary of the character's modifiers."""
-        return self.stats_module.get_expression_variables()
+    def get_expression_variables(
+        self, mind_level: Optional[int] = None
+    ) -> ExpressionVariables:
+        """Returns a read-only mapping of the character's modifiers, with MIND set if given."""
+        return self.stats_module.get_expression_variables(mind_level)
 
     @property
     def CONCENTRATION_LIMIT(self) -> int:
@@ -216,11 +241,7 @@ class Character:
 
     def is_incapacitated(self) -> bool:
         """Check if the character is incapacitated and cannot take actions."""
-        for ae in self.effects_module.active_effects:
-            if isinstance(ae.effect, IncapacitatingEffect):
-                if ae.effect.prevents_actions():
-                    return True
-        return False
+        return self.effects_module.is_incapacitated()
 
     def can_take_actions(self) -> bool:
         """Check if character can take any actions this turn."""
@@ -266,12 +287,15 @@ class Character:
         """
         return self.effects_module.check_passive_triggers()
 
-    def take_damage(self, amount: int, damage_type: DamageType) -> Tuple[int, int, int]:
+    def take_damage(
+        self, amount: int, damage_type: DamageType, source: Optional[Any] = None
+    ) -> Tuple[int, int, int]:
         """Applies damage to the character, factoring in resistances and vulnerabilities.
 
         Args:
             amount: The raw base damage
             damage_type: The type of damage being dealt
+            source: The character dealing the damage, if known
 
         Returns:
             Tuple[int, int, int]: (base_damage, adjusted_damage, damage_taken)
@@ -283,8 +307,17 @@ class Character:
         elif damage_type in self.vulnerabilities:
             adjusted = adjusted * 2
         adjusted = max(adjusted, 0)
+        previous_hp = self.hp
         actual = min(adjusted, self.hp)
         self.hp = max(self.hp - adjusted, 0)
+        if self.combat is not None and previous_hp > 0 and self.hp == 0:
+            self.combat.update_participant(self)
+        # Keep track of the damage for combat statistics.
+        self.damage_taken += actual
+        if source is not None:
+            source.damage_dealt += actual
+        if actual > 0 and self.hp == 0 and wants_event(CombatEventType.DEATH):
+            emit_event(CombatEvent(CombatEventType.DEATH, actor=source, target=self))
 
         # Handle effects that break on damage (like sleep effects)
         if actual > 0:  # Only if damage was actually taken
@@ -295,9 +328,12 @@ class Character:
                 for msg in wake_up_messages:
                     cprint(f"    {msg}")
 
-        # Check for passive triggers after taking damage (e.g., OnLowHealthTrigger)
-        if self.passive_effects and self.is_alive():
-            activation_messages = self.check_passive_triggers()
+        # Check for health thresholds crossed by the damage (e.g., OnLowHealthTrigger)
+        if (
+            self.effects_module.get_passive_triggers(TriggerType.ON_LOW_HEALTH)
+            and self.is_alive()
+        ):
+            activation_messages = self.effects_module.check_health_triggers(previous_hp)
             if activation_messages:
                 from core.utils import cprint
 
@@ -309,6 +345,9 @@ class Character:
     def heal(self, amount: int) -> int:
         """Increases the character's hp by the given amount, up to max_hp.
 
+        The HEAL event is emitted by the caller, which knows what healed the
+        character, like the DAMAGE events of `take_damage`.
+
         Args:
             amount: The amount of healing to apply
 
@@ -317,8 +356,22 @@ class Character:
         """
         # Compute the actual amount we can heal.
         amount = max(0, min(amount, self.HP_MAX - self.hp))
+        # Nothing changes if nothing is healed.
+        if amount == 0:
+            return 0
         # Ensure we don't exceed the maximum hp.
+        previous_hp = self.hp
         self.hp += amount
+        if self.combat is not None and previous_hp <= 0:
+            self.combat.update_participant(self)
+        # Check for health thresholds crossed by the healing.
+        if self.effects_module.get_passive_triggers(TriggerType.ON_HIGH_HEALTH):
+            activation_messages = self.effects_module.check_health_triggers(previous_hp)
+            if activation_messages:
+                from core.utils import cprint
+
+                for msg in activation_messages:
+                    cprint(f"    {msg}")
         # Return the actual amount healed.
         return amount
 
@@ -584,6 +637,97 @@ class Character:
         """Create a Character instance from a dictionary representation."""
         return CharacterSerialization.from_dict(data)
 
+    # ============================================================================
+    # TEMPLATE INSTANCING
+    # ============================================================================
+
+    def spawn(self) -> "Character":
+        """Creates a fresh combat instance of this character, used as a template.
+
+        The instance shares the immutable content of the template (race,
+        classes, stats, weapons, armor, actions and spells) and only allocates
+        its own mutable state: hp, mind, cooldowns, uses, active effects, turn
+        flags and concentration. The template is never modified.
+
+        Returns:
+            Character: The new instance, at full hp and mind.
+        """
+        instance = type(self).__new__(type(self))
+        # Shared content.
+        instance.char_type = self.char_type
+        instance.name = self.name
+        instance.race = self.race
+        instance.levels = self.levels
+        instance.stats = self.stats
+        instance.spellcasting_ability = self.spellcasting_ability
+        instance.total_hands = self.total_hands
+        instance.resistances = self.resistances
+        instance.vulnerabilities = self.vulnerabilities
+        instance.number_of_attacks = self.number_of_attacks
+        # Own containers, holding the shared weapons, armor, actions and spells.
+        instance.equipped_weapons = list(self.equipped_weapons)
+        instance.natural_weapons = list(self.natural_weapons)
+        instance.equipped_armor = list(self.equipped_armor)
+        instance.actions = dict(self.actions)
+        instance.spells = dict(self.spells)
+        # Own modules and combat state.
+        instance._init_instance(self.passive_effects)
+        return instance
+
+    # ============================================================================
+    # COMBAT STATE
+    # ============================================================================
+
+    def get_state(self, encode: Callable[[Any], Any]) -> tuple:
+        """Captures the combat state of the character, to restore it later
+        with `set_state`. The content of the character is not captured.
+
+        Args:
+            encode (Callable[[Any], Any]): Maps the other characters to
+                references that `set_state` can resolve.
+
+        Returns:
+            tuple: The state.
+        """
+        return (
+            self.char_type,
+            self.hp,
+            self.mind,
+            self.damage_dealt,
+            self.damage_taken,
+            dict(self.cooldowns),
+            dict(self.uses),
+            self.actions_module.get_state(),
+            self.effects_module.get_state(encode),
+        )
+
+    def set_state(self, state: tuple, decode: Callable[[Any], Any]) -> None:
+        """Restores a combat state returned by `get_state`, on this character
+        or on an instance spawned from the same template. The concentration
+        is restored separately, once the effects of every character are.
+
+        Args:
+            state (tuple): The state.
+            decode (Callable[[Any], Any]): Resolves the references to the
+                other characters.
+        """
+        (
+            self.char_type,
+            self.hp,
+            self.mind,
+            self.damage_dealt,
+            self.damage_taken,
+            cooldowns,
+            uses,
+            actions_state,
+            effects_state,
+        ) = state
+        self.cooldowns = dict(cooldowns)
+        self.uses = dict(uses)
+        self.actions_module.set_state(actions_state)
+        self.effects_module.set_state(effects_state, decode)
+        self.stats_module.invalidate(abilities=False)
+
 
 def load_character(file_path: Path) -> Character | None:
     """
@@ -603,6 +747,9 @@ def load_character(file_path: Path) -> Character | None:
 def load_characters(file_path: Path) -> dict[str, Character]:
     """Loads characters from a JSON file.
 
+    The loaded characters are meant to be used as templates: use `spawn()` to
+    create the instances taking part in a combat.
+
     Args:
         file_path (Path): The path to the JSON file containing character data.
 
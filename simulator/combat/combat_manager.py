@@ -1,10 +1,11 @@
 # combat_manager.py
-import random
+from bisect import bisect_left
 from collections import deque
 from logging import debug
-from typing import List, Optional
+from typing import Any, Callable, List, Optional
 
-from core.utils import cprint, crule
+from core.rng import RandomStream, get_rng, with_own_rng
+from core.utils import cprint, crule, flush_output, is_output_enabled
 from catchery import *
 from actions.base_action import BaseAction
 from actions.attacks import BaseAttack, NaturalAttack, WeaponAttack
@@ -15,29 +16,67 @@ from actions.abilities import (
     BuffAbility,
     DebuffAbility,
 )
+from combat.events import CombatEvent, CombatEventType, emit_event, wants_event
+from combat.trigger_bus import TriggerBus, with_trigger_bus
 from combat.npc_ai import (
-    choose_best_attack_spell_action,
-    choose_best_base_attack_action,
-    choose_best_buff_spell_action,
-    choose_best_debuff_spell_action,
-    choose_best_healing_spell_action,
-    choose_best_target_for_weapon,
-    choose_best_weapon_for_situation,
-    choose_best_healing_ability_action,
-    choose_best_offensive_ability_action,
-    choose_best_buff_ability_action,
-    choose_best_debuff_ability_action,
-    get_actions_by_type,
+    ActionPlan,
+    DecisionContext,
+    choose_best_plan,
+    choose_best_target,
     get_natural_attacks,
 )
 from core.constants import ActionCategory, ActionType, CharacterType, is_oponent
 from core.sheets import print_character_sheet
 from character import Character
 from ui.cli_interface import PlayerInterface
+import ui.combat_log  # Renders the combat events on the console.
 
 
 FULL_ATTACK = BaseAction("Full Attack", ActionType.STANDARD, ActionCategory.OFFENSIVE)
 
+# A policy decides and performs the actions of a character during its turn.
+PlayerPolicy = Callable[["CombatManager", Character], None]
+
+
+class CombatSnapshot:
+    """The state of a running combat, taken with `CombatManager.snapshot`.
+
+    Only the combat state is captured: hp, mind, cooldowns, uses, turn flags,
+    active effects, trigger counters and concentration of the participants,
+    the turn order and the random stream. The participants refer to each
+    other by their position in the turn order, and their content (race,
+    classes, stats, equipment, actions, spells and passive effects) is never
+    copied.
+    """
+
+    __slots__ = (
+        "participants",
+        "player",
+        "initiatives",
+        "turn_number",
+        "rng_state",
+        "characters",
+        "concentration",
+    )
+
+    def __init__(
+        self,
+        participants: tuple[Character, ...],
+        player: int,
+        initiatives: tuple[int, ...],
+        turn_number: int,
+        rng_state: Any,
+        characters: tuple[tuple, ...],
+        concentration: tuple[tuple, ...],
+    ) -> None:
+        self.participants: tuple[Character, ...] = participants
+        self.player: int = player
+        self.initiatives: tuple[int, ...] = initiatives
+        self.turn_number: int = turn_number
+        self.rng_state: Any = rng_state
+        self.characters: tuple[tuple, ...] = characters
+        self.concentration: tuple[tuple, ...] = concentration
+
 
 class CombatManager:
     """Manages the flow of combat, including turn order, actions, and combat phases.
@@ -53,6 +92,9 @@ class CombatManager:
         player: Character,
         enemies: list[Character],
         friendlies: list[Character],
+        rng: Optional[RandomStream] = None,
+        player_policy: Optional[PlayerPolicy] = None,
+        npc_policies: Optional[dict[str, PlayerPolicy]] = None,
     ):
         """Initialize the CombatManager with participants and turn order.
 
@@ -60,28 +102,114 @@ class CombatManager:
             player (Character): The player character controlled by the user.
             enemies (list[Character]): List of enemy characters.
             friendlies (list[Character]): List of friendly characters.
+            rng (Optional[RandomStream]): The random stream of this combat,
+                active while the combat runs. Defaults to the active stream.
+            player_policy (Optional[PlayerPolicy]): Policy controlling the
+                player instead of the user interface, for unattended runs.
+            npc_policies (Optional[dict[str, PlayerPolicy]]): Policies
+                controlling some NPCs, by name, instead of the NPC AI.
+        """
+        rng = rng if rng is not None else get_rng()
+        participants = [player] + enemies + friendlies
+        self._init_state(
+            rng,
+            player,
+            participants,
+            {
+                participant: rng.randint(1, 20) + participant.INITIATIVE
+                for participant in participants
+            },
+            0,
+            player_policy,
+            npc_policies,
+        )
+
+    def _init_state(
+        self,
+        rng: RandomStream,
+        player: Character,
+        participants: list[Character],
+        initiatives: dict[Character, int],
+        turn_number: int,
+        player_policy: Optional[PlayerPolicy],
+        npc_policies: Optional[dict[str, PlayerPolicy]],
+        ui: Optional[PlayerInterface] = None,
+    ) -> None:
+        """Sets up the state of the combat, shared by `__init__` and `fork`.
+
+        Args:
+            rng (RandomStream): The random stream of this combat.
+            player (Character): The player character.
+            participants (list[Character]): The participants, in their order.
+            initiatives (dict[Character, int]): The initiative of each
+                participant.
+            turn_number (int): The round number.
+            player_policy (Optional[PlayerPolicy]): Policy controlling the
+                player, if any.
+            npc_policies (Optional[dict[str, PlayerPolicy]]): Policies
+                controlling some NPCs, by name.
+            ui (Optional[PlayerInterface]): The user interface, if already
+                built.
         """
-        # Store the ui.
-        self.ui: PlayerInterface = PlayerInterface()
+        # The random stream used for every roll of this combat.
+        self.rng: RandomStream = rng
+
+        # The ui, only built when the user plays, see `ui`.
+        self._ui: Optional[PlayerInterface] = ui
 
         # The player character, who is controlled by the user.
         self.player: Character = player
 
+        # Drives the player without user input, if set.
+        self.player_policy: Optional[PlayerPolicy] = player_policy
+
+        # Drives the NPCs with these names instead of the NPC AI.
+        self.npc_policies: dict[str, PlayerPolicy] = dict(npc_policies or {})
+
         # Combine all participants for the deque, ensuring player is handled specifically
-        self.participants: deque[Character] = deque([player] + enemies + friendlies)
+        self.participants: deque[Character] = deque(participants)
 
         # Stores the initiative of each participant.
-        self.initiatives: dict[Character, int] = {
-            participant: random.randint(1, 20) + participant.INITIATIVE
-            for participant in self.participants
-        }
+        self.initiatives: dict[Character, int] = initiatives
 
         # This will now represent the "Round Number"
-        self.turn_number: int = 0
+        self.turn_number: int = turn_number
 
+        # Routes the combat events to the triggers of the participants.
+        self.trigger_bus: TriggerBus = TriggerBus()
+        for participant in self.participants:
+            self.trigger_bus.add_participant(participant)
+
+        # The position of each participant in the turn order, the alive
+        # participants, and the alive opponents and friendlies of each
+        # character type, all in turn order and kept up to date as the
+        # participants die or are revived.
+        self._turn_index: dict[Character, int] = {}
+        self._alive: list[Character] = []
+        self._alive_opponents: dict[CharacterType, list[Character]] = {}
+        self._alive_friendlies: dict[CharacterType, list[Character]] = {}
+        # The participants each actor may target with each action, whatever
+        # their HP, with whether they must be wounded. Computed on first use,
+        # and discarded when a participant joins or changes faction: the HP
+        # of the targets are only checked on each query.
+        self._legal_targets: dict[
+            tuple[BaseAction, Character], list[tuple[Character, bool]]
+        ] = {}
+        self._index_participants()
+
+    @property
+    def ui(self) -> PlayerInterface:
+        """Returns the user interface, built on first use so that unattended
+        combats, driven by a player policy, never touch the terminal."""
+        if self._ui is None:
+            self._ui = PlayerInterface()
+        return self._ui
+
+    @with_own_rng
+    @with_trigger_bus
     def initialize(self) -> None:
         """Initializes the combat by sorting participants by initiative."""
-        # Ensure each character has an 'initiative' attribute (e.g., random.randint(1, 20) + char.DEX)
+        # Ensure each character has an 'initiative' attribute (e.g., self.rng.randint(1, 20) + char.DEX)
         # before calling initialize if not already done.
         self.participants = deque(
             sorted(
@@ -90,6 +218,7 @@ class CombatManager:
                 reverse=True,
             )
         )
+        self._index_participants()
         cprint("[bold green]Combat initialized![/]")
         cprint("[bold yellow]Turn Order:[/]")
         for participant in self.participants:
@@ -99,13 +228,56 @@ class CombatManager:
             status_line = participant.get_status_line(show_bars=True, show_ac=show_ac)
             cprint(f"    🎲 {self.initiatives[participant]:3}  {status_line}")
 
+    def _index_participants(self) -> None:
+        """Rebuilds the turn order and alive indexes from the participants."""
+        self._turn_index = {
+            participant: index for index, participant in enumerate(self.participants)
+        }
+        self._alive = [char for char in self.participants if char.is_alive()]
+        for char_type in CharacterType:
+            self._alive_opponents[char_type] = [
+                char for char in self._alive if is_oponent(char_type, char.char_type)
+            ]
+            self._alive_friendlies[char_type] = [
+                char
+                for char in self._alive
+                if not is_oponent(char_type, char.char_type)
+            ]
+        for participant in self.participants:
+            participant.combat = self
+        self._legal_targets.clear()
+
+    def update_participant(self, character: Character) -> None:
+        """Updates the alive indexes after a participant died or was revived.
+
+        Args:
+            character (Character): The participant.
+        """
+        index = self._turn_index.get(character)
+        if index is None:
+            return
+        alive = character.is_alive()
+        indexes = [self._alive]
+        for char_type in CharacterType:
+            if is_oponent(char_type, character.char_type):
+                indexes.append(self._alive_opponents[char_type])
+            else:
+                indexes.append(self._alive_friendlies[char_type])
+        for members in indexes:
+            position = bisect_left(members, index, key=self._turn_index.__getitem__)
+            present = position < len(members) and members[position] is character
+            if alive and not present:
+                members.insert(position, character)
+            elif not alive and present:
+                del members[position]
+
     def get_alive_participants(self) -> list[Character]:
         """Returns a list of all participants (player, enemies, friendlies) who are still alive.
 
         Returns:
             list[Character]: A list of alive characters.
         """
-        return [char for char in self.participants if char.is_alive()]
+        return list(self._alive)
 
     def get_alive_opponents(self, actor: Character) -> list[Character]:
         """Returns a list of opponents for the actor, who are still alive.
@@ -116,11 +288,7 @@ class CombatManager:
         Returns:
             list[Character]: A list of alive opponents.
         """
-        return [
-            char
-            for char in self.get_alive_participants()
-            if is_oponent(actor.char_type, char.char_type)
-        ]
+        return list(self._alive_opponents[actor.char_type])
 
     def get_alive_friendlies(self, actor: Character) -> list[Character]:
         """Returns a list of friendly characters for the actor, who are still alive.
@@ -131,12 +299,10 @@ class CombatManager:
         Returns:
             list[Character]: A list of alive friendly characters.
         """
-        return [
-            char
-            for char in self.get_alive_participants()
-            if not is_oponent(actor.char_type, char.char_type)
-        ]
+        return list(self._alive_friendlies[actor.char_type])
 
+    @with_own_rng
+    @with_trigger_bus
     def run_turn(self) -> bool:
         """Runs a single turn within the combat round.
 
@@ -170,6 +336,9 @@ class CombatManager:
         # Increment the turn number after all participants have acted.
         self.turn_number += 1
 
+        # Write out the output of the whole turn at once.
+        flush_output()
+
         return True
 
     def run_participant_turn(self, participant: Character):
@@ -181,9 +350,13 @@ class CombatManager:
         if participant.is_alive():
             # Reset the participant's turn flags to allow for new actions.
             participant.reset_turn_flags()
+            if wants_event(CombatEventType.TURN_START):
+                emit_event(CombatEvent(CombatEventType.TURN_START, actor=participant))
 
             # Print the participant's status line with appropriate display mode
-            if participant == self.player:
+            if not is_output_enabled():
+                pass
+            elif participant == self.player:
                 # Player gets full display: numbers + bars + AC
                 cprint(
                     participant.get_status_line(
@@ -204,14 +377,42 @@ class CombatManager:
             else:
                 # Execute the participant's action based on whether they are the player or an NPC.
                 if participant == self.player:
-                    self.ask_for_player_action()
+                    if self.player_policy is not None:
+                        self.player_policy(self, participant)
+                    else:
+                        self.ask_for_player_action()
+                elif participant.name in self.npc_policies:
+                    self.npc_policies[participant.name](self, participant)
                 else:
                     self.execute_npc_action(participant)
 
-            # Apply end-of-turn updates and check for expiration
-            participant.turn_update()
+            self.end_participant_turn(participant)
+
+    def end_participant_turn(self, participant: Character) -> None:
+        """Ends the turn of a participant, updating its effects.
+
+        Args:
+            participant (Character): The participant whose turn ends.
+        """
+        if wants_event(CombatEventType.TURN_END):
+            emit_event(CombatEvent(CombatEventType.TURN_END, actor=participant))
+
+        # Apply end-of-turn updates and check for expiration
+        participant.turn_update()
+
+        cprint("")
 
-            cprint("")
+    def finish_round(self, participant: Character) -> None:
+        """Runs the rest of the round, after the turn of a participant.
+
+        Args:
+            participant (Character): The participant whose turn just ended.
+        """
+        index = self._turn_index[participant]
+        remaining = [char for char in self._alive if self._turn_index[char] > index]
+        for char in remaining:
+            self.run_participant_turn(char)
+        self.turn_number += 1
 
     def ask_for_player_action(self) -> None:
         """Handles player input for choosing an action and target during their turn."""
@@ -266,7 +467,7 @@ class CombatManager:
             return
 
         # Get the legal targets for the action.
-        valid_targets = self._get_legal_targets(self.player, attack)
+        valid_targets = self.get_legal_targets(self.player, attack)
         if not valid_targets:
             log_warning(
                 f"No valid targets for {attack.name}",
@@ -293,7 +494,7 @@ class CombatManager:
             # If the current target is dead, ask for a new target
             current_target = target
             if not target.is_alive():
-                remaining_targets = self._get_legal_targets(self.player, attack)
+                remaining_targets = self.get_legal_targets(self.player, attack)
                 if not remaining_targets:
                     break
                 current_target = self.ui.choose_target(
@@ -360,6 +561,7 @@ class CombatManager:
                     spell.cast_spell(self.player, target, mind_level)
                 # Remove the MIND cost from the player.
                 self.player.mind -= mind_level
+                self._publish_spell_cast(self.player, spell, mind_level, targets)
                 # Mark the action type as used.
                 self.player.use_action_type(spell.action_type)
                 # Add the spell to the cooldowns if it has one.
@@ -404,7 +606,7 @@ class CombatManager:
             Optional[Character | str]: The chosen target, or None if no valid target was selected.
         """
         # Get the legal targets for the action.
-        valid_targets = self._get_legal_targets(self.player, action)
+        valid_targets = self.get_legal_targets(self.player, action)
         if not valid_targets:
             log_warning(
                 f"No valid targets for {action.name}",
@@ -431,7 +633,7 @@ class CombatManager:
             Optional[list[Character] | str]: The chosen targets, or None if no valid targets were selected.
         """
         # Get the legal targets for the action.
-        valid_targets = self._get_legal_targets(self.player, action)
+        valid_targets = self.get_legal_targets(self.player, action)
         if len(valid_targets) == 0:
             log_warning(
                 f"No valid targets for {action.name}",
@@ -471,12 +673,28 @@ class CombatManager:
         # Ask the player to choose multiple targets.
         return self.ui.choose_targets(valid_targets, max_targets)
 
-    def execute_npc_action(self, npc: Character):
+    def execute_npc_action(
+        self, npc: Character, context: Optional[DecisionContext] = None
+    ):
         """Executes the action logic for an NPC during their turn.
 
+        The NPC keeps performing the plan with the highest utility, until it
+        has nothing left worth doing this turn.
+
         Args:
             npc (Character): The NPC whose action is being executed.
+            context (Optional[DecisionContext]): The decision context, to
+                continue a turn the NPC already started. Defaults to a new one.
         """
+        if context is not None:
+            while True:
+                plan = choose_best_plan(context)
+                if plan is None:
+                    break
+                self.execute_npc_plan(npc, plan, context)
+                context.invalidate()
+            return
+
         allies = self.get_alive_friendlies(npc)
         enemies = self.get_alive_opponents(npc)
 
@@ -491,179 +709,207 @@ class CombatManager:
             )
             return
 
-        # Check for healing spells.
-        spell_heals: list[SpellHeal] = get_actions_by_type(npc, SpellHeal)
-        if spell_heals:
-            result = choose_best_healing_spell_action(npc, allies, spell_heals)
-            if result:
-                spell, mind_level, targets = result
-                # Cast the healing spell on the targets.
-                for t in targets:
-                    spell.cast_spell(npc, t, mind_level)
-                # Add the spell to the cooldowns if it has one.
-                npc.add_cooldown(spell)
+        # What the NPC knows about the combat, shared by all its decisions.
+        self.execute_npc_action(
+            npc, DecisionContext(npc, allies, enemies, self.get_legal_targets)
+        )
+
+    def execute_npc_plan(
+        self, npc: Character, plan: ActionPlan, context: DecisionContext
+    ) -> None:
+        """Performs a plan chosen by the NPC AI.
+
+        Args:
+            npc (Character): The NPC performing the plan.
+            plan (ActionPlan): The plan.
+            context (DecisionContext): The decision context of the NPC.
+        """
+        action = plan.action
+        if isinstance(action, Spell):
+            # Cast the spell on the targets.
+            for target in plan.targets:
+                action.cast_spell(npc, target, plan.mind_level)
+            # Add the spell to the cooldowns if it has one.
+            npc.add_cooldown(action)
+            # Mark the action type as used.
+            npc.use_action_type(action.action_type)
+            # Remove the MIND cost from the NPC.
+            npc.mind -= plan.mind_level
+            self._publish_spell_cast(npc, action, plan.mind_level, plan.targets)
+            context.performed.add(action)
+
+        elif isinstance(action, WeaponAttack):
+            # Perform multiple attacks with the same weapon type.
+            current_target: Optional[Character] = plan.targets[0]
+            used_weapon_attack: bool = False
+            for attack_num in range(npc.number_of_attacks):
+                # If current target is dead, find a new one.
+                if not current_target or not current_target.is_alive():
+                    context.invalidate()
+                    current_target = choose_best_target(context, action)
+                    if not current_target:
+                        # No more valid targets.
+                        break
+                # Perform the attack.
+                action.execute(npc, current_target)
+                used_weapon_attack = True
+            # Add cooldown and mark action type only once after all attacks.
+            if used_weapon_attack:
+                npc.add_cooldown(action)
+                npc.use_action_type(action.action_type)
+            context.performed.add(action)
+
+        elif isinstance(action, NaturalAttack):
+            # Natural attacks are designed as a sequence - perform each
+            # different attack once.
+            for attack in get_natural_attacks(npc):
+                if attack is action:
+                    target = plan.targets[0]
+                else:
+                    context.invalidate()
+                    target = choose_best_target(context, attack)
+                if target is None or not target.is_alive():
+                    continue
+                # Perform the natural attack on the target.
+                attack.execute(npc, target)
+                # Add the attack to the cooldowns if it has one.
+                npc.add_cooldown(attack)
                 # Mark the action type as used.
-                npc.use_action_type(spell.action_type)
-                # Remove the MIND cost from the NPC.
-                npc.mind -= mind_level
+                npc.use_action_type(attack.action_type)
+                context.performed.add(attack)
+            context.performed.add(action)
+
+        else:
+            # Use the ability on the targets.
+            for target in plan.targets:
+                action.execute(npc, target)
+            # Add the ability to the cooldowns if it has one.
+            npc.add_cooldown(action)
+            # Mark the action type as used.
+            npc.use_action_type(action.action_type)
+            context.performed.add(action)
+
+    def _publish_spell_cast(
+        self,
+        caster: Character,
+        spell: Spell,
+        mind_level: int,
+        targets: list[Character],
+    ) -> None:
+        """Emits the SPELL_CAST event of a spell cast on its targets.
+
+        Args:
+            caster (Character): The character casting the spell.
+            spell (Spell): The spell.
+            mind_level (int): The mind level the spell was cast at.
+            targets (list[Character]): The targets of the spell.
+        """
+        if wants_event(CombatEventType.SPELL_CAST):
+            emit_event(
+                CombatEvent(
+                    CombatEventType.SPELL_CAST,
+                    actor=caster,
+                    action=spell,
+                    mind_level=mind_level,
+                    targets=list(targets),
+                )
+            )
 
-        # Check for healing abilities.
-        healing_abilities: list[HealingAbility] = get_actions_by_type(
-            npc, HealingAbility
+    def snapshot(self) -> CombatSnapshot:
+        """Captures the state of the combat, to restore it or fork it later.
+
+        Returns:
+            CombatSnapshot: The snapshot.
+        """
+        participants = tuple(self.participants)
+        index = {id(participant): i for i, participant in enumerate(participants)}
+
+        def encode(character: Any) -> Any:
+            # Characters outside the combat are kept as they are.
+            return index.get(id(character), character)
+
+        return CombatSnapshot(
+            participants,
+            index[id(self.player)],
+            tuple(self.initiatives[participant] for participant in participants),
+            self.turn_number,
+            self.rng.get_state(),
+            tuple(participant.get_state(encode) for participant in participants),
+            tuple(
+                participant.concentration_module.get_state(encode)
+                for participant in participants
+            ),
         )
-        if healing_abilities:
-            result = choose_best_healing_ability_action(npc, allies, healing_abilities)
-            if result:
-                ability, targets = result
-                # Use the healing ability on the targets.
-                for t in targets:
-                    ability.execute(npc, t)
-                # Add the ability to the cooldowns if it has one.
-                npc.add_cooldown(ability)
-                # Mark the action type as used.
-                npc.use_action_type(ability.action_type)
-
-        # Check for buff spells.
-        spell_buffs: list[SpellBuff] = get_actions_by_type(npc, SpellBuff)
-        if spell_buffs:
-            result = choose_best_buff_spell_action(npc, allies, spell_buffs)
-            if result:
-                spell, mind_level, targets = result
-                # Cast the buff spell on the targets.
-                for t in targets:
-                    spell.cast_spell(npc, t, mind_level)
-                # Add the spell to the cooldowns if it has one.
-                npc.add_cooldown(spell)
-                # Mark the action type as used.
-                npc.use_action_type(spell.action_type)
-                # Remove the MIND cost from the NPC.
-                npc.mind -= mind_level
-
-        # Check for buff abilities.
-        buff_abilities: list[BuffAbility] = get_actions_by_type(npc, BuffAbility)
-        if buff_abilities:
-            result = choose_best_buff_ability_action(npc, allies, buff_abilities)
-            if result:
-                ability, targets = result
-                # Use the buff ability on the targets.
-                for t in targets:
-                    ability.execute(npc, t)
-                # Add the ability to the cooldowns if it has one.
-                npc.add_cooldown(ability)
-                # Mark the action type as used.
-                npc.use_action_type(ability.action_type)
-
-        # Check for debuff spells.
-        spell_debuffs: list[SpellDebuff] = get_actions_by_type(npc, SpellDebuff)
-        if spell_debuffs:
-            result = choose_best_debuff_spell_action(npc, enemies, spell_debuffs)
-            if result:
-                spell, mind_level, targets = result
-                # Cast the debuff spell on the targets.
-                for t in targets:
-                    spell.cast_spell(npc, t, mind_level)
-                # Add the spell to the cooldowns if it has one.
-                npc.add_cooldown(spell)
-                # Mark the action type as used.
-                npc.use_action_type(spell.action_type)
-                # Remove the MIND cost from the NPC.
-                npc.mind -= mind_level
-
-        # Check for debuff abilities.
-        debuff_abilities: list[DebuffAbility] = get_actions_by_type(npc, DebuffAbility)
-        if debuff_abilities:
-            result = choose_best_debuff_ability_action(npc, enemies, debuff_abilities)
-            if result:
-                ability, targets = result
-                # Use the debuff ability on the targets.
-                for t in targets:
-                    ability.execute(npc, t)
-                # Add the ability to the cooldowns if it has one.
-                npc.add_cooldown(ability)
-                # Mark the action type as used.
-                npc.use_action_type(ability.action_type)
-
-        # Check for attack spells.
-        spell_attacks: list[SpellAttack] = get_actions_by_type(npc, SpellAttack)
-        if spell_attacks:
-            result = choose_best_attack_spell_action(npc, enemies, spell_attacks)
-            if result:
-                spell, mind_level, targets = result
-                # Cast the attack spell on the targets.
-                for target in targets:
-                    spell.cast_spell(npc, target, mind_level)
-                # Add the spell to the cooldowns if it has one.
-                npc.add_cooldown(spell)
-                # Mark the action type as used.
-                npc.use_action_type(spell.action_type)
-                # Remove the MIND cost from the NPC.
-                npc.mind -= mind_level
 
-        # Check for offensive abilities.
-        offensive_abilities: list[OffensiveAbility] = get_actions_by_type(
-            npc, OffensiveAbility
+    def restore(self, snapshot: CombatSnapshot) -> None:
+        """Brings the combat back to the state of a snapshot taken from it.
+
+        Args:
+            snapshot (CombatSnapshot): The snapshot.
+        """
+        self.participants = deque(snapshot.participants)
+        self.rng.set_state(snapshot.rng_state)
+        self.turn_number = snapshot.turn_number
+        self._restore(snapshot, snapshot.participants)
+
+    def fork(
+        self, rng: RandomStream, snapshot: Optional[CombatSnapshot] = None
+    ) -> "CombatManager":
+        """Creates an independent copy of the combat, e.g., to look ahead.
+
+        The participants are spawned anew and given the combat state of the
+        snapshot, while their content, the policies and the user interface
+        are shared.
+
+        Args:
+            rng (RandomStream): The random stream of the copy.
+            snapshot (Optional[CombatSnapshot]): The state to copy, taken from
+                this combat. Defaults to the current state.
+
+        Returns:
+            CombatManager: The copy, which can run without affecting this one.
+        """
+        if snapshot is None:
+            snapshot = self.snapshot()
+        participants = tuple(
+            participant.spawn() for participant in snapshot.participants
         )
-        if offensive_abilities:
-            result = choose_best_offensive_ability_action(
-                npc, enemies, offensive_abilities
-            )
-            if result:
-                ability, targets = result
-                # Use the offensive ability on the targets.
-                for target in targets:
-                    ability.execute(npc, target)
-                # Add the ability to the cooldowns if it has one.
-                npc.add_cooldown(ability)
-                # Mark the action type as used.
-                npc.use_action_type(ability.action_type)
-
-        # Check for base attacks.
-        weapon_attacks: list[WeaponAttack] = get_actions_by_type(npc, WeaponAttack)
-        used_weapon_attack: bool = False
-        if weapon_attacks:
-            # Choose the best weapon type once for the full attack sequence
-            best_weapon = choose_best_weapon_for_situation(npc, weapon_attacks, enemies)
-            if best_weapon:
-                # Get initial target for this weapon
-                current_target = choose_best_target_for_weapon(
-                    npc, best_weapon, enemies
-                )
+        fork = type(self).__new__(type(self))
+        fork._init_state(
+            rng,
+            participants[snapshot.player],
+            list(participants),
+            dict(zip(participants, snapshot.initiatives)),
+            snapshot.turn_number,
+            self.player_policy,
+            self.npc_policies,
+            self._ui,
+        )
+        fork._restore(snapshot, participants)
+        return fork
 
-                # Perform multiple attacks with the same weapon type
-                for attack_num in range(npc.number_of_attacks):
-                    # If current target is dead, find a new one
-                    if not current_target or not current_target.is_alive():
-                        current_target = choose_best_target_for_weapon(
-                            npc, best_weapon, enemies
-                        )
-                        if not current_target:
-                            # No more valid targets
-                            break
-
-                    # Perform the attack
-                    best_weapon.execute(npc, current_target)
-                    used_weapon_attack = True
-
-                # Add cooldown and mark action type only once after all attacks
-                if used_weapon_attack:
-                    npc.add_cooldown(best_weapon)
-                    npc.use_action_type(best_weapon.action_type)
-
-        # Check for natural attacks.
-        if not used_weapon_attack:
-            # Natural attacks are designed as a sequence - perform each different attack once
-            for attack in get_natural_attacks(npc):
-                result = choose_best_base_attack_action(npc, enemies, [attack])
-                if result:
-                    _, target = result
-                    # Perform the natural attack on the target.
-                    attack.execute(npc, target)
-                    # Add the attack to the cooldowns if it has one.
-                    npc.add_cooldown(attack)
-                    # Mark the action type as used.
-                    npc.use_action_type(attack.action_type)
-
-    def _get_legal_targets(
+    def _restore(
+        self, snapshot: CombatSnapshot, participants: tuple[Character, ...]
+    ) -> None:
+        """Gives the state of a snapshot to the participants.
+
+        Args:
+            snapshot (CombatSnapshot): The snapshot.
+            participants (tuple[Character, ...]): The participants, in the
+                order of the snapshot.
+        """
+
+        def decode(ref: Any) -> Any:
+            return participants[ref] if isinstance(ref, int) else ref
+
+        for participant, state in zip(participants, snapshot.characters):
+            participant.set_state(state, decode)
+        # The concentration refers to the active effects of the targets.
+        for participant, state in zip(participants, snapshot.concentration):
+            participant.concentration_module.set_state(state, decode)
+        self._index_participants()
+
+    def get_legal_targets(
         self, character: Character, ability: BaseAction
     ) -> list[Character]:
         """Retrieves a list of legal targets for the given character and ability.
@@ -675,12 +921,34 @@ class CombatManager:
         Returns:
             list[Character]: A list of legal targets for the action or spell.
         """
+        if not character.is_alive():
+            return []
+        key = (ability, character)
+        entries = self._legal_targets.get(key)
+        if entries is None:
+            # The rules only depend on the factions, and on whether the target
+            # is the character itself.
+            rules: dict[tuple[CharacterType, bool], tuple[bool, bool]] = {}
+            entries = []
+            for target in self.participants:
+                rule_key = (target.char_type, target is character)
+                rule = rules.get(rule_key)
+                if rule is None:
+                    rule = rules[rule_key] = (
+                        ability.is_valid_relationship(character, target),
+                        ability.requires_wounded_target(character, target),
+                    )
+                if rule[0]:
+                    entries.append((target, rule[1]))
+            self._legal_targets[key] = entries
         return [
-            participant
-            for participant in self.participants
-            if ability.is_valid_target(character, participant)
+            target
+            for target, wounded in entries
+            if target.is_alive() and (not wounded or target.hp < target.HP_MAX)
         ]
 
+    @with_own_rng
+    @with_trigger_bus
     def pre_combat_phase(self) -> None:
         """Handles the pre-combat phase where the player can prepare for combat."""
         crule(":hourglass_done: Pre-Combat Phase", style="blue")
@@ -704,6 +972,8 @@ class CombatManager:
             if not self.ask_for_player_spell_cast(buffs + heals):
                 break
 
+    @with_own_rng
+    @with_trigger_bus
     def post_combat_phase(self) -> None:
         """Handles the post-combat phase where the player can heal friendly characters."""
         crule(":hourglass_done: Post-Combat Healing", style="green")
@@ -1,13 +1,12 @@
 from typing import Any, Tuple
 
+from combat.events import CombatEvent, CombatEventType, emit_event, wants_event
 from core.constants import (
     BonusType,
     DamageType,
     GLOBAL_VERBOSE_LEVEL,
-    apply_damage_type_color,
-    get_damage_type_emoji,
 )
-from core.utils import roll_and_describe
+from core.utils import roll_and_describe, roll_expression
 from catchery import *
 
 
@@ -128,9 +127,9 @@ def roll_damage_component(
     actor: Any,
     target: Any,
     damage_component: Tuple[DamageComponent, int],
-) -> Tuple[int, str]:
+) -> Tuple[int, CombatEvent]:
     """Applies a single damage component to the target, handles resistances,
-    and returns the damage dealt along with a description string.
+    and returns the damage dealt along with the corresponding damage event.
 
     Args:
         actor (Any): The actor applying the damage.
@@ -139,38 +138,46 @@ def roll_damage_component(
             and the mind level to use for the damage roll.
 
     Returns:
-        Tuple[int, str]: The damage dealt and a description string.
+        Tuple[int, CombatEvent]: The damage dealt and the DAMAGE event.
     """
-    variables = actor.get_expression_variables()
-    variables["MIND"] = damage_component[1]
-    # Substitute variables in the damage roll expression.
-    dmg_value, dmg_desc, _ = roll_and_describe(
-        damage_component[0].damage_roll, variables
-    )
+    variables = actor.get_expression_variables(damage_component[1])
+    # Only describe the roll if someone is going to read the description.
+    detailed = wants_event(CombatEventType.DAMAGE)
+    if detailed:
+        dmg_value, dmg_desc, _ = roll_and_describe(
+            damage_component[0].damage_roll, variables
+        )
+    else:
+        dmg_value = roll_expression(damage_component[0].damage_roll, variables)
+        dmg_desc = ""
+    # Negative modifiers can bring a roll below zero, which deals no damage.
+    dmg_value = max(dmg_value, 0)
     assert (
         isinstance(dmg_value, int) and dmg_value >= 0
     ), f"Damange must have a non-negative integer damage value, got {dmg_value}."
     # Apply the damage to the target, taking into account resistances.
     base, adjusted, taken = target.take_damage(
-        dmg_value, damage_component[0].damage_type
+        dmg_value, damage_component[0].damage_type, actor
     )
-    # Create a damage string for display.
-    dmg_str = apply_damage_type_color(
-        damage_component[0].damage_type,
-        f"{taken} {get_damage_type_emoji(damage_component[0].damage_type)} ",
+    event = CombatEvent(
+        CombatEventType.DAMAGE,
+        actor=actor,
+        target=target,
+        damage_type=damage_component[0].damage_type,
+        base=base,
+        adjusted=adjusted,
+        amount=taken,
+        description=dmg_desc,
+        defeated=not target.is_alive(),
     )
-    # If the base damage differs from the adjusted damage (due to resistances),
-    # include the original and adjusted values in the damage string.
-    if base != adjusted:
-        dmg_str += f"[dim](reduced: {base} → {adjusted})[/]"
-    # Append the rolled damage expression to the damage string.
-    dmg_str += f"({dmg_desc})"
-    return taken, dmg_str
+    if detailed:
+        emit_event(event)
+    return taken, event
 
 
 def roll_damage_components(
     actor: Any, target: Any, damage_components: list[Tuple[DamageComponent, int]]
-) -> Tuple[int, list[str]]:
+) -> Tuple[int, list[CombatEvent]]:
     """Rolls damage for multiple components and returns the total damage and details.
 
     Args:
@@ -179,23 +186,23 @@ def roll_damage_components(
         damage_components (list[Tuple[DamageComponent, int]]): The damage components being applied.
 
     Returns:
-        Tuple[int, list[str]]: The total damage dealt and a list of damage detail strings.
+        Tuple[int, list[CombatEvent]]: The total damage dealt and the DAMAGE event of each component.
     """
     total_damage = 0
-    damage_details: list[str] = []
+    damage_details: list[CombatEvent] = []
     for component in damage_components:
         # Roll the damage for the current component.
-        dmg_value, dmg_str = roll_damage_component(actor, target, component)
+        dmg_value, dmg_event = roll_damage_component(actor, target, component)
         # Add the rolled damage to the total.
         total_damage += dmg_value
-        # Add the damage string to the list of damage details.
-        damage_details.append(dmg_str)
+        # Add the damage event to the list of damage details.
+        damage_details.append(dmg_event)
     return total_damage, damage_details
 
 
 def roll_damage_component_no_mind(
     actor: Any, target: Any, damage_component: DamageComponent
-) -> Tuple[int, str]:
+) -> Tuple[int, CombatEvent]:
     """Rolls a single damage component without mind levels and returns the damage dealt and details.
 
     Args:
@@ -204,14 +211,14 @@ def roll_damage_component_no_mind(
         damage_component (DamageComponent): The damage component being applied.
 
     Returns:
-        Tuple[int, str]: The damage dealt and a description string.
+        Tuple[int, CombatEvent]: The damage dealt and the DAMAGE event.
     """
     return roll_damage_component(actor, target, (damage_component, 1))
 
 
 def roll_damage_components_no_mind(
     actor: Any, target: Any, damage_components: list[DamageComponent]
-) -> Tuple[int, list[str]]:
+) -> Tuple[int, list[CombatEvent]]:
     """Rolls damage for multiple components without mind levels and returns the total damage and details.
 
     Args:
@@ -220,6 +227,6 @@ def roll_damage_components_no_mind(
         damage_components (list[DamageComponent]): The damage components being applied.
 
     Returns:
-        Tuple[int, list[str]]: The total damage dealt and a list of damage detail strings.
+        Tuple[int, list[CombatEvent]]: The total damage dealt and the DAMAGE event of each component.
     """
     return roll_damage_components(actor, target, [(dc, 1) for dc in damage_components])
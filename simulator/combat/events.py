@@ -0,0 +1,319 @@
+"""
+Typed combat events.
+
+Actions and effects describe what happens during combat by emitting events
+instead of printing pre-formatted messages. Subscribers decide what to do with
+them: the console renderer in `ui.combat_log` turns them into text, while batch
+runs can aggregate metrics directly. When no active subscriber wants an event
+type, emitters skip building the event altogether.
+"""
+
+from contextlib import contextmanager
+from enum import Enum
+from typing import Any, Callable, Iterable, Iterator, Optional
+from catchery import *
+
+
+class CombatEventType(Enum):
+    """The kinds of events emitted during combat."""
+
+    ATTACK_ROLL = "attack_roll"
+    HIT = "hit"
+    MISS = "miss"
+    DAMAGE = "damage"
+    HEAL = "heal"
+    EFFECT_APPLIED = "effect_applied"
+    EFFECT_REPLACED = "effect_replaced"
+    EFFECT_EXPIRED = "effect_expired"
+    CONCENTRATION_BROKEN = "concentration_broken"
+    TRIGGER_ACTIVATED = "trigger_activated"
+    DEATH = "death"
+    SPELL_CAST = "spell_cast"
+    TURN_START = "turn_start"
+    TURN_END = "turn_end"
+
+
+class CombatEvent:
+    """Something that happened during combat.
+
+    Only the fields that make sense for the event type are set:
+        ATTACK_ROLL: actor, target, action, total, description, ac, mind_level.
+        HIT: actor, target, action, total, description, ac, critical, fumble,
+            amount, damage, defeated, effect, effect_applied, mind_level. The
+            roll fields are left empty for abilities hitting automatically.
+        MISS: actor, target, action, total, description, ac, fumble,
+            mind_level.
+        DAMAGE: actor (the source, if known), target, damage_type, base,
+            adjusted, amount, description, effect (for damage over time),
+            defeated.
+        HEAL: actor (the source, if known), target, amount, base (the rolled
+            amount), description, and either action, mind_level, effect and
+            effect_applied (for healing actions) or effect (for healing over
+            time).
+        EFFECT_APPLIED: actor, target, effect, mind_level, effect_applied, and
+            action (for the effects applied by actions, which also report the
+            effects they failed to apply).
+        EFFECT_REPLACED: target, effect (the new one), replaced (the old one).
+        EFFECT_EXPIRED: target, effect.
+        CONCENTRATION_BROKEN: actor (the caster), action (the spell), targets,
+            description (why it was broken, if not by the caster).
+        TRIGGER_ACTIVATED: actor, effect.
+        DEATH: actor (the source, if known), target.
+        SPELL_CAST: actor, action (the spell), mind_level, targets.
+        TURN_START: actor.
+        TURN_END: actor.
+    """
+
+    __slots__ = (
+        "type",
+        "actor",
+        "target",
+        "action",
+        "effect",
+        "replaced",
+        "mind_level",
+        "total",
+        "ac",
+        "description",
+        "critical",
+        "fumble",
+        "amount",
+        "base",
+        "adjusted",
+        "damage_type",
+        "damage",
+        "defeated",
+        "effect_applied",
+        "targets",
+    )
+
+    def __init__(
+        self,
+        type: CombatEventType,
+        actor: Any = None,
+        target: Any = None,
+        action: Any = None,
+        effect: Any = None,
+        replaced: Any = None,
+        mind_level: Optional[int] = None,
+        total: int = 0,
+        ac: int = 0,
+        description: str = "",
+        critical: bool = False,
+        fumble: bool = False,
+        amount: int = 0,
+        base: int = 0,
+        adjusted: int = 0,
+        damage_type: Any = None,
+        damage: Optional[list["CombatEvent"]] = None,
+        defeated: bool = False,
+        effect_applied: bool = False,
+        targets: Optional[list[Any]] = None,
+    ) -> None:
+        self.type: CombatEventType = type
+        self.actor: Any = actor
+        self.target: Any = target
+        self.action: Any = action
+        self.effect: Any = effect
+        self.replaced: Any = replaced
+        self.mind_level: Optional[int] = mind_level
+        self.total: int = total
+        self.ac: int = ac
+        self.description: str = description
+        self.critical: bool = critical
+        self.fumble: bool = fumble
+        self.amount: int = amount
+        self.base: int = base
+        self.adjusted: int = adjusted
+        self.damage_type: Any = damage_type
+        self.damage: list[CombatEvent] = damage if damage is not None else []
+        self.targets: list[Any] = targets if targets is not None else []
+        self.defeated: bool = defeated
+        self.effect_applied: bool = effect_applied
+
+    def __repr__(self) -> str:
+        actor = getattr(self.actor, "name", None)
+        target = getattr(self.target, "name", None)
+        return f"CombatEvent({self.type.value}, actor={actor}, target={target})"
+
+
+class EventSubscriber:
+    """Receives the combat events it subscribed to."""
+
+    @property
+    def active(self) -> bool:
+        """Whether the subscriber currently wants to receive events."""
+        return True
+
+    def handle(self, event: CombatEvent) -> None:
+        """
+        Handles an event.
+
+        Args:
+            event (CombatEvent): The event.
+        """
+        raise NotImplementedError("Subclasses must implement the handle method")
+
+
+class CallbackSubscriber(EventSubscriber):
+    """Adapts a plain function into a subscriber."""
+
+    def __init__(self, callback: Callable[[CombatEvent], None]) -> None:
+        self.callback: Callable[[CombatEvent], None] = callback
+
+    def handle(self, event: CombatEvent) -> None:
+        self.callback(event)
+
+
+class EventDispatcher:
+    """Delivers combat events to the subscribers of each event type."""
+
+    def __init__(self) -> None:
+        self._subscribers: dict[CombatEventType, list[EventSubscriber]] = {
+            event_type: [] for event_type in CombatEventType
+        }
+
+    def subscribe(
+        self,
+        subscriber: EventSubscriber | Callable[[CombatEvent], None],
+        event_types: Optional[Iterable[CombatEventType]] = None,
+    ) -> EventSubscriber:
+        """
+        Subscribes to some or all event types.
+
+        Args:
+            subscriber (EventSubscriber | Callable[[CombatEvent], None]): The
+                subscriber, or a function receiving the events.
+            event_types (Optional[Iterable[CombatEventType]]): The event types.
+                Defaults to all of them.
+
+        Returns:
+            EventSubscriber: The subscriber, to unsubscribe later.
+        """
+        if not isinstance(subscriber, EventSubscriber):
+            if not callable(subscriber):
+                log_error(
+                    f"Event subscriber must be callable, got {type(subscriber).__name__}",
+                    {"subscriber": subscriber},
+                )
+                raise ValueError("Invalid event subscriber")
+            subscriber = CallbackSubscriber(subscriber)
+        for event_type in event_types or CombatEventType:
+            if subscriber not in self._subscribers[event_type]:
+                self._subscribers[event_type].append(subscriber)
+        return subscriber
+
+    def unsubscribe(
+        self,
+        subscriber: EventSubscriber,
+        event_types: Optional[Iterable[CombatEventType]] = None,
+    ) -> None:
+        """
+        Removes a subscriber from some or all event types.
+
+        Args:
+            subscriber (EventSubscriber): The subscriber to remove.
+            event_types (Optional[Iterable[CombatEventType]]): The event types.
+                Defaults to all of them.
+        """
+        for event_type in event_types or CombatEventType:
+            subscribers = self._subscribers[event_type]
+            if subscriber in subscribers:
+                subscribers.remove(subscriber)
+
+    def wants(self, event_type: CombatEventType) -> bool:
+        """
+        Checks whether any active subscriber wants the given event type.
+
+        Args:
+            event_type (CombatEventType): The event type.
+
+        Returns:
+            bool: True if an event of this type would be delivered.
+        """
+        for subscriber in self._subscribers[event_type]:
+            if subscriber.active:
+                return True
+        return False
+
+    def emit(self, event: CombatEvent) -> None:
+        """
+        Delivers an event to the active subscribers of its type.
+
+        Args:
+            event (CombatEvent): The event.
+        """
+        # Subscribers may (un)subscribe while handling the event.
+        for subscriber in tuple(self._subscribers[event.type]):
+            if subscriber.active:
+                subscriber.handle(event)
+
+
+# The dispatcher receiving the events of the running combat.
+_event_dispatcher: EventDispatcher = EventDispatcher()
+
+
+def get_event_dispatcher() -> EventDispatcher:
+    """
+    Returns the active event dispatcher.
+
+    Returns:
+        EventDispatcher: The active dispatcher.
+    """
+    return _event_dispatcher
+
+
+def set_event_dispatcher(dispatcher: EventDispatcher) -> EventDispatcher:
+    """
+    Replaces the active event dispatcher.
+
+    Args:
+        dispatcher (EventDispatcher): The new dispatcher.
+
+    Returns:
+        EventDispatcher: The previous dispatcher.
+    """
+    global _event_dispatcher
+    previous, _event_dispatcher = _event_dispatcher, dispatcher
+    return previous
+
+
+@contextmanager
+def use_event_dispatcher(dispatcher: EventDispatcher) -> Iterator[EventDispatcher]:
+    """
+    Activates an event dispatcher for the duration of a `with` block.
+
+    Args:
+        dispatcher (EventDispatcher): The dispatcher.
+
+    Returns:
+        Iterator[EventDispatcher]: The dispatcher active inside the block.
+    """
+    previous = set_event_dispatcher(dispatcher)
+    try:
+        yield dispatcher
+    finally:
+        set_event_dispatcher(previous)
+
+
+def wants_event(event_type: CombatEventType) -> bool:
+    """
+    Checks whether the active dispatcher would deliver the given event type.
+
+    Args:
+        event_type (CombatEventType): The event type.
+
+    Returns:
+        bool: True if the event should be built and emitted.
+    """
+    return _event_dispatcher.wants(event_type)
+
+
+def emit_event(event: CombatEvent) -> None:
+    """
+    Emits an event on the active dispatcher.
+
+    Args:
+        event (CombatEvent): The event.
+    """
+    _event_dispatcher.emit(event)
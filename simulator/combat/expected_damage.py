@@ -0,0 +1,226 @@
+"""
+Analytic estimates of the outcome of attacks.
+
+The chance of an attack hitting a target and the distribution of the damage
+the target takes are computed exactly from the dice expressions of the attack
+(see `core.dice_distribution`), after the resistances and vulnerabilities of
+the target, so no sampling is involved. Estimates are cached on the stats
+module of the actor, per action, mind level and target defenses, and discarded
+whenever the equipment or the modifiers of the actor change, so cached
+estimates never go stale and never outlive the actor.
+"""
+
+from typing import Any, Optional, Tuple
+
+from actions.abilities import OffensiveAbility
+from actions.attacks import BaseAttack
+from actions.base_action import BaseAction
+from actions.spells import SpellAttack
+from combat.damage import DamageComponent
+from core.constants import BonusType, DamageType
+from core.dice_distribution import get_distribution
+
+class AttackEstimate:
+    """The chance of an attack hitting a target, and the damage it deals.
+
+    Instances are shared through the cache of `estimate_attack`, so they must
+    never be modified after creation.
+    """
+
+    __slots__ = ("hit_probability", "values", "probabilities")
+
+    def __init__(self, hit_probability: float, damage: dict[int, float]) -> None:
+        """
+        Initialize the estimate.
+
+        Args:
+            hit_probability (float): The probability of hitting the target.
+            damage (dict[int, float]): Probability of each amount of damage
+                taken by the target on a hit.
+        """
+        self.hit_probability: float = hit_probability
+        self.values: tuple[int, ...] = tuple(sorted(damage))
+        self.probabilities: tuple[float, ...] = tuple(damage[v] for v in self.values)
+
+    @property
+    def expected_damage(self) -> float:
+        """Returns the expected damage of the attack, misses included."""
+        return self.hit_probability * sum(
+            v * p for v, p in zip(self.values, self.probabilities)
+        )
+
+    def expected_damage_taken(self, hp: int) -> float:
+        """
+        Returns the expected damage a target with the given HP actually takes.
+
+        Args:
+            hp (int): The current HP of the target.
+
+        Returns:
+            float: The expected damage, misses included, capped at the HP.
+        """
+        return self.hit_probability * sum(
+            min(v, hp) * p for v, p in zip(self.values, self.probabilities)
+        )
+
+    def kill_probability(self, hp: int) -> float:
+        """
+        Returns the probability of the attack defeating a target.
+
+        Args:
+            hp (int): The current HP of the target.
+
+        Returns:
+            float: The probability of hitting and dealing at least `hp` damage.
+        """
+        return self.hit_probability * sum(
+            p for v, p in zip(self.values, self.probabilities) if v >= hp
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"AttackEstimate(hit={self.hit_probability:.3f}, "
+            f"damage={self.expected_damage:.3f})"
+        )
+
+
+# ---- Probability Helpers ----
+
+
+def hit_probability(
+    attack_bonus: Optional[str], variables: Any, target_ac: int
+) -> float:
+    """
+    Computes the probability of an attack roll hitting a given AC.
+
+    A natural 1 always misses and a natural 20 always hits, any other roll
+    hits if the d20 plus the attack bonus reaches the AC.
+
+    Args:
+        attack_bonus (Optional[str]): The attack bonus expression, or None for
+            attacks that hit automatically.
+        variables (Any): The expression variables of the attacker.
+        target_ac (int): The AC of the target.
+
+    Returns:
+        float: The probability of hitting.
+    """
+    if attack_bonus is None:
+        return 1.0
+    bonus = get_distribution(attack_bonus, variables)
+    probability = 1 / 20
+    for d20 in range(2, 20):
+        probability += bonus.probability_at_least(target_ac - d20) / 20
+    return probability
+
+
+def _damage_taken(
+    actor: Any,
+    component: DamageComponent,
+    mind_level: int,
+    resistances: frozenset[DamageType],
+    vulnerabilities: frozenset[DamageType],
+) -> dict[int, float]:
+    """Distribution of the damage taken from a component, mirroring the
+    resistance rules of `Character.take_damage`."""
+    rolled = get_distribution(
+        component.damage_roll, actor.get_expression_variables(mind_level)
+    )
+    damage_type = component.damage_type
+    taken: dict[int, float] = {}
+    for value, p in zip(rolled.values, rolled.probabilities):
+        if damage_type in resistances:
+            value = value // 2
+        elif damage_type in vulnerabilities:
+            value = value * 2
+        value = max(value, 0)
+        taken[value] = taken.get(value, 0.0) + p
+    return taken
+
+
+def _convolve(left: dict[int, float], right: dict[int, float]) -> dict[int, float]:
+    """Distribution of the sum of two independent amounts."""
+    result: dict[int, float] = {}
+    for lv, lp in left.items():
+        for rv, rp in right.items():
+            result[lv + rv] = result.get(lv + rv, 0.0) + lp * rp
+    return result
+
+
+def _attack_profile(
+    actor: Any, action: BaseAction, mind_level: int
+) -> Tuple[Optional[str], list[Tuple[DamageComponent, int]]]:
+    """Returns the attack bonus expression of an action (None if it hits
+    automatically), and the damage components it deals on a hit."""
+    modifiers = actor.effects_module.get_modifier(BonusType.ATTACK)
+    if not isinstance(modifiers, list):
+        modifiers = [modifiers]
+    if isinstance(action, SpellAttack):
+        attack_roll: Optional[str] = str(actor.get_spell_attack_bonus(action.level))
+        components = [(component, mind_level) for component in action.damage]
+    else:
+        if isinstance(action, BaseAttack) or action.requires_attack_roll():  # type: ignore
+            attack_roll = action.attack_roll  # type: ignore
+        else:
+            attack_roll = None
+        components = [(component, 1) for component in action.damage]  # type: ignore
+        components += actor.effects_module.get_damage_modifiers()
+    if attack_roll is not None:
+        terms = [attack_roll] + [str(m) for m in modifiers if m]
+        attack_roll = " + ".join(term for term in terms if term) or "0"
+    return attack_roll, components
+
+
+def _compute_estimate(
+    action: BaseAction,
+    actor: Any,
+    mind_level: int,
+    target_ac: int,
+    resistances: frozenset[DamageType],
+    vulnerabilities: frozenset[DamageType],
+) -> AttackEstimate:
+    """Computes the estimate of an action of the actor in its current state."""
+    attack_roll, components = _attack_profile(actor, action, mind_level)
+    damage: dict[int, float] = {0: 1.0}
+    for component, level in components:
+        damage = _convolve(
+            damage,
+            _damage_taken(actor, component, level, resistances, vulnerabilities),
+        )
+    return AttackEstimate(
+        hit_probability(attack_roll, actor.get_expression_variables(), target_ac),
+        damage,
+    )
+
+
+# ---- Public API ----
+
+
+def estimate_attack(
+    actor: Any, action: BaseAction, target: Any, mind_level: int = 0
+) -> AttackEstimate:
+    """
+    Estimates the outcome of a damaging action against a target.
+
+    Critical hits are counted as plain hits, and on-hit triggers are ignored.
+
+    Args:
+        actor (Any): The character performing the action.
+        action (BaseAction): The attack, offensive spell or offensive ability.
+        target (Any): The target.
+        mind_level (int): The mind level of spells. Defaults to 0.
+
+    Returns:
+        AttackEstimate: The estimate.
+    """
+    assert isinstance(action, (BaseAttack, SpellAttack, OffensiveAbility))
+    resistances = frozenset(target.resistances)
+    vulnerabilities = frozenset(target.vulnerabilities)
+    key = (action, mind_level, target.AC, resistances, vulnerabilities)
+    estimates = actor.stats_module.estimates
+    estimate = estimates.get(key)
+    if estimate is None:
+        estimate = estimates[key] = _compute_estimate(
+            action, actor, mind_level, target.AC, resistances, vulnerabilities
+        )
+    return estimate
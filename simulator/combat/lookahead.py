@@ -0,0 +1,251 @@
+"""
+Lookahead NPC policy.
+
+The NPC AI of `combat.npc_ai` greedily performs the plan with the highest
+utility. A `LookaheadPolicy` instead plays out the best few plans on forks of
+the running combat: the plan is performed, then the rest of the round and a
+few more rounds are simulated with the NPC AI controlling everybody, and the
+resulting state is evaluated for the side of the NPC. Rollouts are spread over
+the plans with UCB1, within a budget of rollouts and, optionally, of time per
+decision, and the plan with the best average outcome is performed.
+
+Policies are assigned to NPCs by name, e.g., to let the bosses of an
+encounter play smarter:
+
+    policy = LookaheadPolicy(iterations=32)
+    simulate(
+        player, enemies, allies, n_runs=100,
+        npc_policies={"Minotaur Boss": policy, "Infant Dragon": policy},
+    )
+"""
+
+import math
+import time
+from typing import Any, Optional
+
+from character import Character
+from combat.combat_manager import CombatSnapshot
+from combat.events import EventDispatcher, use_event_dispatcher
+from combat.npc_ai import ActionPlan, DecisionContext, iter_plans
+from combat.simulation import npc_policy
+from core.constants import is_oponent
+from core.rng import RandomStream, derive_seed, use_rng
+from core.utils import suppress_output
+
+# Default number of rollouts per decision.
+DEFAULT_ITERATIONS = 32
+# Default number of rounds simulated after the current one.
+DEFAULT_DEPTH = 2
+# Default number of plans considered for each decision.
+DEFAULT_CANDIDATES = 4
+# Default weight of the exploration term of UCB1.
+DEFAULT_EXPLORATION = math.sqrt(2)
+
+
+def evaluate(combat_manager: Any, character: Character) -> float:
+    """
+    Evaluates the state of a combat for the side of a character.
+
+    Args:
+        combat_manager (Any): The combat.
+        character (Character): The character.
+
+    Returns:
+        float: 1 if the opponents of the character are all defeated, 0 if its
+            side is, otherwise the difference between the fractions of HP
+            left on the two sides, mapped between 0 and 1.
+    """
+    own_hp = own_hp_max = opponents_hp = opponents_hp_max = 0
+    for participant in combat_manager.participants:
+        if is_oponent(character.char_type, participant.char_type):
+            opponents_hp += participant.hp
+            opponents_hp_max += participant.HP_MAX
+        else:
+            own_hp += participant.hp
+            own_hp_max += participant.HP_MAX
+    if opponents_hp <= 0:
+        return 1.0
+    if own_hp <= 0:
+        return 0.0
+    return 0.5 + 0.5 * (own_hp / own_hp_max - opponents_hp / opponents_hp_max)
+
+
+class LookaheadPolicy:
+    """Controls an NPC by playing out its best plans on forks of the combat.
+
+    Without a time budget, the rollouts are seeded from the random stream of
+    the combat, so the decisions are as reproducible as the combat itself.
+    """
+
+    def __init__(
+        self,
+        iterations: int = DEFAULT_ITERATIONS,
+        time_budget: Optional[float] = None,
+        depth: int = DEFAULT_DEPTH,
+        candidates: int = DEFAULT_CANDIDATES,
+        exploration: float = DEFAULT_EXPLORATION,
+    ) -> None:
+        """
+        Initialize the policy.
+
+        Args:
+            iterations (int): The maximum number of rollouts per decision.
+            time_budget (Optional[float]): The maximum time per decision, in
+                seconds. Defaults to None, i.e., only bounded by iterations.
+            depth (int): The number of rounds simulated after the current one.
+            candidates (int): The number of plans considered, best first.
+            exploration (float): The weight of the exploration term of UCB1.
+        """
+        self.iterations: int = max(1, iterations)
+        self.time_budget: Optional[float] = time_budget
+        self.depth: int = max(0, depth)
+        self.candidates: int = max(1, candidates)
+        self.exploration: float = exploration
+        # Statistics, to tune the budget against the throughput.
+        self.decisions: int = 0
+        self.rollouts: int = 0
+        self.elapsed: float = 0.0
+
+    def __call__(self, combat_manager: Any, character: Character) -> None:
+        """
+        Performs the turn of an NPC, one plan at a time.
+
+        Args:
+            combat_manager (Any): The running combat.
+            character (Character): The NPC taking its turn.
+        """
+        allies = combat_manager.get_alive_friendlies(character)
+        enemies = combat_manager.get_alive_opponents(character)
+        if not enemies:
+            # Let the NPC AI report the skipped turn.
+            combat_manager.execute_npc_action(character)
+            return
+        context = DecisionContext(
+            character, allies, enemies, combat_manager.get_legal_targets
+        )
+        while True:
+            plan = self.choose_plan(combat_manager, context)
+            if plan is None:
+                break
+            combat_manager.execute_npc_plan(character, plan, context)
+            context.invalidate()
+
+    def choose_plan(
+        self, combat_manager: Any, context: DecisionContext
+    ) -> Optional[ActionPlan]:
+        """
+        Chooses the plan with the best outcome among the best plans of the NPC.
+
+        Args:
+            combat_manager (Any): The running combat.
+            context (DecisionContext): The decision context of the NPC.
+
+        Returns:
+            Optional[ActionPlan]: The chosen plan, or None if nothing is worth
+                doing.
+        """
+        plans = sorted(iter_plans(context), key=lambda p: p.score, reverse=True)
+        plans = plans[: self.candidates]
+        if len(plans) <= 1:
+            return plans[0] if plans else None
+
+        start = time.perf_counter()
+        deadline = start + self.time_budget if self.time_budget is not None else None
+        seed = combat_manager.rng.randint(0, 2**31 - 1)
+        # Every rollout starts from the same state.
+        snapshot = combat_manager.snapshot()
+        visits = [0] * len(plans)
+        values = [0.0] * len(plans)
+        for iteration in range(self.iterations):
+            if deadline is not None and iteration and time.perf_counter() >= deadline:
+                break
+            if iteration < len(plans):
+                # Play every plan once first.
+                index = iteration
+            else:
+                index = max(
+                    range(len(plans)),
+                    key=lambda i: values[i] / visits[i]
+                    + self.exploration * math.sqrt(math.log(iteration) / visits[i]),
+                )
+            values[index] += self.rollout(
+                combat_manager,
+                context,
+                plans[index],
+                RandomStream(derive_seed(seed, iteration)),
+                snapshot,
+            )
+            visits[index] += 1
+        self.decisions += 1
+        self.rollouts += sum(visits)
+        self.elapsed += time.perf_counter() - start
+
+        # Best average outcome, the best plan of the NPC AI among equals.
+        best = max(
+            range(len(plans)),
+            key=lambda i: (values[i] / visits[i] if visits[i] else -1.0, -i),
+        )
+        return plans[best]
+
+    def rollout(
+        self,
+        combat_manager: Any,
+        context: DecisionContext,
+        plan: ActionPlan,
+        rng: RandomStream,
+        snapshot: Optional[CombatSnapshot] = None,
+    ) -> float:
+        """
+        Plays out a plan on a fork of the combat.
+
+        Args:
+            combat_manager (Any): The running combat.
+            context (DecisionContext): The decision context of the NPC.
+            plan (ActionPlan): The plan.
+            rng (RandomStream): The random stream of the fork.
+            snapshot (Optional[CombatSnapshot]): The state of the combat to
+                fork. Defaults to the current state.
+
+        Returns:
+            float: The evaluation of the final state for the side of the NPC.
+        """
+        npc = context.npc
+        assert npc is not None
+        fork = combat_manager.fork(rng, snapshot)
+        # Everybody is controlled by the NPC AI in the fork.
+        fork.player_policy = npc_policy
+        fork.npc_policies = {}
+        copies = {
+            id(original): copy
+            for original, copy in zip(combat_manager.participants, fork.participants)
+        }
+        fork_npc = copies[id(npc)]
+        fork_context = DecisionContext(
+            fork_npc,
+            [copies[id(c)] for c in context.allies],
+            [copies[id(c)] for c in context.enemies],
+            fork.get_legal_targets,
+        )
+        fork_context.performed = set(context.performed)
+        fork_plan = ActionPlan(
+            plan.action,
+            plan.mind_level,
+            [copies[id(t)] for t in plan.targets],
+            plan.score,
+        )
+        with (
+            suppress_output(),
+            use_event_dispatcher(EventDispatcher()),
+            use_rng(fork.rng),
+            fork.trigger_bus.attached(),
+        ):
+            # Perform the plan, and finish the turn and the round.
+            fork.execute_npc_plan(fork_npc, fork_plan, fork_context)
+            fork_context.invalidate()
+            fork.execute_npc_action(fork_npc, fork_context)
+            fork.end_participant_turn(fork_npc)
+            fork.finish_round(fork_npc)
+            for _ in range(self.depth):
+                if fork.is_combat_over() or not fork.run_turn():
+                    break
+        return evaluate(fork, fork_npc)
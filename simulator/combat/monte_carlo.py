@@ -0,0 +1,344 @@
+"""
+Multi-core Monte Carlo combat runner.
+
+Spreads the runs of an encounter across a pool of worker processes. Each
+worker loads the content repository and the characters once, simulates chunks
+of runs headlessly, and sends back only an aggregated summary of its chunk.
+Summaries are merged as soon as they arrive.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Optional
+
+from catchery import *
+from character import Character, load_character, load_characters
+from combat.combat_manager import PlayerPolicy
+from combat.simulation import (
+    DEFAULT_MAX_TURNS,
+    WINNER_DRAW,
+    WINNER_ENEMIES,
+    WINNER_PLAYER,
+    CombatOutcome,
+    iter_simulations,
+)
+from core.content import ContentRepository
+from core.rng import derive_seed
+from core.utils import suppress_output
+
+# Default location of the data files.
+DEFAULT_DATA_DIR = Path(__file__).resolve().parent.parent.parent / "data"
+
+# Default files of the player, the enemies and the allies, in the data folder.
+DEFAULT_PLAYER_FILE = "player.json"
+DEFAULT_ENEMIES_FILE = "enemies_danmachi_f1_f10.json"
+DEFAULT_ALLIES_FILE = "characters.json"
+
+# Number of chunks per worker, to balance the load between workers.
+CHUNKS_PER_WORKER = 4
+
+
+class ParticipantSummary:
+    """Aggregated statistics of one participant over many combats."""
+
+    def __init__(self, name: str) -> None:
+        """
+        Initialize an empty summary.
+
+        Args:
+            name (str): The name of the participant.
+        """
+        self.name: str = name
+        self.survived: int = 0
+        self.hp: int = 0
+        self.damage_dealt: int = 0
+        self.damage_taken: int = 0
+
+    def merge(self, other: "ParticipantSummary") -> None:
+        """
+        Adds the statistics of another summary of the same participant.
+
+        Args:
+            other (ParticipantSummary): The summary to add.
+        """
+        self.survived += other.survived
+        self.hp += other.hp
+        self.damage_dealt += other.damage_dealt
+        self.damage_taken += other.damage_taken
+
+
+class CombatSummary:
+    """Aggregated outcome of many combats of the same encounter.
+
+    Only sums are stored, so summaries of disjoint sets of runs can be merged
+    in any order and still give exactly the same result.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty summary."""
+        self.runs: int = 0
+        self.wins: dict[str, int] = {
+            WINNER_PLAYER: 0,
+            WINNER_ENEMIES: 0,
+            WINNER_DRAW: 0,
+        }
+        self.turns: int = 0
+        self.turns_squared: int = 0
+        self.participants: list[ParticipantSummary] = []
+
+    def add(self, outcome: CombatOutcome) -> None:
+        """
+        Adds the outcome of a single combat.
+
+        Args:
+            outcome (CombatOutcome): The outcome to add.
+        """
+        self.runs += 1
+        self.wins[outcome.winner] = self.wins.get(outcome.winner, 0) + 1
+        self.turns += outcome.turns
+        self.turns_squared += outcome.turns**2
+        if not self.participants:
+            self.participants = [ParticipantSummary(p.name) for p in outcome.participants]
+        for summary, participant in zip(self.participants, outcome.participants):
+            summary.survived += participant.alive
+            summary.hp += participant.hp
+            summary.damage_dealt += participant.damage_dealt
+            summary.damage_taken += participant.damage_taken
+
+    def merge(self, other: "CombatSummary") -> None:
+        """
+        Adds the statistics of another summary of the same encounter.
+
+        Args:
+            other (CombatSummary): The summary to add.
+        """
+        self.runs += other.runs
+        for winner, count in other.wins.items():
+            self.wins[winner] = self.wins.get(winner, 0) + count
+        self.turns += other.turns
+        self.turns_squared += other.turns_squared
+        if not self.participants:
+            self.participants = [ParticipantSummary(p.name) for p in other.participants]
+        for summary, participant in zip(self.participants, other.participants):
+            summary.merge(participant)
+
+    def win_rate(self, winner: str = WINNER_PLAYER) -> float:
+        """
+        Returns the fraction of combats won by the given side.
+
+        Args:
+            winner (str): The side. Defaults to WINNER_PLAYER.
+
+        Returns:
+            float: The win rate, between 0 and 1.
+        """
+        return self.wins.get(winner, 0) / self.runs if self.runs else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Converts the summary to a dictionary of averages.
+
+        Returns:
+            dict[str, Any]: The summary.
+        """
+        runs = max(self.runs, 1)
+        mean_turns = self.turns / runs
+        return {
+            "runs": self.runs,
+            "wins": dict(self.wins),
+            "win_rate": {winner: self.win_rate(winner) for winner in self.wins},
+            "mean_turns": mean_turns,
+            "std_turns": math.sqrt(max(self.turns_squared / runs - mean_turns**2, 0.0)),
+            "participants": [
+                {
+                    "name": p.name,
+                    "survival_rate": p.survived / runs,
+                    "mean_hp": p.hp / runs,
+                    "mean_damage_dealt": p.damage_dealt / runs,
+                    "mean_damage_taken": p.damage_taken / runs,
+                }
+                for p in self.participants
+            ],
+        }
+
+
+# ---- Worker Process ----
+
+# Characters loaded once per worker process, and the files they come from.
+_worker_player: Optional[Character] = None
+_worker_enemies: dict[str, Character] = {}
+_worker_characters: dict[str, Character] = {}
+_worker_files: Optional[tuple[Path, Path, Path, Path]] = None
+
+
+def _load_content(
+    data_dir: Path, player_path: Path, enemies_path: Path, allies_path: Path
+) -> None:
+    """Loads the content and the characters of the current process, once per
+    set of files."""
+    global _worker_player, _worker_enemies, _worker_characters, _worker_files
+    files = (data_dir, player_path, enemies_path, allies_path)
+    if _worker_player is not None and _worker_files == files:
+        return
+    with suppress_output():
+        ContentRepository(data_dir)
+        _worker_enemies = load_characters(enemies_path)
+        _worker_characters = load_characters(allies_path)
+        _worker_player = load_character(player_path)
+    if _worker_player is None:
+        log_critical(
+            "Failed to load player character. Please check the data file",
+            {"data_file": str(player_path), "context": "monte_carlo"},
+        )
+        raise RuntimeError("Failed to load the player character")
+    _worker_files = files
+
+
+def _select(group: dict[str, Character], names: list[str]) -> list[Character]:
+    """Returns the characters with the given names, skipping unknown ones."""
+    selected: list[Character] = []
+    for name in names:
+        if name in group:
+            selected.append(group[name])
+        else:
+            log_warning(
+                f"Character '{name}' not found",
+                {"name": name, "available": list(group.keys()), "context": "monte_carlo"},
+            )
+    return selected
+
+
+def _run_chunk(
+    files: tuple[Path, Path, Path, Path],
+    enemy_names: list[str],
+    ally_names: list[str],
+    runs: range,
+    seed: int,
+    policy: Optional[PlayerPolicy],
+    max_turns: int,
+    npc_policies: Optional[dict[str, PlayerPolicy]] = None,
+) -> CombatSummary:
+    """Simulates a chunk of runs in the current process and summarizes them."""
+    _load_content(*files)
+    assert _worker_player is not None
+    summary = CombatSummary()
+    for outcome in iter_simulations(
+        _worker_player,
+        _select(_worker_enemies, enemy_names),
+        _select(_worker_characters, ally_names),
+        runs,
+        seed,
+        policy,
+        max_turns,
+        npc_policies,
+    ):
+        summary.add(outcome)
+    return summary
+
+
+# ---- Public API ----
+
+
+def run_monte_carlo(
+    enemy_names: list[str],
+    ally_names: Optional[list[str]] = None,
+    n_runs: int = 1000,
+    seed: Optional[int] = None,
+    workers: Optional[int] = None,
+    data_dir: Optional[Path] = None,
+    policy: Optional[PlayerPolicy] = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    chunk_size: Optional[int] = None,
+    npc_policies: Optional[dict[str, PlayerPolicy]] = None,
+    player_path: Optional[Path] = None,
+    enemies_path: Optional[Path] = None,
+    allies_path: Optional[Path] = None,
+) -> CombatSummary:
+    """
+    Simulates an encounter many times across a pool of worker processes.
+
+    The result only depends on the seed, not on the number of workers.
+
+    Args:
+        enemy_names (list[str]): Names of the enemies, from the enemies file.
+        ally_names (Optional[list[str]]): Names of the allies, from the
+            allies file. Defaults to None.
+        n_runs (int): The number of combats. Defaults to 1000.
+        seed (Optional[int]): The base seed. Defaults to None.
+        workers (Optional[int]): The number of processes. Defaults to the
+            number of CPUs; with 1 the runs are simulated in this process.
+        data_dir (Optional[Path]): The data folder. Defaults to the project one.
+        policy (Optional[PlayerPolicy]): The policy controlling the player.
+            It must be a module-level function, so it can be pickled.
+        max_turns (int): Rounds after which a combat is a draw.
+        chunk_size (Optional[int]): The number of runs per task.
+        npc_policies (Optional[dict[str, PlayerPolicy]]): Policies
+            controlling some NPCs, by name. They must be picklable, e.g.,
+            module-level functions or `LookaheadPolicy` instances.
+        player_path (Optional[Path]): The player file. Defaults to the one
+            of the data folder.
+        enemies_path (Optional[Path]): The file of the enemies. Defaults to
+            the one of the data folder.
+        allies_path (Optional[Path]): The file of the allies. Defaults to the
+            characters file of the data folder.
+
+    Returns:
+        CombatSummary: The aggregated outcome of all the runs.
+    """
+    data_dir = Path(data_dir) if data_dir is not None else DEFAULT_DATA_DIR
+    files = (
+        data_dir,
+        Path(player_path) if player_path else data_dir / DEFAULT_PLAYER_FILE,
+        Path(enemies_path) if enemies_path else data_dir / DEFAULT_ENEMIES_FILE,
+        Path(allies_path) if allies_path else data_dir / DEFAULT_ALLIES_FILE,
+    )
+    ally_names = ally_names or []
+    workers = max(1, workers or os.cpu_count() or 1)
+    if seed is None:
+        seed = derive_seed(None)
+    if not chunk_size or chunk_size <= 0:
+        chunk_size = max(1, math.ceil(n_runs / (workers * CHUNKS_PER_WORKER)))
+    chunks = [
+        range(start, min(start + chunk_size, n_runs))
+        for start in range(0, max(n_runs, 0), chunk_size)
+    ]
+
+    summary = CombatSummary()
+    if workers == 1:
+        for runs in chunks:
+            summary.merge(
+                _run_chunk(
+                    files,
+                    enemy_names,
+                    ally_names,
+                    runs,
+                    seed,
+                    policy,
+                    max_turns,
+                    npc_policies,
+                )
+            )
+        return summary
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_load_content, initargs=files
+    ) as executor:
+        futures = [
+            executor.submit(
+                _run_chunk,
+                files,
+                enemy_names,
+                ally_names,
+                runs,
+                seed,
+                policy,
+                max_turns,
+                npc_policies,
+            )
+            for runs in chunks
+        ]
+        for future in as_completed(futures):
+            summary.merge(future.result())
+    return summary
@@ -1,9 +1,11 @@
-from typing import Optional, Tuple, Any
+from logging import debug
+from typing import Callable, Iterator, Optional, Tuple, Any
 
 from actions.attacks import BaseAttack, NaturalAttack, WeaponAttack
 from actions.base_action import BaseAction
-from actions.spells import SpellAttack, SpellBuff, SpellDebuff, SpellHeal
+from actions.spells import Spell, SpellAttack, SpellBuff, SpellDebuff, SpellHeal
 from actions.abilities import (
+    BaseAbility,
     OffensiveAbility,
     HealingAbility,
     BuffAbility,
@@ -11,6 +13,7 @@ from actions.abilities import (
 )
 
 from character import Character
+from combat.expected_damage import AttackEstimate, estimate_attack
 
 # =============================================================================
 # Support Functions
@@ -30,302 +33,401 @@ def _hp_ratio(character: Character) -> float:
     return character.hp / character.HP_MAX if character.HP_MAX > 0 else 1.0
 
 
-# =============================================================================
-# Sorting Functions
-# =============================================================================
-
-
-def _sort_targets_by_usefulness_and_hp_offensive(
-    targets: list[Character], action: Any, mind_level: int = 0
-) -> list[Character]:
-    """
-    Generic sorting function that prioritizes:
-    1. Targets where the effect would be useful.
-    2. Lower HP ratio within each group.
+class DecisionContext:
+    """
+    The state an NPC decides its turn on, shared by every evaluation.
+
+    The available actions, the expected outcomes of the actions, the HP ratios
+    and whether effects can be added to targets are computed on first use and
+    then reused by every evaluation, which would otherwise compute them again
+    and again for the same inputs. The context must be invalidated whenever the
+    state changes, i.e., after the NPC performs an action.
+    """
+
+    def __init__(
+        self,
+        npc: Optional[Character] = None,
+        allies: Optional[list[Character]] = None,
+        enemies: Optional[list[Character]] = None,
+        legal_targets: Optional[
+            Callable[[Character, BaseAction], list[Character]]
+        ] = None,
+    ) -> None:
+        """
+        Initialize the context.
+
+        Args:
+            npc (Optional[Character]): The NPC taking its turn.
+            allies (Optional[list[Character]]): The alive allies of the NPC.
+            enemies (Optional[list[Character]]): The alive enemies of the NPC.
+            legal_targets (Optional[Callable[[Character, BaseAction], list[Character]]]):
+                Returns the legal targets of an action of a character, e.g.,
+                `CombatManager.get_legal_targets`. Defaults to None, i.e.,
+                any ally or enemy, depending on the action.
+        """
+        self.npc: Optional[Character] = npc
+        self.allies: list[Character] = allies or []
+        self.enemies: list[Character] = enemies or []
+        self.legal_targets: Optional[
+            Callable[[Character, BaseAction], list[Character]]
+        ] = legal_targets
+        self._candidates: dict[tuple[int, int], list[Character]] = {}
+        self._actions: Optional[list[BaseAction]] = None
+        self._actions_by_type: dict[type, list[Any]] = {}
+        self._can_add_effect: dict[tuple[int, int, int], bool] = {}
+        self._hp_ratios: dict[int, float] = {}
+        # Expected healing of the actions, by action and mind level.
+        self.amounts: dict[tuple[int, int], float] = {}
+        # Outcome of the damaging actions, by action, mind level and target.
+        self._estimates: dict[tuple[int, int, int], AttackEstimate] = {}
+        # The actions performed so far this turn.
+        self.performed: set[BaseAction] = set()
+
+    def invalidate(self) -> None:
+        """Forgets everything computed so far, after the state changed."""
+        self._actions = None
+        self._actions_by_type.clear()
+        self._candidates.clear()
+        self._can_add_effect.clear()
+        self._hp_ratios.clear()
+        self.amounts.clear()
+        self._estimates.clear()
+
+    def actions_by_type(self, action_type: type) -> list[Any]:
+        """
+        Returns the available actions of the NPC of a specific type.
+
+        Args:
+            action_type (type): The type of action to filter for.
+
+        Returns:
+            list[Any]: List of actions of the specified type.
+        """
+        actions = self._actions_by_type.get(action_type)
+        if actions is None:
+            if self._actions is None:
+                assert self.npc is not None
+                self._actions = get_all_combat_actions(self.npc)
+            actions = [a for a in self._actions if isinstance(a, action_type)]
+            self._actions_by_type[action_type] = actions
+        return actions
+
+    def candidates(
+        self, action: BaseAction, group: list[Character]
+    ) -> list[Character]:
+        """
+        Returns the members of a group the NPC can legally target with an action.
+
+        Args:
+            action (BaseAction): The action.
+            group (list[Character]): The allies or the enemies of the NPC.
+
+        Returns:
+            list[Character]: The legal targets, in the order of the group.
+        """
+        if self.legal_targets is None:
+            return group
+        key = (id(action), id(group))
+        candidates = self._candidates.get(key)
+        if candidates is None:
+            assert self.npc is not None
+            legal = {id(t) for t in self.legal_targets(self.npc, action)}
+            candidates = [t for t in group if id(t) in legal]
+            self._candidates[key] = candidates
+        return candidates
+
+    def can_add_effect(self, effect: Any, target: Character, mind_level: int) -> bool:
+        """
+        Checks whether an effect can be added to a target.
+
+        Args:
+            effect (Any): The effect.
+            target (Character): The target.
+            mind_level (int): The mind level of the effect.
+
+        Returns:
+            bool: True if the effect can be added.
+        """
+        key = (id(effect), id(target), mind_level)
+        result = self._can_add_effect.get(key)
+        if result is None:
+            result = target.effects_module.can_add_effect(effect, target, mind_level)
+            self._can_add_effect[key] = result
+        return result
+
+    def estimate(
+        self, action: BaseAction, mind_level: int, target: Character
+    ) -> AttackEstimate:
+        """
+        Estimates the outcome of a damaging action of the NPC against a target.
+
+        Args:
+            action (BaseAction): The damaging action.
+            mind_level (int): The mind level of the action.
+            target (Character): The target.
+
+        Returns:
+            AttackEstimate: The chance of hitting and the damage dealt.
+        """
+        key = (id(action), mind_level, id(target))
+        estimate = self._estimates.get(key)
+        if estimate is None:
+            estimate = estimate_attack(self.npc, action, target, mind_level)
+            self._estimates[key] = estimate
+        return estimate
+
+    def hp_ratio(self, character: Character) -> float:
+        """
+        Returns the HP ratio of a character.
+
+        Args:
+            character (Character): The character.
+
+        Returns:
+            float: The HP ratio (current HP / max HP), or 1.0 if max HP is 0.
+        """
+        ratio = self._hp_ratios.get(id(character))
+        if ratio is None:
+            ratio = _hp_ratio(character)
+            self._hp_ratios[id(character)] = ratio
+        return ratio
 
-    Args:
-        targets (list[Character]): List of potential targets.
-        action (Any): The action being considered for the targets. Can be a spell, attack, or other action.
-        mind_level (int): The mind level to use for evaluating usefulness. Defaults to 0.
 
-    Returns:
-        list[Character]: Sorted list of targets based on usefulness and HP ratio.
-    """
-    useful = [
-        t
-        for t in targets
-        if not hasattr(action, "effect")
-        or action.effect is None
-        or t.effects_module.can_add_effect(action.effect, t, mind_level)
-    ]
-    not_useful = [t for t in targets if t not in useful]
-
-    useful_sorted = sorted(useful, key=_hp_ratio)
-    not_useful_sorted = sorted(not_useful, key=_hp_ratio)
+# =============================================================================
+# Utility Function
+# =============================================================================
 
-    return useful_sorted + not_useful_sorted
+# Utility of an effect that can be applied to a target.
+EFFECT_UTILITY = 10.0
+# Utility of defeating a target.
+KILL_UTILITY = 10.0
+# Cost of each mind point spent.
+MIND_UTILITY = 1.0
+
+# Actions helping allies, the others hinder enemies.
+SUPPORT_ACTIONS = (SpellHeal, SpellBuff, HealingAbility, BuffAbility)
+# Actions healing their targets.
+HEALING_ACTIONS = (SpellHeal, HealingAbility)
+# Actions damaging their targets.
+DAMAGING_ACTIONS = (BaseAttack, SpellAttack, OffensiveAbility)
+# Actions the NPC can plan, in the order they are evaluated.
+PLANNED_ACTIONS = (
+    SpellHeal,
+    HealingAbility,
+    SpellBuff,
+    BuffAbility,
+    SpellDebuff,
+    DebuffAbility,
+    SpellAttack,
+    OffensiveAbility,
+    WeaponAttack,
+    NaturalAttack,
+)
 
 
-def _sort_targets_by_usefulness_and_hp_healing(
-    targets: list[Character], action: Any, mind_level: int = 0
-) -> list[Character]:
+def _expected_amount(
+    context: DecisionContext, action: BaseAction, mind_level: int
+) -> float:
     """
-    Generic sorting function for healing actions.
-    Prioritizes targets that need healing or where the effect would be useful.
+    Estimates the healing of an action, as the average between its minimum
+    and its maximum.
 
     Args:
-        targets (list[Character]): List of potential targets.
-        action (Any): The healing action being considered.
-        mind_level (int): The mind level to use for evaluating usefulness. Defaults to 0
+        context (DecisionContext): The decision context.
+        action (BaseAction): The healing action.
+        mind_level (int): The mind level of the action.
 
     Returns:
-        list[Character]: Sorted list of targets based on usefulness and HP ratio.
-    """
-
-    useful = [
-        t
-        for t in targets
-        if t.hp < t.HP_MAX
-        or action.effect is None
-        or t.effects_module.can_add_effect(action.effect, t, mind_level)
-    ]
-
-    useful = sorted(useful, key=lambda t: t.HP_MAX - t.hp, reverse=True)
-
-    return useful
-
-
-def _sort_for_base_attack(
-    actor: Character, action: BaseAttack, targets: list[Character]
-) -> list[Character]:
-    """
-    Prioritizes targets for base attacks.
+        float: The estimated amount.
+    """
+    key = (id(action), mind_level)
+    amount = context.amounts.get(key)
+    if amount is None:
+        npc = context.npc
+        if isinstance(action, SpellHeal):
+            low = action.get_min_heal(npc, mind_level)
+            high = action.get_max_heal(npc, mind_level)
+        else:
+            low, high = action.get_min_heal(npc), action.get_max_heal(npc)  # type: ignore
+        amount = (low + high) / 2
+        context.amounts[key] = amount
+    return amount
+
+
+def target_utility(
+    context: DecisionContext, action: BaseAction, mind_level: int, target: Character
+) -> float:
+    """
+    The utility of using an action on a single target.
+
+    This is the common utility function every decision is based on: the
+    healing the target actually needs, the expected damage it can actually
+    take, with a bonus for the chance of defeating it, and the value of
+    applying the effect of the action, if it would have any. Damage and
+    effects of attacks are weighted by the chance of hitting the target.
 
     Args:
-        actor (Character): The character performing the attack.
-        action (BaseAttack): The base attack being considered.
-        targets (list[Character]): List of potential targets.
+        context (DecisionContext): The decision context.
+        action (BaseAction): The action.
+        mind_level (int): The mind level of the action.
+        target (Character): The target.
 
     Returns:
-        list[Character]: Sorted list of targets based on usefulness and HP ratio.
-    """
-    return _sort_targets_by_usefulness_and_hp_offensive(targets, action, 0)
+        float: The utility.
+    """
+    utility = 0.0
+    chance = 1.0
+    if isinstance(action, HEALING_ACTIONS):
+        missing = target.HP_MAX - target.hp
+        utility += min(_expected_amount(context, action, mind_level), missing)
+    elif isinstance(action, DAMAGING_ACTIONS):
+        estimate = context.estimate(action, mind_level, target)
+        chance = estimate.hit_probability
+        utility += estimate.expected_damage_taken(target.hp)
+        utility += estimate.kill_probability(target.hp) * KILL_UTILITY
+    effect = getattr(action, "effect", None)
+    if effect is not None and context.can_add_effect(effect, target, mind_level):
+        utility += EFFECT_UTILITY * chance
+    return utility
 
 
-def _sort_for_spell_attack(
-    actor: Character, spell: SpellAttack, targets: list[Character]
-) -> tuple[int, list[Character], float]:
-    """
-    Optimizes both mind_level and targets for offensive spells.
-
-    Args:
-        actor (Character): The character casting the spell.
-        spell (SpellAttack): The offensive spell being considered.
-        targets (list[Character]): List of potential targets.
+# =============================================================================
+# Plan Evaluation
+# =============================================================================
 
-    Returns:
-        tuple[int, list[Character], float]: The best mind level and corresponding sorted targets.
-    """
-    best_score = -float("inf")
-    best_mind_level = spell.mind_cost[0]
-    best_targets = []
 
-    for mind_level in spell.mind_cost:
-        if mind_level > actor.mind:
-            continue
-        max_targets = spell.target_count(actor, mind_level)
-        if max_targets <= 0:
-            continue
-        sorted_targets = _sort_targets_by_usefulness_and_hp_offensive(
-            targets, spell, mind_level
-        )
-        candidate_targets = sorted_targets[:max_targets]
-        if not candidate_targets:
-            continue
-        usefulness = sum(
-            1
-            for t in candidate_targets
-            if spell.effect is None
-            or t.effects_module.can_add_effect(spell.effect, t, mind_level)
+class ActionPlan:
+    """An action the NPC can perform, with its mind level, targets and utility."""
+
+    __slots__ = ("action", "mind_level", "targets", "score")
+
+    def __init__(
+        self,
+        action: BaseAction,
+        mind_level: int,
+        targets: list[Character],
+        score: float,
+    ) -> None:
+        """
+        Initialize the plan.
+
+        Args:
+            action (BaseAction): The action.
+            mind_level (int): The mind level, 0 for actions without mind cost.
+            targets (list[Character]): The targets, best first.
+            score (float): The utility of the plan.
+        """
+        self.action: BaseAction = action
+        self.mind_level: int = mind_level
+        self.targets: list[Character] = targets
+        self.score: float = score
+
+    def __repr__(self) -> str:
+        targets = ", ".join(t.name for t in self.targets)
+        return (
+            f"ActionPlan({self.action.name}, mind_level={self.mind_level}, "
+            f"targets=[{targets}], score={self.score:.2f})"
         )
-        score = usefulness * 10 - mind_level
-        print(
-            f"[DEBUG] mind_level={mind_level}, score={score}, max_targets={max_targets}, targets={len(candidate_targets)}"
-        )
-        if score > best_score:
-            best_score = score
-            best_mind_level = mind_level
-            best_targets = candidate_targets
-
-    return best_mind_level, best_targets, best_score
-
-
-def _sort_for_spell_heal(
-    actor: Character, spell: SpellHeal, targets: list[Character]
-) -> list[Character]:
-    """
-    Prioritizes targets by how much they need healing.
-
-    Args:
-        actor (Character): The character casting the healing spell.
-        spell (SpellHeal): The healing spell being considered.
-        targets (list[Character]): List of potential targets.
-
-    Returns:
-        list[Character]: Sorted list of targets based on HP ratio and usefulness of the healing effect.
-    """
-
-    return _sort_targets_by_usefulness_and_hp_healing(
-        targets, spell, spell.mind_cost[0]
-    )
-
-
-def _sort_for_spell_buff(
-    actor: Character, action: SpellBuff, targets: list[Character]
-) -> list[Character]:
-    """
-    Returns targets sorted by whether the effect would be useful.
-
-    Args:
-        actor (Character): The character casting the buff spell.
-        action (SpellBuff): The buff spell being considered.
-        targets (list[Character]): List of potential targets.
-
-    Returns:
-        list[Character]: Sorted list of targets based on usefulness and HP ratio.
-    """
-    return _sort_targets_by_usefulness_and_hp_offensive(
-        targets, action, action.mind_cost[0]
-    )
 
 
-def _sort_for_spell_debuff(
-    actor: Character, spell: SpellDebuff, targets: list[Character]
-) -> list[Character]:
-    """
-    Sorts debuff targets by usefulness and HP.
+def _rank_targets(
+    context: DecisionContext,
+    action: BaseAction,
+    mind_level: int,
+    candidates: list[Character],
+) -> list[tuple[float, Character]]:
+    """Returns the targets with their utility, best first, lowest HP ratio
+    first among equals."""
+    ranked = [
+        (target_utility(context, action, mind_level, t), t)
+        for t in candidates
+        if t.is_alive()
+    ]
+    ranked.sort(key=lambda entry: (-entry[0], context.hp_ratio(entry[1])))
+    return ranked
 
-    Args:
-        actor (Character): The character casting the debuff spell.
-        spell (SpellDebuff): The debuff spell being considered.
-        targets (list[Character]): List of potential targets.
 
-    Returns:
-        list[Character]: Sorted list of targets based on usefulness and HP ratio.
-    """
-    return _sort_targets_by_usefulness_and_hp_offensive(
-        targets, spell, spell.mind_cost[0]
-    )
+def _mind_levels(npc: Character, action: BaseAction) -> list[int]:
+    """Returns the mind levels the NPC can use the action at."""
+    mind_cost = getattr(action, "mind_cost", None)
+    if mind_cost is None:
+        return [0]
+    return [level for level in mind_cost if level <= npc.mind]
 
 
-# =============================================================================
-# Improved AI Functions - Split Weapon and Target Selection
-# =============================================================================
+def _target_count(npc: Character, action: BaseAction, mind_level: int) -> int:
+    """Returns the number of targets of the action."""
+    if isinstance(action, Spell):
+        return action.target_count(npc, mind_level)
+    if isinstance(action, BaseAbility):
+        return action.target_count(npc)
+    return 1
 
 
-def choose_best_weapon_for_situation(
-    npc: Character, weapons: list["WeaponAttack"], enemies: list[Character]
-) -> Optional["WeaponAttack"]:
+def iter_plans(context: DecisionContext) -> Iterator[ActionPlan]:
     """
-    Choose the best weapon type based on overall battlefield effectiveness.
+    Enumerates the plans of the NPC worth performing, in a single pass over
+    its available actions.
 
-    This separates weapon selection from target selection for better performance.
+    Each action is evaluated at every mind level the NPC can afford, on the
+    targets with the highest utility. Attacks are planned as full attacks:
+    weapon attacks are repeated for each attack of the NPC, and natural
+    attacks are performed in sequence.
 
     Args:
-        npc (Character): The NPC making the decision.
-        weapons (list[WeaponAttack]): List of available weapon attacks.
-        enemies (list[Character]): List of enemy characters.
-
-    Returns:
-        Optional[WeaponAttack]: The best weapon for the situation, or None if no valid weapon is found.
-    """
-    if not weapons or not enemies:
-        return None
-
-    best_weapon = None
-    best_score = -1
-
-    for weapon in weapons:
-        # Skip if weapon is on cooldown
-        if npc.is_on_cooldown(weapon):
+        context (DecisionContext): The decision context.
+
+    Yields:
+        ActionPlan: The plans with a positive utility.
+    """
+    npc = context.npc
+    assert npc is not None
+    attacked = any(isinstance(a, BaseAttack) for a in context.performed)
+    for action_type in PLANNED_ACTIONS:
+        actions = context.actions_by_type(action_type)
+        if action_type is NaturalAttack:
+            # Natural attacks are a sequence, planned as a whole, and only
+            # when no other attack was performed.
+            actions = [a for a in actions if a not in context.performed]
+            if attacked or not actions:
+                continue
+            ranked = _rank_targets(
+                context, actions[0], 0, context.candidates(actions[0], context.enemies)
+            )
+            if ranked:
+                score = ranked[0][0]
+                for a in actions[1:]:
+                    others = _rank_targets(
+                        context, a, 0, context.candidates(a, context.enemies)
+                    )
+                    score += others[0][0] if others else 0.0
+                yield ActionPlan(actions[0], 0, [ranked[0][1]], score)
             continue
-
-        # Calculate weapon effectiveness against all available targets
-        total_score = 0
-        valid_target_count = 0
-
-        for target in enemies:
-            # Skip dead targets
-            if not target.is_alive():
+        for action in actions:
+            if action in context.performed:
                 continue
-
-            valid_target_count += 1
-
-            # Effect score
-            effect_score = 0
-            if weapon.effect and target.effects_module.can_add_effect(
-                weapon.effect, target, 0
-            ):
-                effect_score = 10
-
-            # Damage potential score
-            damage_score = len(weapon.damage) * 2
-
-            # Weapon versatility score
-            target_score = effect_score + damage_score
-            total_score += target_score
-
-        if valid_target_count > 0:
-            # Average effectiveness across all targets
-            avg_score = total_score / valid_target_count
-            if avg_score > best_score:
-                best_score = avg_score
-                best_weapon = weapon
-
-    return best_weapon
-
-
-def choose_best_target_for_weapon(
-    npc: Character, weapon: "WeaponAttack", enemies: list[Character]
-) -> Optional[Character]:
-    """
-    Choose the best target for a specific weapon.
-
-    This is much faster than re-evaluating all weapon-target combinations.
-
-    Args:
-        npc (Character): The NPC making the decision.
-        weapon (WeaponAttack): The weapon being used.
-        enemies (list[Character]): List of enemy characters.
-
-    Returns:
-        Optional[Character]: The best target for the weapon, or None if no valid target is found.
-    """
-    if not weapon or not enemies:
-        return None
-
-    # Use existing sorting logic but only for this weapon
-    sorted_targets = _sort_for_base_attack(npc, weapon, enemies)
-
-    # Find the first alive target
-    for target in sorted_targets:
-        if target.is_alive():
-            return target
-
-    return None
-
-
-def get_weapon_attacks(npc: Character) -> list["WeaponAttack"]:
-    """
-    Get available weapon attacks for a character.
-
-    Args:
-        npc (Character): The character to get weapon attacks for.
-
-    Returns:
-        list[WeaponAttack]: List of available weapon attacks.
-    """
-    return npc.get_available_weapon_attacks()
+            if isinstance(action, Spell) and not action.mind_cost:
+                continue
+            if isinstance(action, BaseAttack) and attacked:
+                continue
+            group = context.candidates(
+                action,
+                context.allies if isinstance(action, SUPPORT_ACTIONS) else context.enemies,
+            )
+            for mind_level in _mind_levels(npc, action):
+                max_targets = _target_count(npc, action, mind_level)
+                if max_targets <= 0:
+                    continue
+                ranked = _rank_targets(context, action, mind_level, group)
+                chosen = [entry for entry in ranked[:max_targets] if entry[0] > 0]
+                if not chosen:
+                    continue
+                score = sum(utility for utility, _ in chosen)
+                if isinstance(action, WeaponAttack):
+                    score *= max(npc.number_of_attacks, 1)
+                score -= mind_level * MIND_UTILITY
+                if score > 0:
+                    yield ActionPlan(action, mind_level, [t for _, t in chosen], score)
 
 
 def get_natural_attacks(npc: Character) -> list["NaturalAttack"]:
@@ -363,468 +465,41 @@ def get_all_combat_actions(npc: Character) -> list[BaseAction]:
     )
 
 
-def get_actions_by_type(npc: Character, action_type: type) -> list[Any]:
-    """
-    Generic function to get actions of a specific type.
-
-    Args:
-        npc (Character): The character to get actions for.
-        action_type (type): The type of action to filter for.
-
-    Returns:
-        list[Any]: List of actions of the specified type.
-    """
-    return [a for a in get_all_combat_actions(npc) if isinstance(a, action_type)]
-
-
-def choose_best_base_attack_action(
-    npc: Character,
-    enemies: list[Character],
-    base_attacks: list[BaseAttack],
-) -> Optional[tuple[BaseAttack, Character]]:
-    """
-    Chooses the best attack and target combo based on:
-    - Usefulness of the attack’s effect (if any)
-    - Target vulnerability (low HP)
-    - Number of damage components
-
-    Args:
-        npc (Character): The NPC making the decision.
-        enemies (list[Character]): List of enemy characters.
-        base_attacks (list[BaseAttack]): List of available base attacks.
-
-    Returns:
-        Optional[tuple[BaseAttack, Character]]: The best attack and target combo, or None if no valid combo is found.
-    """
-    best_score: float = -1
-    best_attack: Optional[BaseAttack] = None
-    best_target: Optional[Character] = None
-
-    for attack in base_attacks:
-        # Skip if the attack is not available (e.g., on cooldown).
-        if npc.is_on_cooldown(attack):
-            continue
-        # Sort targets based on their vulnerability to the attack.
-        sorted_targets = _sort_for_base_attack(npc, attack, enemies)
-        # Iterate through sorted targets to find the best one.
-        for target in sorted_targets:
-            # Score based on how much the effect helps and how close the target is to death
-            effect_score = 0
-            if attack.effect:
-                if target.effects_module.can_add_effect(attack.effect, target, 0):
-                    effect_score += 10
-            # HP-based vulnerability (lower is better)
-            hp_ratio = target.hp / target.HP_MAX if target.HP_MAX > 0 else 1
-            vulnerability_score = (1 - hp_ratio) * 10
-            # Damage component count (e.g., bonus fire + necrotic)
-            damage_bonus = len(attack.damage)
-            # Compute the total score.
-            score = effect_score + vulnerability_score + damage_bonus
-            # If the score is better than the current best, update.
-            if score > best_score:
-                best_score = score
-                best_attack = attack
-                best_target = target
-
-    if best_attack and best_target:
-        return best_attack, best_target
-
-    return None
-
-
-def choose_best_attack_spell_action(
-    npc: Character,
-    enemies: list[Character],
-    spells: list[SpellAttack],
-) -> Optional[tuple[SpellAttack, int, list[Character]]]:
-    """
-    Chooses the best SpellAttack, mind level, and list of targets based on usefulness and value.
-
-    Args:
-        npc (Character): The NPC making the decision.
-        enemies (list[Character]): List of enemy characters.
-        spells (list[SpellAttack]): List of available offensive spells.
-
-    Returns:
-        Optional[tuple[SpellAttack, int, list[Character]]]: The best spell, mind level, and targets, or None if no viable spell is found.
-    """
-    best_score = -1
-    best_spell = None
-    best_level = -1
-    best_targets: list[Character] = []
-
-    for spell in spells:
-        if not spell.mind_cost:
-            continue
-
-        if npc.is_on_cooldown(spell):
-            continue
-
-        mind_level, candidate_targets, score = _sort_for_spell_attack(
-            npc, spell, enemies
-        )
-        if mind_level is None or not candidate_targets:
-            continue
-
-        if score > best_score:
-            best_score = score
-            best_spell = spell
-            best_level = mind_level
-            best_targets = candidate_targets
-    if best_spell:
-        return best_spell, best_level, best_targets
-    return None
-
-
-def choose_best_healing_spell_action(
-    npc: Character,
-    allies: list[Character],
-    spells: list[SpellHeal],
-) -> Optional[tuple[SpellHeal, int, list[Character]]]:
-    """
-    Chooses the best healing spell, mind level, and set of targets based on:
-    - Amount of HP missing.
-    - Number of wounded targets.
-    - Usefulness of HoT effect (if any).
-    - Mind cost efficiency.
-
-    Args:
-        npc (Character): The NPC making the decision.
-        allies (list[Character]): List of friendly characters.
-        spells (list[SpellHeal]): List of available healing spells.
-
-    Returns:
-        Optional[tuple[SpellHeal, int, list[Character]]]: The best spell, mind level, and targets, or None if no viable spell is found.
-    """
-    best_score = -1
-    best_spell = None
-    best_level = -1
-    best_targets: list[Character] = []
-
-    for spell in spells:
-        if not spell.mind_cost:
-            continue
-
-        if npc.is_on_cooldown(spell):
-            continue
-
-        sorted_targets = _sort_for_spell_heal(npc, spell, allies)
-
-        for mind_level in spell.mind_cost:
-            if mind_level > npc.mind:
-                continue
-
-            num_targets = spell.target_count(npc, mind_level)
-            if num_targets <= 0:
-                continue
-
-            candidate_targets = sorted_targets[:num_targets]
-            if not candidate_targets:
-                continue
-
-            # Score = total HP missing + useful HoTs - mind cost
-            total_hp_missing = sum(t.HP_MAX - t.hp for t in candidate_targets)
-            useful_effects = sum(
-                1
-                for t in candidate_targets
-                if spell.effect
-                and t.effects_module.can_add_effect(spell.effect, t, mind_level)
-            )
-
-            score = total_hp_missing + useful_effects * 10 - mind_level
-
-            if score > best_score:
-                best_score = score
-                best_spell = spell
-                best_level = mind_level
-                best_targets = candidate_targets
-
-    if best_spell:
-        return best_spell, best_level, best_targets
-
-    return None
-
-
-def choose_best_buff_spell_action(
-    npc: Character,
-    allies: list[Character],
-    spells: list[SpellBuff],
-) -> Optional[tuple[SpellBuff, int, list[Character]]]:
+def choose_best_plan(context: DecisionContext) -> Optional[ActionPlan]:
     """
-    Chooses the best SpellBuff, mind level, and set of targets based on:
-    - Usefulness of the buff effect.
-    - Number of allies affected.
-    - Mind cost efficiency.
+    Chooses the plan with the highest utility among all the plans of the NPC.
 
     Args:
-        npc (Character): The NPC making the decision.
-        allies (list[Character]): List of friendly characters.
-        spells (list[SpellBuff]): List of available buff spells.
+        context (DecisionContext): The decision context.
 
     Returns:
-        Optional[tuple[SpellBuff, int, list[Character]]]: The best spell, mind level, and targets, or None if no viable spell is found.
+        Optional[ActionPlan]: The best plan, or None if nothing is worth doing.
     """
-    best_score = -1
-    best_spell = None
-    best_level = -1
-    best_targets: list[Character] = []
-
-    for spell in spells:
-        if not spell.mind_cost:
-            continue
-
-        if npc.is_on_cooldown(spell):
-            continue
-
-        sorted_targets = _sort_for_spell_buff(npc, spell, allies)
-
-        for mind_level in spell.mind_cost:
-            if mind_level > npc.mind:
-                continue
-
-            max_targets = spell.target_count(npc, mind_level)
-            if max_targets <= 0:
-                continue
-
-            candidate_targets = sorted_targets[:max_targets]
-            if not candidate_targets:
-                continue
-
-            usefulness = sum(
-                1
-                for t in candidate_targets
-                if t.effects_module.can_add_effect(spell.effect, t, mind_level)
-            )
+    best: Optional[ActionPlan] = None
+    for plan in iter_plans(context):
+        if best is None or plan.score > best.score:
+            best = plan
+    if best is not None:
+        debug(f"{context.npc.name if context.npc else '?'} plans {best}")
+    return best
 
-            score = usefulness * 10 - mind_level
 
-            if score > best_score:
-                best_score = score
-                best_spell = spell
-                best_level = mind_level
-                best_targets = candidate_targets
-
-    if best_spell:
-        return best_spell, best_level, best_targets
-
-    return None
-
-
-def choose_best_debuff_spell_action(
-    npc: Character,
-    enemies: list[Character],
-    spells: list[SpellDebuff],
-) -> Optional[tuple[SpellDebuff, int, list[Character]]]:
+def choose_best_target(
+    context: DecisionContext, action: BaseAction, mind_level: int = 0
+) -> Optional[Character]:
     """
-    Chooses the best SpellDebuff, mind level, and set of enemy targets based on:
-    - Whether the effect would be useful (not already applied).
-    - Number of valid targets.
-    - Mind cost efficiency.
+    Chooses the best enemy target for an action, e.g., the next target of a
+    full attack once the previous one is defeated.
 
     Args:
-        npc (Character): The NPC making the decision.
-        enemies (list[Character]): List of enemy characters.
-        spells (list[SpellDebuff]): List of available debuff spells.
+        context (DecisionContext): The decision context.
+        action (BaseAction): The action.
+        mind_level (int): The mind level of the action. Defaults to 0.
 
     Returns:
-        Optional[tuple[SpellDebuff, int, list[Character]]]: The best spell, mind level, and targets, or None if no viable spell is found.
-    """
-    best_score = -1
-    best_spell = None
-    best_level = -1
-    best_targets: list[Character] = []
-
-    for spell in spells:
-        if not spell.mind_cost:
-            continue
-
-        if npc.is_on_cooldown(spell):
-            continue
-
-        sorted_targets = _sort_for_spell_debuff(npc, spell, enemies)
-
-        for mind_level in spell.mind_cost:
-            if mind_level > npc.mind:
-                continue
-
-            max_targets = spell.target_count(npc, mind_level)
-            if max_targets <= 0:
-                continue
-
-            candidate_targets = sorted_targets[:max_targets]
-            if not candidate_targets:
-                continue
-
-            usefulness = sum(
-                1
-                for t in candidate_targets
-                if spell.effect
-                and t.effects_module.can_add_effect(spell.effect, t, mind_level)
-            )
-
-            score = usefulness * 10 - mind_level
-
-            if score > best_score:
-                best_score = score
-                best_spell = spell
-                best_level = mind_level
-                best_targets = candidate_targets
-
-    if best_spell:
-        return best_spell, best_level, best_targets
-
-    return None
-
-
-# =============================================================================
-# Ability AI Functions
-# =============================================================================
-
-
-def choose_best_offensive_ability_action(
-    npc: Character,
-    enemies: list[Character],
-    abilities: list[OffensiveAbility],
-) -> Optional[tuple[OffensiveAbility, list[Character]]]:
+        Optional[Character]: The best alive target, or None if there is none.
     """
-    Chooses the best offensive ability and targets (no mind cost).
-    """
-    best_score = -1
-    best_ability = None
-    best_targets: list[Character] = []
-
-    for ability in abilities:
-        if npc.is_on_cooldown(ability):
-            continue
-        sorted_targets = _sort_targets_by_usefulness_and_hp_offensive(enemies, ability)
-        max_targets = (
-            ability.target_count(npc) if hasattr(ability, "target_count") else 1
-        )
-        candidate_targets = sorted_targets[:max_targets]
-        if not candidate_targets:
-            continue
-        usefulness = sum(
-            1
-            for t in candidate_targets
-            if ability.effect and t.effects_module.can_add_effect(ability.effect, t, 0)
-        )
-        score = usefulness * 10
-        if score > best_score:
-            best_score = score
-            best_ability = ability
-            best_targets = candidate_targets
-    if best_ability:
-        return best_ability, best_targets
-    return None
-
-
-def choose_best_healing_ability_action(
-    npc: Character,
-    allies: list[Character],
-    abilities: list[HealingAbility],
-) -> Optional[tuple[HealingAbility, list[Character]]]:
-    """
-    Chooses the best healing ability and targets (no mind cost).
-    """
-    best_score = -1
-    best_ability = None
-    best_targets: list[Character] = []
-
-    for ability in abilities:
-        if npc.is_on_cooldown(ability):
-            continue
-        sorted_targets = _sort_targets_by_usefulness_and_hp_healing(allies, ability)
-        max_targets = (
-            ability.target_count(npc) if hasattr(ability, "target_count") else 1
-        )
-        candidate_targets = sorted_targets[:max_targets]
-        if not candidate_targets:
-            continue
-        total_hp_missing = sum(t.HP_MAX - t.hp for t in candidate_targets)
-        useful_effects = sum(
-            1
-            for t in candidate_targets
-            if ability.effect and t.effects_module.can_add_effect(ability.effect, t, 0)
-        )
-        score = total_hp_missing + useful_effects * 10
-        if score > best_score:
-            best_score = score
-            best_ability = ability
-            best_targets = candidate_targets
-    if best_ability:
-        return best_ability, best_targets
-    return None
-
-
-def choose_best_buff_ability_action(
-    npc: Character,
-    allies: list[Character],
-    abilities: list[BuffAbility],
-) -> Optional[tuple[BuffAbility, list[Character]]]:
-    """
-    Chooses the best buff ability and targets (no mind cost).
-    """
-    best_score = -1
-    best_ability = None
-    best_targets: list[Character] = []
-
-    for ability in abilities:
-        if npc.is_on_cooldown(ability):
-            continue
-        sorted_targets = _sort_targets_by_usefulness_and_hp_offensive(allies, ability)
-        max_targets = (
-            ability.target_count(npc) if hasattr(ability, "target_count") else 1
-        )
-        candidate_targets = sorted_targets[:max_targets]
-        if not candidate_targets:
-            continue
-        usefulness = sum(
-            1
-            for t in candidate_targets
-            if ability.effect and t.effects_module.can_add_effect(ability.effect, t, 0)
-        )
-        score = usefulness * 10
-        if score > best_score:
-            best_score = score
-            best_ability = ability
-            best_targets = candidate_targets
-    if best_ability:
-        return best_ability, best_targets
-    return None
-
-
-def choose_best_debuff_ability_action(
-    npc: Character,
-    enemies: list[Character],
-    abilities: list[DebuffAbility],
-) -> Optional[tuple[DebuffAbility, list[Character]]]:
-    """
-    Chooses the best debuff ability and targets (no mind cost).
-    """
-    best_score = -1
-    best_ability = None
-    best_targets: list[Character] = []
-
-    for ability in abilities:
-        if npc.is_on_cooldown(ability):
-            continue
-        sorted_targets = _sort_targets_by_usefulness_and_hp_offensive(enemies, ability)
-        max_targets = (
-            ability.target_count(npc) if hasattr(ability, "target_count") else 1
-        )
-        candidate_targets = sorted_targets[:max_targets]
-        if not candidate_targets:
-            continue
-        usefulness = sum(
-            1
-            for t in candidate_targets
-            if ability.effect and t.effects_module.can_add_effect(ability.effect, t, 0)
-        )
-        score = usefulness * 10
-        if score > best_score:
-            best_score = score
-            best_ability = ability
-            best_targets = candidate_targets
-    if best_ability:
-        return best_ability, best_targets
-    return None
+    ranked = _rank_targets(
+        context, action, mind_level, context.candidates(action, context.enemies)
+    )
+    return ranked[0][1] if ranked else None
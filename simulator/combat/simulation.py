@@ -0,0 +1,278 @@
+"""
+Headless combat simulation.
+
+Runs complete combats without user input or console output: the player is
+driven by a policy (by default the same AI used for NPCs), and each combat
+returns a structured outcome instead of a printed report.
+"""
+
+from typing import Any, Iterator, Optional
+
+from catchery import *
+from character import Character
+from combat.combat_manager import CombatManager, PlayerPolicy
+from core.constants import CharacterType
+from core.rng import RandomStream, derive_seed
+from core.utils import suppress_output
+
+# Number of rounds after which a combat is declared a draw.
+DEFAULT_MAX_TURNS = 100
+
+# Possible winners of a combat.
+WINNER_PLAYER = "player"
+WINNER_ENEMIES = "enemies"
+WINNER_DRAW = "draw"
+
+
+def npc_policy(combat_manager: CombatManager, character: Character) -> None:
+    """
+    Controls a character with the NPC AI.
+
+    Args:
+        combat_manager (CombatManager): The running combat.
+        character (Character): The character taking its turn.
+    """
+    combat_manager.execute_npc_action(character)
+
+
+class ParticipantOutcome:
+    """The state of a participant at the end of a combat."""
+
+    def __init__(self, character: Character) -> None:
+        """
+        Initialize the outcome from the character at the end of the combat.
+
+        Args:
+            character (Character): The participant.
+        """
+        self.name: str = character.name
+        self.char_type: CharacterType = character.char_type
+        self.hp: int = character.hp
+        self.hp_max: int = character.HP_MAX
+        self.alive: bool = character.is_alive()
+        self.damage_dealt: int = character.damage_dealt
+        self.damage_taken: int = character.damage_taken
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Converts the outcome to a dictionary.
+
+        Returns:
+            dict[str, Any]: The outcome.
+        """
+        return {
+            "name": self.name,
+            "char_type": self.char_type.name,
+            "hp": self.hp,
+            "hp_max": self.hp_max,
+            "alive": self.alive,
+            "damage_dealt": self.damage_dealt,
+            "damage_taken": self.damage_taken,
+        }
+
+    def __repr__(self) -> str:
+        return (
+            f"ParticipantOutcome({self.name!r}, hp={self.hp}/{self.hp_max}, "
+            f"dealt={self.damage_dealt}, taken={self.damage_taken})"
+        )
+
+
+class CombatOutcome:
+    """The result of a single simulated combat."""
+
+    def __init__(
+        self,
+        seed: Optional[int],
+        winner: str,
+        turns: int,
+        participants: list[ParticipantOutcome],
+    ) -> None:
+        """
+        Initialize the outcome.
+
+        Args:
+            seed (Optional[int]): The seed of the combat, to replay it.
+            winner (str): One of WINNER_PLAYER, WINNER_ENEMIES or WINNER_DRAW.
+            turns (int): The number of rounds played.
+            participants (list[ParticipantOutcome]): The player first, then
+                the enemies and the allies, in the order they were given.
+        """
+        self.seed: Optional[int] = seed
+        self.winner: str = winner
+        self.turns: int = turns
+        self.participants: list[ParticipantOutcome] = participants
+
+    @property
+    def player(self) -> ParticipantOutcome:
+        """Returns the outcome of the player."""
+        return self.participants[0]
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Converts the outcome to a dictionary.
+
+        Returns:
+            dict[str, Any]: The outcome.
+        """
+        return {
+            "seed": self.seed,
+            "winner": self.winner,
+            "turns": self.turns,
+            "participants": [p.to_dict() for p in self.participants],
+        }
+
+    def __repr__(self) -> str:
+        return f"CombatOutcome(winner={self.winner!r}, turns={self.turns})"
+
+
+def run_headless_combat(
+    player: Character,
+    enemies: list[Character],
+    allies: list[Character],
+    rng: Optional[RandomStream] = None,
+    policy: Optional[PlayerPolicy] = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    npc_policies: Optional[dict[str, PlayerPolicy]] = None,
+) -> CombatOutcome:
+    """
+    Runs a single combat on the given characters, which are modified in place.
+
+    Args:
+        player (Character): The player character.
+        enemies (list[Character]): The enemies.
+        allies (list[Character]): The allies of the player.
+        rng (Optional[RandomStream]): The random stream of the combat.
+        policy (Optional[PlayerPolicy]): The policy controlling the player.
+            Defaults to the NPC AI.
+        max_turns (int): Rounds after which the combat is a draw.
+        npc_policies (Optional[dict[str, PlayerPolicy]]): Policies
+            controlling some NPCs, by name. Defaults to the NPC AI.
+
+    Returns:
+        CombatOutcome: The outcome of the combat.
+    """
+    with suppress_output():
+        combat_manager = CombatManager(
+            player,
+            enemies,
+            allies,
+            rng=rng,
+            player_policy=policy or npc_policy,
+            npc_policies=npc_policies,
+        )
+        combat_manager.initialize()
+        while not combat_manager.is_combat_over():
+            if combat_manager.turn_number >= max_turns:
+                break
+            combat_manager.run_turn()
+
+    if not player.is_alive():
+        winner = WINNER_ENEMIES
+    elif not combat_manager.get_alive_opponents(player):
+        winner = WINNER_PLAYER
+    else:
+        winner = WINNER_DRAW
+
+    return CombatOutcome(
+        seed=rng.seed if rng else None,
+        winner=winner,
+        turns=combat_manager.turn_number,
+        participants=[
+            ParticipantOutcome(character) for character in [player] + enemies + allies
+        ],
+    )
+
+
+def iter_simulations(
+    player: Character,
+    enemies: list[Character],
+    allies: list[Character],
+    runs: range,
+    seed: int,
+    policy: Optional[PlayerPolicy] = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    npc_policies: Optional[dict[str, PlayerPolicy]] = None,
+) -> Iterator[CombatOutcome]:
+    """
+    Lazily simulates the given runs of an encounter.
+
+    Run `i` always uses a stream seeded from (seed, i), so the outcome of a run
+    does not depend on how the runs are split, e.g., among worker processes.
+
+    Args:
+        player (Character): The player character, used as a template.
+        enemies (list[Character]): The enemies, used as templates.
+        allies (list[Character]): The allies of the player, used as templates.
+        runs (range): The indices of the runs to simulate.
+        seed (int): The base seed.
+        policy (Optional[PlayerPolicy]): The policy controlling the player.
+        max_turns (int): Rounds after which a combat is a draw.
+        npc_policies (Optional[dict[str, PlayerPolicy]]): Policies
+            controlling some NPCs, by name.
+
+    Returns:
+        Iterator[CombatOutcome]: The outcome of each run, in order.
+    """
+    for run in runs:
+        yield run_headless_combat(
+            player.spawn(),
+            [enemy.spawn() for enemy in enemies],
+            [ally.spawn() for ally in allies],
+            rng=RandomStream(derive_seed(seed, run)),
+            policy=policy,
+            max_turns=max_turns,
+            npc_policies=npc_policies,
+        )
+
+
+def simulate(
+    player: Character,
+    enemies: list[Character],
+    allies: list[Character],
+    n_runs: int = 1,
+    seed: Optional[int] = None,
+    policy: Optional[PlayerPolicy] = None,
+    max_turns: int = DEFAULT_MAX_TURNS,
+    npc_policies: Optional[dict[str, PlayerPolicy]] = None,
+) -> list[CombatOutcome]:
+    """
+    Simulates the same encounter several times, without user interaction.
+
+    The given characters are used as templates and are never modified.
+
+    Args:
+        player (Character): The player character.
+        enemies (list[Character]): The enemies.
+        allies (list[Character]): The allies of the player.
+        n_runs (int): The number of combats to run. Defaults to 1.
+        seed (Optional[int]): The base seed; run `i` uses a seed derived from
+            it, so every run can be replayed on its own. Defaults to None.
+        policy (Optional[PlayerPolicy]): The policy controlling the player.
+            Defaults to the NPC AI.
+        max_turns (int): Rounds after which a combat is a draw.
+        npc_policies (Optional[dict[str, PlayerPolicy]]): Policies
+            controlling some NPCs, by name. Defaults to the NPC AI.
+
+    Returns:
+        list[CombatOutcome]: The outcome of each combat.
+    """
+    if n_runs < 0:
+        log_warning(
+            f"Number of runs must be non-negative, got {n_runs}",
+            {"n_runs": n_runs},
+        )
+        return []
+    if seed is None:
+        seed = derive_seed(None)
+    return list(
+        iter_simulations(
+            player,
+            enemies,
+            allies,
+            range(n_runs),
+            seed,
+            policy,
+            max_turns,
+            npc_policies,
+        )
+    )
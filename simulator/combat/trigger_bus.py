@@ -0,0 +1,282 @@
+"""
+Event-driven trigger dispatch.
+
+A `TriggerBus` connects the trigger effects of the participants of a combat
+to the combat events. Characters register their triggers by trigger type, and
+the bus subscribes to an event type only while some participant has a trigger
+activated by it, so events nobody reacts to are never even built. Each event
+is routed to the participant owning the triggers (e.g., the target of a HEAL
+event for ON_HEAL), without scanning the other participants or their effects.
+
+On-hit and health threshold triggers are not routed through the bus: they are
+resolved by the attack and by the damage itself.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Optional
+
+from combat.events import (
+    CombatEvent,
+    CombatEventType,
+    EventDispatcher,
+    EventSubscriber,
+    get_event_dispatcher,
+)
+from effects.trigger_effect import TriggerType
+
+
+class TriggerRoute:
+    """How the events of a type activate the triggers of a trigger type."""
+
+    __slots__ = ("trigger_type", "event_type", "owner", "accepts")
+
+    def __init__(
+        self,
+        trigger_type: TriggerType,
+        event_type: CombatEventType,
+        owner: str,
+        accepts: Optional[Callable[[CombatEvent], bool]] = None,
+    ) -> None:
+        """
+        Initialize the route.
+
+        Args:
+            trigger_type (TriggerType): The trigger type.
+            event_type (CombatEventType): The event type activating it.
+            owner (str): The event field holding the owner of the triggers.
+            accepts (Optional[Callable[[CombatEvent], bool]]): Filters the
+                events activating the triggers. Defaults to all of them.
+        """
+        self.trigger_type: TriggerType = trigger_type
+        self.event_type: CombatEventType = event_type
+        self.owner: str = owner
+        self.accepts: Optional[Callable[[CombatEvent], bool]] = accepts
+
+
+# The trigger types activated by combat events.
+TRIGGER_ROUTES: dict[TriggerType, TriggerRoute] = {
+    route.trigger_type: route
+    for route in (
+        TriggerRoute(TriggerType.ON_BEING_HIT, CombatEventType.HIT, "target"),
+        TriggerRoute(
+            TriggerType.ON_CRITICAL_HIT,
+            CombatEventType.HIT,
+            "actor",
+            lambda event: event.critical,
+        ),
+        TriggerRoute(TriggerType.ON_MISS, CombatEventType.MISS, "actor"),
+        TriggerRoute(
+            TriggerType.ON_DAMAGE_TAKEN,
+            CombatEventType.DAMAGE,
+            "target",
+            lambda event: event.amount > 0,
+        ),
+        TriggerRoute(
+            TriggerType.ON_HEAL,
+            CombatEventType.HEAL,
+            "target",
+            lambda event: event.amount > 0,
+        ),
+        TriggerRoute(TriggerType.ON_DEATH, CombatEventType.DEATH, "target"),
+        TriggerRoute(TriggerType.ON_KILL, CombatEventType.DEATH, "actor"),
+        TriggerRoute(TriggerType.ON_SPELL_CAST, CombatEventType.SPELL_CAST, "actor"),
+        TriggerRoute(TriggerType.ON_TURN_START, CombatEventType.TURN_START, "actor"),
+        TriggerRoute(TriggerType.ON_TURN_END, CombatEventType.TURN_END, "actor"),
+    )
+}
+
+# The routes of each event type.
+_ROUTES_BY_EVENT: dict[CombatEventType, list[TriggerRoute]] = {}
+for _route in TRIGGER_ROUTES.values():
+    _ROUTES_BY_EVENT.setdefault(_route.event_type, []).append(_route)
+
+
+def trigger_event_data(trigger_type: TriggerType, event: CombatEvent) -> dict[str, Any]:
+    """
+    Builds the data passed to the trigger conditions for an event.
+
+    Args:
+        trigger_type (TriggerType): The trigger type being activated.
+        event (CombatEvent): The event.
+
+    Returns:
+        dict[str, Any]: The event data.
+    """
+    event_data: dict[str, Any] = {
+        "event_type": trigger_type.value,
+        "event": event,
+        "source": event.actor,
+        "target": event.target,
+    }
+    if event.type == CombatEventType.SPELL_CAST:
+        event_data["spell_cast"] = event.action
+        event_data["spell_category"] = getattr(event.action, "category", None)
+    elif event.type == CombatEventType.DAMAGE:
+        event_data["damage_type"] = event.damage_type
+        event_data["damage_taken"] = event.amount
+    elif event.type == CombatEventType.HEAL:
+        event_data["amount"] = event.amount
+    return event_data
+
+
+class TriggerBus(EventSubscriber):
+    """Routes combat events to the triggers of the participants of a combat."""
+
+    def __init__(self) -> None:
+        """Initialize a bus without participants."""
+        # Number of triggers of each participant, by trigger type.
+        self._subscriptions: dict[TriggerType, dict[Any, int]] = {
+            trigger_type: {} for trigger_type in TRIGGER_ROUTES
+        }
+        # Number of participants with triggers activated by each event type.
+        self._event_counts: dict[CombatEventType, int] = {
+            event_type: 0 for event_type in _ROUTES_BY_EVENT
+        }
+        # The dispatcher the bus is attached to, and how many times.
+        self._dispatcher: Optional[EventDispatcher] = None
+        self._depth: int = 0
+        # Triggers being activated, to avoid triggers activating themselves.
+        self._dispatching: set[tuple[int, TriggerType]] = set()
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Copies of the bus (e.g., in a fork of the combat) start detached.
+        state = self.__dict__.copy()
+        state["_dispatcher"] = None
+        state["_depth"] = 0
+        state["_dispatching"] = set()
+        return state
+
+    # ---- Participants ----
+
+    def add_participant(self, character: Any) -> None:
+        """
+        Registers a character, with the triggers it currently has.
+
+        Args:
+            character (Any): The character.
+        """
+        effects_module = character.effects_module
+        effects_module.trigger_bus = self
+        for trigger_type in TRIGGER_ROUTES:
+            count = effects_module.count_triggers(trigger_type)
+            for _ in range(count):
+                self.subscribe_trigger(character, trigger_type)
+
+    def remove_participant(self, character: Any) -> None:
+        """
+        Unregisters a character, and all its triggers.
+
+        Args:
+            character (Any): The character.
+        """
+        if character.effects_module.trigger_bus is self:
+            character.effects_module.trigger_bus = None
+        for trigger_type, owners in self._subscriptions.items():
+            while character in owners:
+                self.unsubscribe_trigger(character, trigger_type)
+
+    def subscribe_trigger(self, owner: Any, trigger_type: TriggerType) -> None:
+        """
+        Registers a trigger of a participant.
+
+        Args:
+            owner (Any): The participant.
+            trigger_type (TriggerType): The type of the trigger.
+        """
+        owners = self._subscriptions.get(trigger_type)
+        if owners is None:
+            return
+        owners[owner] = owners.get(owner, 0) + 1
+        if owners[owner] == 1:
+            self._add_event_count(TRIGGER_ROUTES[trigger_type].event_type, 1)
+
+    def unsubscribe_trigger(self, owner: Any, trigger_type: TriggerType) -> None:
+        """
+        Unregisters a trigger of a participant.
+
+        Args:
+            owner (Any): The participant.
+            trigger_type (TriggerType): The type of the trigger.
+        """
+        owners = self._subscriptions.get(trigger_type)
+        if not owners or owner not in owners:
+            return
+        owners[owner] -= 1
+        if owners[owner] == 0:
+            del owners[owner]
+            self._add_event_count(TRIGGER_ROUTES[trigger_type].event_type, -1)
+
+    def _add_event_count(self, event_type: CombatEventType, delta: int) -> None:
+        """Updates the participants waiting for an event type, and subscribes
+        to it or unsubscribes from it accordingly."""
+        self._event_counts[event_type] += delta
+        if self._dispatcher is None:
+            return
+        count = self._event_counts[event_type]
+        if delta > 0 and count == delta:
+            self._dispatcher.subscribe(self, (event_type,))
+        elif delta < 0 and count == 0:
+            self._dispatcher.unsubscribe(self, (event_type,))
+
+    # ---- Dispatcher ----
+
+    @contextmanager
+    def attached(self) -> Iterator["TriggerBus"]:
+        """
+        Subscribes the bus to the active dispatcher within the block.
+
+        Yields:
+            TriggerBus: The bus.
+        """
+        if self._depth == 0:
+            self._dispatcher = get_event_dispatcher()
+            wanted = [et for et, count in self._event_counts.items() if count > 0]
+            if wanted:
+                self._dispatcher.subscribe(self, wanted)
+        self._depth += 1
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if self._depth == 0 and self._dispatcher is not None:
+                self._dispatcher.unsubscribe(self, list(self._event_counts))
+                self._dispatcher = None
+
+    def handle(self, event: CombatEvent) -> None:
+        for route in _ROUTES_BY_EVENT[event.type]:
+            owner = getattr(event, route.owner)
+            if owner is None or owner not in self._subscriptions[route.trigger_type]:
+                continue
+            if route.accepts is not None and not route.accepts(event):
+                continue
+            key = (id(owner), route.trigger_type)
+            if key in self._dispatching:
+                continue
+            self._dispatching.add(key)
+            try:
+                owner.effects_module.activate_triggers(
+                    route.trigger_type, trigger_event_data(route.trigger_type, event)
+                )
+            finally:
+                self._dispatching.discard(key)
+
+
+def with_trigger_bus(method: Callable) -> Callable:
+    """
+    Decorates a method so it runs with `self.trigger_bus` attached.
+
+    Args:
+        method (Callable): The method to decorate.
+
+    Returns:
+        Callable: The decorated method.
+    """
+
+    @wraps(method)
+    def _wrapper(self, *args, **kwargs):
+        with self.trigger_bus.attached():
+            return method(self, *args, **kwargs)
+
+    return _wrapper
@@ -0,0 +1,50 @@
+"""
+Shared fixtures of the test suite.
+
+The simulator modules import each other from this folder, so it is put on the
+path before the tests are collected.
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import pytest
+
+from character import Character, load_character, load_characters
+from core.content import ContentRepository
+from core.utils import suppress_output
+
+# Location of the data files.
+DATA_DIR = Path(__file__).resolve().parent.parent / "data"
+
+
+@pytest.fixture(scope="session")
+def content() -> ContentRepository:
+    """Loads the content repository once for the whole session."""
+    with suppress_output():
+        return ContentRepository(DATA_DIR)
+
+
+@pytest.fixture(scope="session")
+def player(content: ContentRepository) -> Character:
+    """The player template."""
+    with suppress_output():
+        character = load_character(DATA_DIR / "player.json")
+    assert character is not None
+    return character
+
+
+@pytest.fixture(scope="session")
+def enemies(content: ContentRepository) -> dict[str, Character]:
+    """The enemy templates, by name."""
+    with suppress_output():
+        return load_characters(DATA_DIR / "enemies_danmachi_f1_f10.json")
+
+
+@pytest.fixture(scope="session")
+def allies(content: ContentRepository) -> dict[str, Character]:
+    """The ally templates, by name."""
+    with suppress_output():
+        return load_characters(DATA_DIR / "characters.json")
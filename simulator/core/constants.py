@@ -89,6 +89,28 @@ class ArmorType(Enum):
     OTHER = auto()
 
 
+def _are_opponents(char1: CharacterType, char2: CharacterType) -> bool:
+    """Determines if char2 is an opponent of char1, from the factions."""
+    group1 = [CharacterType.PLAYER, CharacterType.ALLY]
+    group2 = [CharacterType.ENEMY]
+    if char1 == char2:
+        return False
+    if char1 in group1 and char2 in group1:
+        return False
+    if char1 in group2 and char2 in group2:
+        return False
+    return True
+
+
+# Whether the second character type is an opponent of the first, for every
+# pair of character types.
+OPPONENTS: dict[tuple[CharacterType, CharacterType], bool] = {
+    (char1, char2): _are_opponents(char1, char2)
+    for char1 in CharacterType
+    for char2 in CharacterType
+}
+
+
 def is_oponent(char1: CharacterType, char2: CharacterType) -> bool:
     """Determines if char2 is an opponent of char1.
 
@@ -99,15 +121,7 @@ def is_oponent(char1: CharacterType, char2: CharacterType) -> bool:
     Returns:
         bool: True if char2 is an opponent of char1, False otherwise.
     """
-    group1 = [CharacterType.PLAYER, CharacterType.ALLY]
-    group2 = [CharacterType.ENEMY]
-    if char1 == char2:
-        return False
-    if char1 in group1 and char2 in group1:
-        return False
-    if char1 in group2 and char2 in group2:
-        return False
-    return True
+    return OPPONENTS[char1, char2]
 
 
 def get_character_type_color(character_type: CharacterType) -> str:
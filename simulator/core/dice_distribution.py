@@ -0,0 +1,288 @@
+"""
+Exact probability distributions of dice expressions.
+
+The distribution of an expression is computed by walking its compiled tree
+(see `core.dice_parser`) and convolving the distributions of the sub-terms,
+so no sampling is involved. Results are memoized per expression and per
+value of the variables the expression actually uses.
+"""
+
+import math
+from bisect import bisect_left
+from functools import lru_cache
+from itertools import accumulate
+from typing import Any, Callable, Optional
+from catchery import *
+
+from core.dice_parser import (
+    MAX_DICE,
+    BinaryNode,
+    ConstantNode,
+    DiceNode,
+    ExpressionNode,
+    NegateNode,
+    VariableNode,
+    assume_min_individual_dice,
+    compile_expression,
+    iter_nodes,
+    normalize_variables,
+)
+
+# Maximum number of distributions kept in the cache.
+DISTRIBUTION_CACHE_SIZE = 1024
+
+
+class DiceDistribution:
+    """The exact probability mass function of a dice expression.
+
+    Instances are immutable and shared through the cache of
+    `get_distribution`, so they must never be modified after creation.
+    """
+
+    __slots__ = ("values", "probabilities", "_cumulative")
+
+    def __init__(self, pmf: dict[int, float]) -> None:
+        """
+        Initialize the distribution.
+
+        Args:
+            pmf (dict[int, float]): Probability of each possible outcome.
+        """
+        self.values: tuple[int, ...] = tuple(sorted(pmf))
+        self.probabilities: tuple[float, ...] = tuple(pmf[v] for v in self.values)
+        self._cumulative: tuple[float, ...] = tuple(accumulate(self.probabilities))
+
+    @property
+    def minimum(self) -> int:
+        """Returns the lowest possible outcome."""
+        return self.values[0]
+
+    @property
+    def maximum(self) -> int:
+        """Returns the highest possible outcome."""
+        return self.values[-1]
+
+    @property
+    def mean(self) -> float:
+        """Returns the expected value."""
+        return sum(v * p for v, p in zip(self.values, self.probabilities))
+
+    @property
+    def variance(self) -> float:
+        """Returns the variance."""
+        mean = self.mean
+        return sum((v - mean) ** 2 * p for v, p in zip(self.values, self.probabilities))
+
+    @property
+    def std(self) -> float:
+        """Returns the standard deviation."""
+        return math.sqrt(self.variance)
+
+    def pmf(self) -> dict[int, float]:
+        """
+        Returns the probability mass function.
+
+        Returns:
+            dict[int, float]: Probability of each possible outcome.
+        """
+        return dict(zip(self.values, self.probabilities))
+
+    def probability_of(self, value: int) -> float:
+        """
+        Returns the probability of an exact outcome.
+
+        Args:
+            value (int): The outcome.
+
+        Returns:
+            float: P(X == value).
+        """
+        index = bisect_left(self.values, value)
+        if index < len(self.values) and self.values[index] == value:
+            return self.probabilities[index]
+        return 0.0
+
+    def probability_at_least(self, value: int) -> float:
+        """
+        Returns the probability of rolling at least the given value, e.g., the
+        chance of an attack roll hitting a given AC.
+
+        Args:
+            value (int): The threshold.
+
+        Returns:
+            float: P(X >= value).
+        """
+        index = bisect_left(self.values, value)
+        if index == 0:
+            return 1.0
+        return max(0.0, 1.0 - self._cumulative[index - 1])
+
+    def probability_at_most(self, value: int) -> float:
+        """
+        Returns the probability of rolling at most the given value.
+
+        Args:
+            value (int): The threshold.
+
+        Returns:
+            float: P(X <= value).
+        """
+        return 1.0 - self.probability_at_least(value + 1)
+
+    def percentile(self, q: float) -> int:
+        """
+        Returns the smallest outcome whose cumulative probability reaches `q`.
+
+        Args:
+            q (float): The quantile, between 0 and 1 (e.g., 0.5 for the median).
+
+        Returns:
+            int: The outcome at the given quantile.
+        """
+        q = min(max(q, 0.0), 1.0)
+        # Tolerate the rounding error accumulated by the cumulative sum.
+        index = bisect_left(self._cumulative, q - 1e-12)
+        return self.values[min(index, len(self.values) - 1)]
+
+    def __repr__(self) -> str:
+        return (
+            f"DiceDistribution(min={self.minimum}, max={self.maximum}, "
+            f"mean={self.mean:.3f})"
+        )
+
+
+# ---- Convolution Helpers ----
+
+
+def _point(value: Any) -> dict[Any, float]:
+    return {value: 1.0}
+
+
+def _combine(
+    left: dict[Any, float],
+    right: dict[Any, float],
+    function: Callable[[Any, Any], Any],
+) -> dict[Any, float]:
+    """Distribution of function(X, Y), for independent X and Y."""
+    result: dict[Any, float] = {}
+    for lv, lp in left.items():
+        for rv, rp in right.items():
+            value = function(lv, rv)
+            result[value] = result.get(value, 0.0) + lp * rp
+    return result
+
+
+@lru_cache(maxsize=None)
+def _dice_sum(num: int, sides: int) -> dict[int, float]:
+    """Distribution of the sum of `num` dice with `sides` faces."""
+    if num <= 0:
+        return _point(0)
+    if num == 1:
+        return {face: 1.0 / sides for face in range(1, sides + 1)}
+    # Split in halves, so that large pools only need a few convolutions.
+    half = num // 2
+    return _combine(_dice_sum(half, sides), _dice_sum(num - half, sides), int.__add__)
+
+
+def _node_distribution(
+    node: ExpressionNode, variables: Optional[dict[str, int]]
+) -> dict[Any, float]:
+    """Computes the distribution of a node of a compiled expression."""
+    if isinstance(node, ConstantNode):
+        return _point(node.value)
+    if isinstance(node, VariableNode):
+        return _point(node.evaluate(variables, assume_min_individual_dice))
+    if isinstance(node, DiceNode):
+        result: dict[Any, float] = {}
+        for count, probability in _node_distribution(node.count, variables).items():
+            num = int(count)
+            if num > MAX_DICE:
+                log_error(
+                    f"Too many dice requested: {num} (limit: {MAX_DICE})",
+                    {"num": num, "sides": node.sides},
+                )
+                num = 0
+            for value, p in _dice_sum(max(num, 0), node.sides).items():
+                result[value] = result.get(value, 0.0) + probability * p
+        return result
+    if isinstance(node, NegateNode):
+        return {
+            -value: p for value, p in _node_distribution(node.operand, variables).items()
+        }
+    if isinstance(node, BinaryNode):
+        return _combine(
+            _node_distribution(node.left, variables),
+            _node_distribution(node.right, variables),
+            node.function,
+        )
+    raise ValueError(f"Unsupported expression node: {type(node).__name__}")
+
+
+@lru_cache(maxsize=DISTRIBUTION_CACHE_SIZE)
+def _cached_distribution(
+    expr: str, bindings: tuple[tuple[str, int], ...]
+) -> DiceDistribution:
+    compiled = compile_expression(expr)
+    raw = _node_distribution(compiled.root, dict(bindings))
+    # Truncate towards zero, exactly like int() in the scalar path.
+    pmf: dict[int, float] = {}
+    for value, p in raw.items():
+        pmf[int(value)] = pmf.get(int(value), 0.0) + p
+    return DiceDistribution(pmf)
+
+
+@lru_cache(maxsize=DISTRIBUTION_CACHE_SIZE)
+def _variable_names(expr: str) -> tuple[str, ...]:
+    compiled = compile_expression(expr)
+    return tuple(
+        sorted(
+            {
+                node.name
+                for node in iter_nodes(compiled.root)
+                if isinstance(node, VariableNode)
+            }
+        )
+    )
+
+
+# ---- Public API ----
+
+
+def get_distribution(
+    expr: str, variables: Optional[dict[str, int]] = None
+) -> DiceDistribution:
+    """
+    Computes the exact distribution of a dice expression.
+
+    Args:
+        expr (str): The dice expression (e.g., "[MIND]D8 + [SPELLCASTING]").
+        variables (Optional[dict[str, int]]): Variables used by the expression.
+
+    Returns:
+        DiceDistribution: The distribution. Invalid expressions yield a
+            distribution that is always 0.
+    """
+    if not expr:
+        return _cached_distribution("0", ())
+    try:
+        # Only the variables used by the expression are part of the key, so
+        # unrelated stat changes do not invalidate the cached distribution.
+        variables = normalize_variables(variables)
+        bindings = tuple(
+            (name, int(variables[name]))
+            for name in _variable_names(expr)
+            if variables and variables.get(name) is not None
+        )
+        return _cached_distribution(expr, bindings)
+    except Exception as e:
+        log_warning(
+            f"Failed to compute the distribution of '{expr}': {e}",
+            {
+                "expression": expr,
+                "variables": variables or {},
+                "error": str(e),
+                "context": "dice_expression_distribution",
+            },
+        )
+        return _cached_distribution("0", ())
@@ -1,18 +1,811 @@
 """
-Safe dice expression parser to replace eval() usage.
+Compiled dice expression engine.
+
+Expressions such as "[MIND]D8 + [SPELLCASTING] * [MIND]" are parsed once into a
+small tree of nodes and cached by their source string. The compiled tree is
+then evaluated against a mapping of variables, without any regex or eval() on
+the hot path.
 """
 
+import operator
 import re
-import random
-from typing import Tuple
+from functools import lru_cache
+from typing import Any, Callable, Iterator, Optional, Tuple
 from catchery import *
 
+from core.rng import RandomStream, get_rng
 
-class DiceParser:
-    """Safe parser for dice expressions without using eval()."""
+try:
+    import numpy as np
+except ImportError:  # NumPy is only required by the batch API.
+    np = None
+
+# Signature of the functions used to resolve dice terms: they take the number
+# of dice and the number of sides, and return the individual dice values.
+DiceAction = Callable[[int, int], list[int]]
+
+# Reasonable limits for a single dice term.
+MAX_DICE = 100
+MAX_SIDES = 1000
+
+# Maximum number of compiled expressions kept in the cache.
+EXPRESSION_CACHE_SIZE = 1024
+
+# Number of samples drawn at once by the batch API, to bound memory usage.
+BATCH_CHUNK_SIZE = 1 << 16
+
+# Tokenizer used only when compiling an expression.
+_TOKEN_PATTERN = re.compile(
+    r"\s*(?:(\d+)|\[([A-Z_][A-Z0-9_]*)\]|([A-Z_][A-Z0-9_]*)|(//|[-+*/%()]))"
+)
+_DICE_TOKEN = re.compile(r"^D(\d+)$")
+
+_BINARY_OPERATORS: dict[str, Callable[[Any, Any], Any]] = {
+    "+": operator.add,
+    "-": operator.sub,
+    "*": operator.mul,
+    "/": operator.truediv,
+    "//": operator.floordiv,
+    "%": operator.mod,
+}
+
+_PRECEDENCE: dict[str, int] = {
+    "+": 1,
+    "-": 1,
+    "*": 2,
+    "/": 2,
+    "//": 2,
+    "%": 2,
+}
+
+
+# ---- Dice Actions ----
+
+
+def roll_individual_dice(num: int, sides: int) -> list[int]:
+    """
+    Rolls individual dice with the active random stream.
+
+    Args:
+        num (int): Number of dice to roll.
+        sides (int): Number of sides on each die.
+
+    Returns:
+        list[int]: List of individual dice roll results.
+    """
+    return get_rng().roll(num, sides)
+
+
+def assume_min_individual_dice(num: int, sides: int) -> list[int]:
+    """
+    Assumes the minimum value for individual dice.
+
+    Args:
+        num (int): Number of dice.
+        sides (int): Number of sides on each die.
+
+    Returns:
+        list[int]: List with minimum roll (1) for each die.
+    """
+    return [1] * num
+
+
+def assume_max_individual_dice(num: int, sides: int) -> list[int]:
+    """
+    Assumes the maximum value for individual dice.
+
+    Args:
+        num (int): Number of dice.
+        sides (int): Number of sides on each die.
+
+    Returns:
+        list[int]: List with maximum roll for each die.
+    """
+    return [sides] * num
+
+
+# ---- Expression Nodes ----
+
+
+class ExpressionNode:
+    """Base class for the nodes of a compiled dice expression."""
+
+    __slots__ = ()
+
+    # Binding strength, used to decide where parentheses are needed when the
+    # expression is rendered back to text.
+    precedence: int = 4
+
+    def evaluate(
+        self, variables: Optional[dict[str, int]], dice_action: DiceAction
+    ) -> Any:
+        """
+        Evaluates the node.
+
+        Args:
+            variables (Optional[dict[str, int]]): Values of the variables.
+            dice_action (DiceAction): Function used to resolve dice terms.
+
+        Returns:
+            Any: The numeric value of the node.
+        """
+        raise NotImplementedError("Subclasses must implement the evaluate method")
+
+    def evaluate_batch(
+        self, variables: Optional[dict[str, int]], size: int, rng: Any
+    ) -> Any:
+        """
+        Evaluates the node for `size` independent samples at once.
+
+        Args:
+            variables (Optional[dict[str, int]]): Values of the variables.
+            size (int): Number of samples.
+            rng (numpy.random.Generator): Generator used to draw the dice.
+
+        Returns:
+            Any: Either a scalar or a NumPy array of `size` values.
+        """
+        raise NotImplementedError(
+            "Subclasses must implement the evaluate_batch method"
+        )
+
+    def render(
+        self, variables: Optional[dict[str, int]], totals: Optional[Iterator[Any]]
+    ) -> str:
+        """
+        Renders the node back to text, with variables substituted.
+
+        Args:
+            variables (Optional[dict[str, int]]): Values of the variables.
+            totals (Optional[Iterator[Any]]): If given, dice terms are replaced
+                by the next total, or text, taken from the iterator.
+
+        Returns:
+            str: The rendered text.
+        """
+        raise NotImplementedError("Subclasses must implement the render method")
+
+    def children(self) -> tuple["ExpressionNode", ...]:
+        """
+        Returns the child nodes, in evaluation order.
+
+        Returns:
+            tuple[ExpressionNode, ...]: The child nodes.
+        """
+        return ()
+
+
+class ConstantNode(ExpressionNode):
+    """A literal integer."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value: int) -> None:
+        self.value: int = value
+
+    def evaluate(
+        self, variables: Optional[dict[str, int]], dice_action: DiceAction
+    ) -> Any:
+        return self.value
+
+    def evaluate_batch(
+        self, variables: Optional[dict[str, int]], size: int, rng: Any
+    ) -> Any:
+        return self.value
+
+    def render(
+        self, variables: Optional[dict[str, int]], totals: Optional[Iterator[Any]]
+    ) -> str:
+        return str(self.value)
+
+
+def normalize_variables(variables: Optional[Any]) -> Optional[Any]:
+    """
+    Upper-cases the names of the variables, like the compiled expressions.
+
+    Only plain dictionaries are rebuilt: other mappings, such as the
+    `ExpressionVariables` of the characters, already use upper-case names and
+    are returned as they are.
+
+    Args:
+        variables (Optional[Any]): Values of the variables.
+
+    Returns:
+        Optional[Any]: The variables, with upper-case names.
+    """
+    if type(variables) is not dict:
+        return variables
+    return {
+        key.upper() if isinstance(key, str) else key: value
+        for key, value in variables.items()
+    }
+
+
+class VariableNode(ExpressionNode):
+    """A reference to a variable, written either as [NAME] or as NAME."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+
+    def evaluate(
+        self, variables: Optional[dict[str, int]], dice_action: DiceAction
+    ) -> Any:
+        value = variables.get(self.name) if variables else None
+        if value is None:
+            log_warning(
+                f"Unknown variable '{self.name}' in dice expression, assuming 0",
+                {"variable": self.name, "variables": variables or {}},
+            )
+            return 0
+        return int(value)
+
+    def evaluate_batch(
+        self, variables: Optional[dict[str, int]], size: int, rng: Any
+    ) -> Any:
+        return self.evaluate(variables, assume_min_individual_dice)
+
+    def render(
+        self, variables: Optional[dict[str, int]], totals: Optional[Iterator[Any]]
+    ) -> str:
+        value = variables.get(self.name) if variables else None
+        return f"[{self.name}]" if value is None else str(int(value))
+
+
+class DiceNode(ExpressionNode):
+    """A dice term, such as 2D6, D20 or ([MIND] - 1)D8."""
+
+    __slots__ = ("count", "sides")
+
+    def __init__(self, count: ExpressionNode, sides: int) -> None:
+        self.count: ExpressionNode = count
+        self.sides: int = sides
+
+    def evaluate(
+        self, variables: Optional[dict[str, int]], dice_action: DiceAction
+    ) -> Any:
+        num = int(self.count.evaluate(variables, dice_action))
+        if num > MAX_DICE:
+            log_error(
+                f"Too many dice requested: {num} (limit: {MAX_DICE})",
+                {"num": num, "sides": self.sides},
+            )
+            num = 0
+        # A count that scales down to zero (or below) rolls no dice at all, but
+        # the action is still called so that recorders see every dice term.
+        return sum(dice_action(max(num, 0), self.sides))
+
+    def evaluate_batch(
+        self, variables: Optional[dict[str, int]], size: int, rng: Any
+    ) -> Any:
+        count = self.count.evaluate_batch(variables, size, rng)
+        if np.ndim(count) == 0:
+            num = int(count)
+            if num > MAX_DICE:
+                log_error(
+                    f"Too many dice requested: {num} (limit: {MAX_DICE})",
+                    {"num": num, "sides": self.sides},
+                )
+                num = 0
+            if num <= 0:
+                return 0
+            draws = rng.integers(1, self.sides + 1, size=(size, num), dtype=np.int64)
+            return draws.sum(axis=1)
+        # The number of dice changes from sample to sample: draw the largest
+        # amount and mask out the extra dice of each sample.
+        counts = np.asarray(count).astype(np.int64)
+        counts[counts > MAX_DICE] = 0
+        counts = np.clip(counts, 0, None)
+        largest = int(counts.max(initial=0))
+        if largest == 0:
+            return np.zeros(size, dtype=np.int64)
+        draws = rng.integers(1, self.sides + 1, size=(size, largest), dtype=np.int64)
+        mask = np.arange(largest) < counts[:, None]
+        return (draws * mask).sum(axis=1)
+
+    def render(
+        self, variables: Optional[dict[str, int]], totals: Optional[Iterator[Any]]
+    ) -> str:
+        count = self.count.render(variables, totals)
+        if totals is not None:
+            return str(next(totals, 0))
+        if not isinstance(self.count, (ConstantNode, VariableNode)):
+            count = f"({count})"
+        return f"{count}D{self.sides}"
+
+    def children(self) -> tuple[ExpressionNode, ...]:
+        return (self.count,)
+
+
+class NegateNode(ExpressionNode):
+    """Unary minus."""
+
+    __slots__ = ("operand",)
+
+    precedence = 3
+
+    def __init__(self, operand: ExpressionNode) -> None:
+        self.operand: ExpressionNode = operand
+
+    def evaluate(
+        self, variables: Optional[dict[str, int]], dice_action: DiceAction
+    ) -> Any:
+        return -self.operand.evaluate(variables, dice_action)
+
+    def evaluate_batch(
+        self, variables: Optional[dict[str, int]], size: int, rng: Any
+    ) -> Any:
+        return -self.operand.evaluate_batch(variables, size, rng)
+
+    def render(
+        self, variables: Optional[dict[str, int]], totals: Optional[Iterator[Any]]
+    ) -> str:
+        operand = self.operand.render(variables, totals)
+        if self.operand.precedence < self.precedence:
+            operand = f"({operand})"
+        return f"-{operand}"
+
+    def children(self) -> tuple[ExpressionNode, ...]:
+        return (self.operand,)
+
+
+class BinaryNode(ExpressionNode):
+    """A binary arithmetic operation."""
+
+    __slots__ = ("symbol", "function", "left", "right", "precedence")
+
+    def __init__(
+        self, symbol: str, left: ExpressionNode, right: ExpressionNode
+    ) -> None:
+        self.symbol: str = symbol
+        self.function: Callable[[Any, Any], Any] = _BINARY_OPERATORS[symbol]
+        self.left: ExpressionNode = left
+        self.right: ExpressionNode = right
+        self.precedence: int = _PRECEDENCE[symbol]
+
+    def evaluate(
+        self, variables: Optional[dict[str, int]], dice_action: DiceAction
+    ) -> Any:
+        return self.function(
+            self.left.evaluate(variables, dice_action),
+            self.right.evaluate(variables, dice_action),
+        )
+
+    def evaluate_batch(
+        self, variables: Optional[dict[str, int]], size: int, rng: Any
+    ) -> Any:
+        return self.function(
+            self.left.evaluate_batch(variables, size, rng),
+            self.right.evaluate_batch(variables, size, rng),
+        )
+
+    def render(
+        self, variables: Optional[dict[str, int]], totals: Optional[Iterator[Any]]
+    ) -> str:
+        left = self.left.render(variables, totals)
+        right = self.right.render(variables, totals)
+        if self.left.precedence < self.precedence:
+            left = f"({left})"
+        if self.right.precedence < self.precedence or (
+            self.right.precedence == self.precedence and self.symbol != "+"
+        ):
+            right = f"({right})"
+        return f"{left} {self.symbol} {right}"
+
+    def children(self) -> tuple[ExpressionNode, ...]:
+        return (self.left, self.right)
+
+
+# ---- Compiled Expression ----
+
+
+class DiceExpression:
+    """A dice expression compiled into a tree of nodes.
+
+    Instances are immutable and shared through the cache of
+    `compile_expression`, so they must never be modified after creation.
+    """
+
+    __slots__ = ("source", "root", "has_dice", "has_variables", "_constant")
+
+    def __init__(self, source: str, root: ExpressionNode) -> None:
+        """
+        Initialize the compiled expression.
+
+        Args:
+            source (str): The original expression.
+            root (ExpressionNode): The root node of the compiled tree.
+        """
+        self.source: str = source
+        self.root: ExpressionNode = root
+        self.has_dice: bool = any(
+            isinstance(node, DiceNode) for node in iter_nodes(root)
+        )
+        self.has_variables: bool = any(
+            isinstance(node, VariableNode) for node in iter_nodes(root)
+        )
+        # Expressions made only of literals are folded once.
+        self._constant: Optional[int] = None
+        if not self.has_dice and not self.has_variables:
+            self._constant = int(root.evaluate(None, assume_min_individual_dice))
+
+    def evaluate(
+        self,
+        variables: Optional[dict[str, int]] = None,
+        dice_action: DiceAction = roll_individual_dice,
+    ) -> int:
+        """
+        Evaluates the expression, resolving dice terms with the given action.
+
+        Args:
+            variables (Optional[dict[str, int]]): Values of the variables.
+            dice_action (DiceAction): Function used to resolve dice terms.
+
+        Returns:
+            int: The result of the expression.
+        """
+        if self._constant is not None:
+            return self._constant
+        return int(self.root.evaluate(normalize_variables(variables), dice_action))
+
+    def roll(
+        self,
+        variables: Optional[dict[str, int]] = None,
+        rng: Optional[RandomStream] = None,
+    ) -> int:
+        """
+        Rolls the expression.
+
+        Args:
+            variables (Optional[dict[str, int]]): Values of the variables.
+            rng (Optional[RandomStream]): Stream used to roll the dice.
+                Defaults to the active stream.
+
+        Returns:
+            int: The rolled result.
+        """
+        return self.evaluate(variables, rng.roll if rng else roll_individual_dice)
+
+    def roll_batch(
+        self,
+        size: int,
+        variables: Optional[dict[str, int]] = None,
+        rng: Any = None,
+    ) -> Any:
+        """
+        Rolls the expression `size` times using vectorized NumPy draws.
+
+        Args:
+            size (int): Number of samples to draw.
+            variables (Optional[dict[str, int]]): Values of the variables.
+            rng (Optional[numpy.random.Generator | RandomStream]): Generator
+                used to draw the dice. Defaults to one derived from the active
+                stream.
+
+        Returns:
+            numpy.ndarray: Integer array with the `size` results.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("NumPy is required to roll dice in batches")
+        if rng is None:
+            rng = get_rng().numpy_generator()
+        elif isinstance(rng, RandomStream):
+            rng = rng.numpy_generator()
+        results = np.empty(max(size, 0), dtype=np.int64)
+        if self._constant is not None:
+            results.fill(self._constant)
+            return results
+        variables = normalize_variables(variables)
+        for start in range(0, size, BATCH_CHUNK_SIZE):
+            stop = min(start + BATCH_CHUNK_SIZE, size)
+            chunk = self.root.evaluate_batch(variables, stop - start, rng)
+            # Truncate towards zero, exactly like int() in the scalar path.
+            results[start:stop] = np.trunc(chunk)
+        return results
+
+    def minimum(self, variables: Optional[dict[str, int]] = None) -> int:
+        """
+        Evaluates the expression assuming every die rolls a 1.
+
+        Args:
+            variables (Optional[dict[str, int]]): Values of the variables.
+
+        Returns:
+            int: The result with minimum dice.
+        """
+        return self.evaluate(variables, assume_min_individual_dice)
+
+    def maximum(self, variables: Optional[dict[str, int]] = None) -> int:
+        """
+        Evaluates the expression assuming every die rolls its highest face.
+
+        Args:
+            variables (Optional[dict[str, int]]): Values of the variables.
+
+        Returns:
+            int: The result with maximum dice.
+        """
+        return self.evaluate(variables, assume_max_individual_dice)
+
+    def substitute(self, variables: Optional[dict[str, int]] = None) -> str:
+        """
+        Renders the expression with its variables substituted, and the
+        arithmetic between known values folded (e.g., "[MIND]D8 + 1 + 2"
+        becomes "2D8 + 3").
+
+        Args:
+            variables (Optional[dict[str, int]]): Values of the variables.
+
+        Returns:
+            str: The substituted expression.
+        """
+        variables = normalize_variables(variables)
+        return _fold(self.root, variables).render(variables, None)
+
+    def describe(
+        self,
+        variables: Optional[dict[str, int]] = None,
+        dice_action: DiceAction = roll_individual_dice,
+    ) -> Tuple[int, str, list[int]]:
+        """
+        Rolls the expression and describes how the result was obtained.
+
+        Args:
+            variables (Optional[dict[str, int]]): Values of the variables.
+            dice_action (DiceAction): Function used to resolve dice terms.
+
+        Returns:
+            Tuple[int, str, list[int]]: The total, a description of the roll,
+                and the total of each dice term in order of appearance.
+        """
+        dice_rolls: list[int] = []
+
+        def _record(num: int, sides: int) -> list[int]:
+            rolls = dice_action(num, sides)
+            dice_rolls.append(sum(rolls))
+            return rolls
+
+        variables = normalize_variables(variables)
+        result = self.evaluate(variables, _record)
+        substituted = self.root.render(variables, None)
+        breakdown = self.root.render(variables, iter(dice_rolls))
+        return result, f"{substituted} → {breakdown}", dice_rolls
+
+    def __repr__(self) -> str:
+        return f"DiceExpression({self.source!r})"
 
-    DICE_PATTERN = re.compile(r"(\d*)d(\d+)([+-]\d+)?", re.IGNORECASE)
-    SIMPLE_MATH = re.compile(r"^[\d\s\+\-\*\/\(\)]+$")
+
+def _fold(node: ExpressionNode, variables: Optional[dict[str, int]]) -> ExpressionNode:
+    """
+    Replaces the subtrees without dice, whose variables are all known, by
+    their value.
+
+    Args:
+        node (ExpressionNode): The root of the subtree.
+        variables (Optional[dict[str, int]]): Values of the variables.
+
+    Returns:
+        ExpressionNode: The folded subtree, which may be the same node.
+    """
+    if not any(isinstance(child, DiceNode) for child in iter_nodes(node)) and all(
+        variables and variables.get(child.name) is not None
+        for child in iter_nodes(node)
+        if isinstance(child, VariableNode)
+    ):
+        try:
+            value = node.evaluate(variables, assume_min_individual_dice)
+        except ZeroDivisionError:
+            return node
+        # Keep divisions with a remainder as written.
+        if value == int(value):
+            return ConstantNode(int(value))
+        return node
+    if isinstance(node, DiceNode):
+        return DiceNode(_fold(node.count, variables), node.sides)
+    if isinstance(node, NegateNode):
+        return NegateNode(_fold(node.operand, variables))
+    if isinstance(node, BinaryNode) and node.symbol in ("+", "-"):
+        # Sum the constant terms of a chain of additions and subtractions,
+        # e.g., 1D8 + 2 + 3 becomes 1D8 + 5.
+        terms: list[tuple[bool, ExpressionNode]] = []
+        _collect_terms(node, False, terms)
+        constant = 0
+        result: Optional[ExpressionNode] = None
+        for negative, term in terms:
+            term = _fold(term, variables)
+            if isinstance(term, ConstantNode):
+                constant += -term.value if negative else term.value
+            elif result is None:
+                result = NegateNode(term) if negative else term
+            else:
+                result = BinaryNode("-" if negative else "+", result, term)
+        if result is None:
+            return ConstantNode(constant)
+        if constant:
+            symbol = "-" if constant < 0 else "+"
+            result = BinaryNode(symbol, result, ConstantNode(abs(constant)))
+        return result
+    if isinstance(node, BinaryNode):
+        return BinaryNode(
+            node.symbol, _fold(node.left, variables), _fold(node.right, variables)
+        )
+    return node
+
+
+def _collect_terms(
+    node: ExpressionNode, negative: bool, terms: list[tuple[bool, ExpressionNode]]
+) -> None:
+    """Flattens a chain of additions and subtractions into signed terms."""
+    if isinstance(node, BinaryNode) and node.symbol in ("+", "-"):
+        _collect_terms(node.left, negative, terms)
+        _collect_terms(node.right, negative != (node.symbol == "-"), terms)
+    else:
+        terms.append((negative, node))
+
+
+def iter_nodes(node: ExpressionNode) -> Iterator[ExpressionNode]:
+    """
+    Iterates over a node and all its descendants, in evaluation order.
+
+    Args:
+        node (ExpressionNode): The root node.
+
+    Returns:
+        Iterator[ExpressionNode]: The nodes of the tree.
+    """
+    for child in node.children():
+        yield from iter_nodes(child)
+    yield node
+
+
+# ---- Parser ----
+
+
+class _Parser:
+    """Recursive descent parser producing a tree of expression nodes.
+
+    Grammar (dice bind tighter than any operator):
+        expr    := term (("+" | "-") term)*
+        term    := unary (("*" | "/" | "//" | "%") unary)*
+        unary   := ("-" | "+") unary | postfix
+        postfix := primary DICE*
+        primary := NUMBER | VARIABLE | NAME | DICE | "(" expr ")"
+    """
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.tokens = self._tokenize(source.upper())
+        self.position = 0
+
+    def _tokenize(self, text: str) -> list[tuple[str, Any]]:
+        tokens: list[tuple[str, Any]] = []
+        position = 0
+        text = text.rstrip()
+        while position < len(text):
+            match = _TOKEN_PATTERN.match(text, position)
+            if not match or match.end() == position:
+                raise ValueError(
+                    f"Invalid character '{text[position:].strip()[:1]}' in '{self.source}'"
+                )
+            number, variable, name, symbol = match.groups()
+            if number is not None:
+                tokens.append(("number", int(number)))
+            elif variable is not None:
+                tokens.append(("variable", variable))
+            elif name is not None:
+                dice = _DICE_TOKEN.match(name)
+                if dice:
+                    tokens.append(("dice", int(dice.group(1))))
+                else:
+                    tokens.append(("variable", name))
+            else:
+                tokens.append(("symbol", symbol))
+            position = match.end()
+        return tokens
+
+    def _peek(self) -> tuple[str, Any]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return ("end", None)
+
+    def _advance(self) -> tuple[str, Any]:
+        token = self._peek()
+        self.position += 1
+        return token
+
+    def parse(self) -> ExpressionNode:
+        if not self.tokens:
+            raise ValueError("Invalid dice expression: empty")
+        node = self._parse_expr()
+        if self._peek()[0] != "end":
+            raise ValueError(
+                f"Unexpected token '{self._peek()[1]}' in '{self.source}'"
+            )
+        return node
+
+    def _parse_expr(self) -> ExpressionNode:
+        node = self._parse_term()
+        while self._peek() in (("symbol", "+"), ("symbol", "-")):
+            symbol = self._advance()[1]
+            node = BinaryNode(symbol, node, self._parse_term())
+        return node
+
+    def _parse_term(self) -> ExpressionNode:
+        node = self._parse_unary()
+        while self._peek()[0] == "symbol" and self._peek()[1] in ("*", "/", "//", "%"):
+            symbol = self._advance()[1]
+            node = BinaryNode(symbol, node, self._parse_unary())
+        return node
+
+    def _parse_unary(self) -> ExpressionNode:
+        if self._peek() == ("symbol", "-"):
+            self._advance()
+            return NegateNode(self._parse_unary())
+        if self._peek() == ("symbol", "+"):
+            self._advance()
+            return self._parse_unary()
+        return self._parse_postfix()
+
+    def _parse_postfix(self) -> ExpressionNode:
+        node = self._parse_primary()
+        while self._peek()[0] == "dice":
+            node = self._make_dice(node, self._advance()[1])
+        return node
+
+    def _parse_primary(self) -> ExpressionNode:
+        kind, value = self._advance()
+        if kind == "number":
+            return ConstantNode(value)
+        if kind == "variable":
+            return VariableNode(value)
+        if kind == "dice":
+            return self._make_dice(ConstantNode(1), value)
+        if (kind, value) == ("symbol", "("):
+            node = self._parse_expr()
+            if self._advance() != ("symbol", ")"):
+                raise ValueError(f"Missing closing parenthesis in '{self.source}'")
+            return node
+        if kind == "end":
+            raise ValueError(f"Unexpected end of expression in '{self.source}'")
+        raise ValueError(f"Unexpected token '{value}' in '{self.source}'")
+
+    def _make_dice(self, count: ExpressionNode, sides: int) -> DiceNode:
+        if sides <= 0 or sides > MAX_SIDES:
+            raise ValueError(
+                f"Invalid number of sides: {sides} (limit: {MAX_SIDES}) in '{self.source}'"
+            )
+        if isinstance(count, ConstantNode) and count.value > MAX_DICE:
+            raise ValueError(
+                f"Too many dice: {count.value} (limit: {MAX_DICE}) in '{self.source}'"
+            )
+        return DiceNode(count, sides)
+
+
+@lru_cache(maxsize=EXPRESSION_CACHE_SIZE)
+def compile_expression(expr: str) -> DiceExpression:
+    """
+    Compiles a dice expression, caching the result by source string.
+
+    Args:
+        expr (str): The expression to compile (e.g., "[MIND]D8 + [SPELLCASTING]").
+
+    Returns:
+        DiceExpression: The compiled expression.
+
+    Raises:
+        ValueError: If the expression is invalid.
+    """
+    if not isinstance(expr, str):
+        raise ValueError(f"Invalid dice expression: not string ({type(expr).__name__})")
+    return DiceExpression(expr, _Parser(expr).parse())
+
+
+class DiceParser:
+    """Safe parser for dice expressions, backed by the compiled engine."""
 
     @staticmethod
     def parse_dice(expression: str) -> Tuple[int, str]:
@@ -39,145 +832,39 @@ class DiceParser:
             )
             raise ValueError("Invalid dice expression: not string")
 
-        # Remove whitespace and convert to uppercase
         try:
-            expr = expression.strip().upper()
-        except Exception as e:
+            compiled = compile_expression(expression)
+        except ValueError as e:
             log_error(
-                f"Error processing dice expression: {str(e)}",
+                f"Invalid dice expression '{expression}': {str(e)}",
                 {"expression": expression},
                 e,
-                True,
-            ) ValueError(f"Error processing expression: {e}")
-
-        # Handle simple numbers
-        if expr.isdigit():
-            try:
-                value = int(expr)
-                if value < 0:
-                    log_warning(
-                        f"Negative values not allowed in dice expressions: {value}",
-                        {"expression": expression, "value": value},
-                    )
-                    raise ValueError(f"Negative value: {value}")
-                return value, str(value)
-            except ValueError as e:
-                log_warning(
-                    f"Invalid numeric expression: {expression}",
-                    {"expression": expression},
-                    e,
-                )
-                raise
-
-        # Find all dice rolls
-        total = 0
-        details = []
-
-        # Replace dice rolls with their results
-        def roll_dice(match: re.Match[str]) -> str:
-            """
-            Helper function to process individual dice roll matches.
-            
-            Args:
-                match (re.Match[str]): Regular expression match object containing dice notation.
-                
-            Returns:
-                str: String representation of the dice roll result.
-                
-            Raises:
-                ValueError: If dice parameters are invalid.
-            """
-            nonlocal total, details
-
-            try:
-                count_str, sides_str, modifier_str = match.groups()
-                count = int(count_str) if count_str else 1
-                sides = int(sides_str)
-                modifier = int(modifier_str) if modifier_str else 0
-
-                if count <= 0:
-                    log_error(
-                        f"Invalid dice count: {count}",
-                        {"expression": expression, "count": count, "sides": sides},
-                    )
-                    raise ValueError(f"Invalid dice count: {count}")
-
-                if count > 100:  # Reasonable limits
-                    log_error(
-                        f"Too many dice: {count} (limit: 100)",
-                        {"expression": expression, "count": count, "sides": sides},
-                    )
-                    raise ValueError(f"Too many dice: {count}")
-
-                if sides <= 0:
-                    log_error(
-                        f"Invalid dice sides: {sides}",
-                        {"expression": expression, "count": count, "sides": sides},
-                    )
-                    raise ValueError(f"Invalid dice sides: {sides}")
-
-                if sides > 1000:
-                    log_error(
-                        f"Too many sides: {sides} (limit: 1000)",
-                        {"expression": expression, "count": count, "sides": sides},
-                    )
-                    raise ValueError(f"Too many sides: {sides}")
-
-                rolls = [random.randint(1, sides) for _ in range(count)]
-                roll_sum = sum(rolls) + modifier
-
-                total += roll_sum
-
-                if count == 1:
-                    detail = f"d{sides}({rolls[0]})"
-                else:
-                    detail = f"{count}d{sides}({'+'.join(map(str, rolls))})"
-
-                if modifier != 0:
-                    detail += f"{modifier:+d}"
-
-                details.append(detail)
-                return str(roll_sum)
+            )
+            raise
 
-            except Exception as e:
-                log_error(
-                    f"Error rolling dice in expression '{expression}': {str(e)}",
-                    {"expression": expression, "match": match.group()},
-                    e,
-                )
-                raise ValueError(f"Error rolling dice: {e}")
+        details: list[str] = []
 
-        try:
-            # Replace dice expressions
-            processed = DiceParser.DICE_PATTERN.sub(roll_dice, expr)
-
-            # Handle any remaining simple math
-            if DiceParser.SIMPLE_MATH.match(processed):
-                try:
-                    # Safe evaluation of simple arithmetic
-                    total = eval(processed, {"__builtins__": {}}, {})
-                    description = " + ".join(details) if details else processed
-                    return int(total), description
-                except Exception as e:
-                    log_error(
-                        f"Error evaluating processed expression '{processed}': {str(e)}",
-                        {"original": expression, "processed": processed},
-                        e,
-                    )
-                    raise ValueError(f"Invalid expression: {e}")
+        def _roll_and_record(num: int, sides: int) -> list[int]:
+            rolls = roll_individual_dice(num, sides)
+            if num == 1:
+                details.append(f"d{sides}({rolls[0]})")
+            elif num > 1:
+                details.append(f"{num}d{sides}({'+'.join(map(str, rolls))})")
             else:
-                log_error(
-                    f"Unsafe expression detected: {expression}",
-                    {"expression": expression, "processed": processed},
-                )
-                raise ValueError(f"Unsafe expression: {expression}")
+                details.append("0")
+            return rolls
 
-        except ValueError:
-            raise  # Re-raise ValueError as-is
+        try:
+            total = compiled.evaluate(None, _roll_and_record)
         except Exception as e:
             log_error(
-                f"Unexpected error parsing dice expression '{expression}': {str(e)}",
+                f"Error evaluating dice expression '{expression}': {str(e)}",
                 {"expression": expression},
                 e,
-                True,
-            ) ValueError(f"Unexpected error: {e}")
+            )
+            raise ValueError(f"Invalid expression: {e}")
+
+        # Render the expression with each dice term replaced by its rolls, so
+        # the constant terms are described too.
+        description = compiled.root.render(None, iter(details))
+        return total, description
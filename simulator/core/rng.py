@@ -0,0 +1,272 @@
+"""
+Seedable random number streams.
+
+Every random draw of the simulator (dice, initiative, ...) goes through a
+`RandomStream`. Code that does not receive a stream explicitly uses the active
+one, which a `CombatManager` switches to its own stream while it runs, so that
+independent combats can be reproduced from a seed and run side by side.
+"""
+
+import hashlib
+import random
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Iterator, Optional
+from catchery import *
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only required by the "numpy" backend.
+    np = None
+
+# Number of uniform values fetched at once by the NumPy backend.
+PREFETCH_SIZE = 4096
+
+
+def derive_seed(seed: Optional[int], *keys: int) -> int:
+    """
+    Derives a deterministic child seed, e.g., one per worker or per combat.
+
+    Args:
+        seed (Optional[int]): The base seed. None derives from fresh entropy.
+        *keys (int): Indices identifying the child stream (e.g., worker, run).
+
+    Returns:
+        int: A 64-bit seed, independent of the ones derived with other keys.
+    """
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+    text = ":".join(str(part) for part in (seed, *keys))
+    digest = hashlib.blake2b(text.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class RandomStream:
+    """A stream of random numbers with an optional NumPy backend.
+
+    Without a seed, the Python backend draws from the global `random` module,
+    so `random.seed()` keeps working for scripts that rely on it.
+    """
+
+    def __init__(
+        self,
+        seed: Optional[int] = None,
+        backend: str = "python",
+        prefetch: int = PREFETCH_SIZE,
+    ) -> None:
+        """
+        Initialize the stream.
+
+        Args:
+            seed (Optional[int]): Seed of the stream. Defaults to None.
+            backend (str): Either "python" or "numpy". Defaults to "python".
+            prefetch (int): Number of values the NumPy backend draws at once.
+        """
+        if backend not in ("python", "numpy"):
+            log_warning(
+                f"Unknown random backend '{backend}', using 'python'",
+                {"backend": backend},
+            )
+            backend = "python"
+        if backend == "numpy" and np is None:
+            log_warning(
+                "NumPy is not installed, using the 'python' random backend",
+                {"backend": backend},
+            )
+            backend = "python"
+        self.seed: Optional[int] = seed
+        self.backend: str = backend
+        self._random: Any = random if seed is None else random.Random(seed)
+        self._generator: Any = None
+        self._buffer: Any = None
+        self._position: int = 0
+        self._prefetch: int = max(1, prefetch)
+        if backend == "numpy":
+            self._generator = np.random.default_rng(seed)
+            self._position = self._prefetch
+
+    def random(self) -> float:
+        """
+        Returns a uniform float in [0, 1).
+
+        Returns:
+            float: The random value.
+        """
+        if self._generator is None:
+            return self._random.random()
+        if self._position >= self._prefetch:
+            self._buffer = self._generator.random(self._prefetch).tolist()
+            self._position = 0
+        value = self._buffer[self._position]
+        self._position += 1
+        return value
+
+    def randint(self, low: int, high: int) -> int:
+        """
+        Returns a uniform integer in [low, high], both included.
+
+        Args:
+            low (int): The lowest value.
+            high (int): The highest value.
+
+        Returns:
+            int: The random value.
+        """
+        if self._generator is None:
+            return self._random.randint(low, high)
+        return low + int(self.random() * (high - low + 1))
+
+    def roll(self, num: int, sides: int) -> list[int]:
+        """
+        Rolls individual dice.
+
+        Args:
+            num (int): Number of dice to roll.
+            sides (int): Number of sides on each die.
+
+        Returns:
+            list[int]: List of individual dice roll results.
+        """
+        if self._generator is None:
+            randint = self._random.randint
+            return [randint(1, sides) for _ in range(num)]
+        return [1 + int(self.random() * sides) for _ in range(num)]
+
+    def choice(self, options: list[Any]) -> Any:
+        """
+        Returns a random element of a non-empty list.
+
+        Args:
+            options (list[Any]): The list to choose from.
+
+        Returns:
+            Any: The chosen element.
+        """
+        return options[self.randint(0, len(options) - 1)]
+
+    def spawn(self, *keys: int) -> "RandomStream":
+        """
+        Creates an independent child stream, with the same backend.
+
+        Args:
+            *keys (int): Indices identifying the child (e.g., worker, run).
+
+        Returns:
+            RandomStream: The child stream.
+        """
+        return RandomStream(
+            derive_seed(self.seed, *keys), self.backend, self._prefetch
+        )
+
+    def get_state(self) -> Any:
+        """
+        Returns the state of the stream, to resume it later with `set_state`.
+
+        Returns:
+            Any: The state.
+        """
+        if self._generator is None:
+            return self._random.getstate()
+        return (self._generator.bit_generator.state, self._buffer, self._position)
+
+    def set_state(self, state: Any) -> None:
+        """
+        Resumes the stream from a state returned by `get_state`.
+
+        Args:
+            state (Any): The state.
+        """
+        if self._generator is None:
+            self._random.setstate(state)
+        else:
+            self._generator.bit_generator.state, self._buffer, self._position = state
+
+    def numpy_generator(self) -> Any:
+        """
+        Returns a NumPy generator for bulk draws, derived from this stream.
+
+        Returns:
+            numpy.random.Generator: The generator.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        if np is None:
+            raise ImportError("NumPy is required to create a NumPy generator")
+        if self._generator is None:
+            # Seeded from the stream, so the draws stay reproducible.
+            return np.random.default_rng(self._random.getrandbits(64))
+        return self._generator
+
+    def __repr__(self) -> str:
+        return f"RandomStream(seed={self.seed}, backend={self.backend!r})"
+
+
+# ---- Active Stream ----
+
+_active_stream: RandomStream = RandomStream()
+
+
+def get_rng() -> RandomStream:
+    """
+    Returns the active random stream.
+
+    Returns:
+        RandomStream: The active stream.
+    """
+    return _active_stream
+
+
+def set_rng(stream: RandomStream) -> RandomStream:
+    """
+    Replaces the active random stream.
+
+    Args:
+        stream (RandomStream): The new active stream.
+
+    Returns:
+        RandomStream: The previously active stream.
+    """
+    global _active_stream
+    previous, _active_stream = _active_stream, stream
+    return previous
+
+
+@contextmanager
+def use_rng(stream: Optional[RandomStream]) -> Iterator[RandomStream]:
+    """
+    Activates a random stream for the duration of a `with` block.
+
+    Args:
+        stream (Optional[RandomStream]): The stream, None keeps the active one.
+
+    Returns:
+        Iterator[RandomStream]: The stream active inside the block.
+    """
+    if stream is None:
+        yield _active_stream
+        return
+    previous = set_rng(stream)
+    try:
+        yield stream
+    finally:
+        set_rng(previous)
+
+
+def with_own_rng(method: Callable) -> Callable:
+    """
+    Decorates a method so it runs with `self.rng` as the active stream.
+
+    Args:
+        method (Callable): The method to decorate.
+
+    Returns:
+        Callable: The decorated method.
+    """
+
+    @wraps(method)
+    def _wrapper(self, *args, **kwargs):
+        with use_rng(self.rng):
+            return method(self, *args, **kwargs)
+
+    return _wrapper
@@ -0,0 +1,156 @@
+"""
+Expiry scheduling.
+
+Durations and cooldowns are counted in turns of the character they belong to.
+Instead of decrementing every one of them on each turn, an `ExpiryScheduler`
+keeps them in a min-heap keyed by the turn they expire on, so that advancing a
+turn only touches what actually expires. Cancelled items stay in the heap until
+they are popped, unless they outnumber the live ones, which compacts the heap.
+"""
+
+import heapq
+from typing import Any, Optional
+
+
+class ScheduledExpiry:
+    """Handle of an item scheduled to expire, used to query or cancel it."""
+
+    __slots__ = ("expires_at", "sequence", "item", "cancelled")
+
+    def __init__(self, expires_at: int, sequence: int, item: Any) -> None:
+        self.expires_at: int = expires_at
+        self.sequence: int = sequence
+        self.item: Any = item
+        # Set once the item is cancelled, or once it expired.
+        self.cancelled: bool = False
+
+    def __lt__(self, other: "ScheduledExpiry") -> bool:
+        # Items expiring on the same turn keep the order they were scheduled in.
+        if self.expires_at != other.expires_at:
+            return self.expires_at < other.expires_at
+        return self.sequence < other.sequence
+
+
+class ExpiryScheduler:
+    """A turn clock with a min-heap of the items expiring on future turns."""
+
+    def __init__(self) -> None:
+        """Initialize an empty scheduler, at turn 0."""
+        # Number of turns advanced so far.
+        self.now: int = 0
+        self._heap: list[ScheduledExpiry] = []
+        self._sequence: int = 0
+        # Number of cancelled entries still in the heap.
+        self._cancelled: int = 0
+
+    def schedule(self, item: Any, turns: int) -> ScheduledExpiry:
+        """
+        Schedules an item to expire after the given number of turns.
+
+        Args:
+            item (Any): The item.
+            turns (int): The number of turns the item lasts.
+
+        Returns:
+            ScheduledExpiry: The handle of the scheduled item.
+        """
+        entry = ScheduledExpiry(self.now + turns, self._sequence, item)
+        self._sequence += 1
+        heapq.heappush(self._heap, entry)
+        return entry
+
+    def remaining(self, entry: ScheduledExpiry) -> int:
+        """
+        Returns the number of turns left before an item expires.
+
+        Args:
+            entry (ScheduledExpiry): The handle of the item.
+
+        Returns:
+            int: The remaining turns.
+        """
+        return entry.expires_at - self.now
+
+    def cancel(self, entry: Optional[ScheduledExpiry]) -> None:
+        """
+        Cancels a scheduled item, which will never be returned by `advance`.
+        Cancelling an item that already expired does nothing.
+
+        Args:
+            entry (Optional[ScheduledExpiry]): The handle of the item, if any.
+        """
+        if entry is None or entry.cancelled:
+            return
+        entry.cancelled = True
+        self._cancelled += 1
+        if self._cancelled > len(self._heap) - self._cancelled:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Drops the cancelled entries from the heap."""
+        self._heap = [entry for entry in self._heap if not entry.cancelled]
+        heapq.heapify(self._heap)
+        self._cancelled = 0
+
+    def advance(self) -> list[Any]:
+        """
+        Advances the clock by one turn.
+
+        Returns:
+            list[Any]: The items expiring on the new turn, in scheduling order.
+        """
+        self.now += 1
+        expired: list[Any] = []
+        heap = self._heap
+        while heap and heap[0].expires_at <= self.now:
+            entry = heapq.heappop(heap)
+            if entry.cancelled:
+                self._cancelled -= 1
+            else:
+                # Expired entries can no longer be cancelled.
+                entry.cancelled = True
+                expired.append(entry.item)
+        return expired
+
+    def get_state(self) -> tuple[int, int, tuple[tuple[int, int, Any], ...]]:
+        """
+        Returns the state of the scheduler, to restore it with `set_state`.
+
+        Returns:
+            tuple[int, int, tuple[tuple[int, int, Any], ...]]: The clock, the
+                scheduling counter, and the (expires_at, sequence, item) of
+                each item still scheduled.
+        """
+        return (
+            self.now,
+            self._sequence,
+            tuple(
+                (entry.expires_at, entry.sequence, entry.item)
+                for entry in self._heap
+                if not entry.cancelled
+            ),
+        )
+
+    def set_state(
+        self, state: tuple[int, int, tuple[tuple[int, int, Any], ...]]
+    ) -> list[ScheduledExpiry]:
+        """
+        Restores a state returned by `get_state`, possibly with other items.
+
+        Args:
+            state (tuple[int, int, tuple[tuple[int, int, Any], ...]]): The state.
+
+        Returns:
+            list[ScheduledExpiry]: The handles of the scheduled items, in the
+                order of the state.
+        """
+        self.now, self._sequence, entries = state
+        handles = [ScheduledExpiry(*entry) for entry in entries]
+        self._heap = list(handles)
+        heapq.heapify(self._heap)
+        self._cancelled = 0
+        return handles
+
+    def __len__(self) -> int:
+        # Only the items still scheduled are counted.
+        return len(self._heap) - self._cancelled
@@ -407,7 +407,11 @@ def print_character_sheet(char: Character) -> None:
 
     # Cooldowns and uses
     active_cooldowns = {
-        name: turns for name, turns in char.cooldowns.items() if turns > 0
+        name: char.actions_module.get_cooldown_remaining(name)
+        for name in char.cooldowns
+    }
+    active_cooldowns = {
+        name: turns for name, turns in active_cooldowns.items() if turns > 0
     }
     if active_cooldowns:
         cprint(f"  [orange1]Active Cooldowns[/]:")
@@ -1,13 +1,167 @@
-import re
-import random
-import math
-from logging import debug
-from typing import Any, Optional, Callable
+from contextlib import contextmanager
+from typing import Any, Optional, Callable, Iterator
 from rich.console import Console
 from rich.rule import Rule
 from catchery import *
 
-DICE_PATTERN = re.compile(r"^(\d*)[dD](\d+)$")
+from core.dice_parser import (
+    DiceAction,
+    assume_max_individual_dice,
+    assume_min_individual_dice,
+    compile_expression,
+    roll_individual_dice,
+)
+from core.rng import RandomStream
+
+
+# ---- Output Sinks ----
+
+
+class OutputSink:
+    """Destination of the output of cprint and crule."""
+
+    # Whether the output is shown at all. Callers can check it, through
+    # is_output_enabled(), to skip building messages nobody will read.
+    enabled: bool = True
+
+    def print(self, *args, **kwargs) -> None:
+        """
+        Prints the given renderables.
+
+        Args:
+            *args: Arguments to pass to the console print function.
+            **kwargs: Keyword arguments to pass to the console print function.
+        """
+        raise NotImplementedError("Subclasses must implement the print method")
+
+    def flush(self) -> None:
+        """Writes out any pending output."""
+
+
+class ConsoleSink(OutputSink):
+    """Prints immediately on a shared rich Console."""
+
+    def __init__(self, console: Optional[Console] = None) -> None:
+        """
+        Initialize the sink.
+
+        Args:
+            console (Optional[Console]): The console to print on. Defaults to
+                a new console.
+        """
+        self.console: Console = console if console is not None else Console()
+
+    def print(self, *args, **kwargs) -> None:
+        self.console.print(*args, **kwargs)
+
+
+class BufferedSink(ConsoleSink):
+    """Collects the output and renders it on the console in one go on flush."""
+
+    def __init__(self, console: Optional[Console] = None) -> None:
+        """
+        Initialize the sink.
+
+        Args:
+            console (Optional[Console]): The console to print on. Defaults to
+                a new console.
+        """
+        super().__init__(console)
+        self.pending: list[tuple[tuple, dict]] = []
+
+    def print(self, *args, **kwargs) -> None:
+        self.pending.append((args, kwargs))
+
+    def flush(self) -> None:
+        if not self.pending:
+            return
+        pending, self.pending = self.pending, []
+        # Inside the context the console buffers everything and writes once.
+        with self.console:
+            for args, kwargs in pending:
+                self.console.print(*args, **kwargs)
+
+
+class NullSink(OutputSink):
+    """Discards all the output."""
+
+    enabled = False
+
+    def print(self, *args, **kwargs) -> None:
+        pass
+
+
+# The sink used by cprint and crule.
+_output_sink: OutputSink = ConsoleSink()
+
+
+def get_output_sink() -> OutputSink:
+    """
+    Returns the active output sink.
+
+    Returns:
+        OutputSink: The active sink.
+    """
+    return _output_sink
+
+
+def set_output_sink(sink: OutputSink) -> OutputSink:
+    """
+    Replaces the active output sink, flushing the previous one.
+
+    Args:
+        sink (OutputSink): The new sink.
+
+    Returns:
+        OutputSink: The previous sink.
+    """
+    global _output_sink
+    previous, _output_sink = _output_sink, sink
+    previous.flush()
+    return previous
+
+
+@contextmanager
+def use_output_sink(sink: OutputSink) -> Iterator[OutputSink]:
+    """
+    Activates an output sink for the duration of a `with` block.
+
+    Args:
+        sink (OutputSink): The sink.
+
+    Returns:
+        Iterator[OutputSink]: The sink active inside the block.
+    """
+    previous = set_output_sink(sink)
+    try:
+        yield sink
+    finally:
+        set_output_sink(previous)
+
+
+def suppress_output() -> Any:
+    """
+    Discards the output of cprint and crule for the duration of a `with` block.
+
+    Returns:
+        Any: The context manager.
+    """
+    return use_output_sink(NullSink())
+
+
+def is_output_enabled() -> bool:
+    """
+    Checks whether the output of cprint and crule is shown.
+
+    Returns:
+        bool: False if the output is discarded.
+    """
+    return _output_sink.enabled
+
+
+def flush_output() -> None:
+    """Writes out the output pending in the active sink."""
+    _output_sink.flush()
 
 
 def cprint(*args, **kwargs) -> None:
@@ -18,8 +172,7 @@ def cprint(*args, **kwargs) -> None:
         *args: Arguments to pass to the console print function.
         **kwargs: Keyword arguments to pass to the console print function.
     """
-    console = Console()
-    console.print(*args, **kwargs)
+    _output_sink.print(*args, **kwargs)
 
 
 def crule(*args, **kwargs) -> None:
@@ -30,8 +183,12 @@ def crule(*args, **kwargs) -> None:
         *args: Arguments to pass to the Rule constructor.
         **kwargs: Keyword arguments to pass to the Rule constructor.
     """
-    console = Console()
-    console.print(Rule(*args, **kwargs))
+    if _output_sink.enabled:
+        _output_sink.print(Rule(*args, **kwargs))
+
+
+# Console used only to render content into strings.
+_capture_console: Console = Console()
 
 
 def ccapture(content: Any) -> str:
@@ -44,9 +201,8 @@ def ccapture(content: Any) -> str:
     Returns:
         str: The captured output as a string.
     """
-    console = Console()
-    with console.capture() as capture:
-        console.print(content, markup=True, end="")
+    with _capture_console.capture() as capture:
+        _capture_console.print(content, markup=True, end="")
     return capture.get()
 
 
@@ -74,41 +230,6 @@ class Singleton(type):
         return cls._inst
 
 
-def _safe_eval(arith_expr: str) -> str:
-    """Safely evaluates a simple arithmetic expression.
-
-    DEPRECATED: This function uses eval() which is unsafe.
-    Use DiceParser from core.dice_parser instead.
-
-    Args:
-        arith_expr (str): The arithmetic expression to evaluate.
-
-    Returns:
-        str: The result of the evaluation or the original expression if an error occurs.
-    """
-
-    # TODO: Replace with DiceParser.parse_dice()
-    def _unsafe_eval() -> str:
-        """
-        Nested function to evaluate arithmetic expression.
-
-        Returns:
-            str: The string result of the evaluation.
-        """
-        # Only allow safe arithmetic evaluation
-        return str(eval(arith_expr, {"__builtins__": None}, {}))
-
-    try:
-        return _unsafe_eval()
-    except Exception as e:
-        log_warning(
-            f"Failed to evaluate expression: {arith_expr}",
-            {"expression": arith_expr},
-            e,
-        )
-        return arith_expr  # Return original on error
-
-
 # ---- Stat Modifier ----
 def get_stat_modifier(score: int) -> int:
     """
@@ -183,277 +304,35 @@ def substitute_variables(expr: str, variables: Optional[dict[str, int]] = None)
 
 
 # ---- Dice Parsing ----
-def extract_dice_terms(expr: str) -> list[str]:
-    """
-    Extracts all dice terms like '1d8', '2D6', or 'd4' from an expression.
-
-    Args:
-        expr (str): The expression to extract dice terms from.
-
-    Returns:
-        list[str]: List of dice terms found in the expression.
-    """
-    if not expr:
-        return []
-    expr = expr.upper().strip()
-    if expr == "":
-        return []
-    if expr.isdigit():
-        return []
-    return re.findall(r"\b\d*D\d+\b", expr)
-
-
-def _parse_term_and_process_dice(
-    term: str, dice_action: Callable[[int, int], list[int]]
-) -> tuple[int, list[int]]:
-    """Parses a dice term and processes the dice based on the provided action.
-
-    Args:
-        term (str): The dice term to process (e.g., '2d6').
-        dice_action (Callable[[int, int], list[int]]): A function that takes
-            (num_dice, sides) and returns a list of individual dice results.
-
-    Returns:
-        tuple[int, list[int]]: The total and individual processed rolls.
-    """
-    if not term:
-        log_error("Empty dice term provided", {"term": term})
-        return 0, []
-
-    if not isinstance(term, str):
-        log_error(
-            f"Dice term must be string, got {type(term).__name__}",
-            {"term": term},
-        )
-        return 0, []
-
-    term = term.upper().strip()
-    if term == "":
-        return 0, []
-    if term.isdigit():
-        try:
-            value = int(term)
-            if value < 0:
-                log_error(
-                    f"Negative dice value not allowed: {value}",
-                    {"term": term, "value": value},
-                )
-                return 0, []
-            return value, [value]
-        except ValueError as e:
-            log_error(
-                f"Invalid numeric dice term: {term}",
-                {"term": term},
-                e,
-            )
-            return 0, []
-
-    match = DICE_PATTERN.match(term)
-    if not match:
-        log_error(
-            f"Invalid dice string format: '{term}'",
-            {"term": term},
-        )
-        return 0, []
-
-    try:
-        num_str, sides_str = match.groups()
-        num = int(num_str) if num_str else 1
-        sides = int(sides_str)
-
-        # Validate dice parameters
-        if num <= 0:
-            log_error(
-                f"Number of dice must be positive, got {num}",
-                {"term": term, "num": num, "sides": sides},
-            )
-            return 0, []
-
-        if sides <= 0:
-            log_error(
-                f"Number of sides must be positive, got {sides}",
-                {"term": term, "num": num, "sides": sides},
-            )
-            return 0, []
-
-        if num > 100:  # Reasonable limit
-            log_error(
-                f"Too many dice requested: {num} (limit: 100)",
-                {"term": term, "num": num, "sides": sides},
-            )
-            return 0, []
-
-        if sides > 1000:  # Reasonable limit
-            log_error(
-                f"Too many sides on dice: {sides} (limit: 1000)",
-                {"term": term, "num": num, "sides": sides},
-            )
-            return 0, []
-
-        rolls = dice_action(num, sides)
-        return sum(rolls), rolls
-
-    except ValueError as e:
-        log_error(
-            f"Error parsing dice values from '{term}': {str(e)}",
-            {"term": term},
-            e,
-        )
-        return 0, []
-    except Exception as e:
-        log_error(
-            f"Unexpected error processing dice '{term}': {str(e)}",
-            {"term": term},
-            e,
-        )
-        return 0, []
-
-
-def _roll_individual_dice(num: int, sides: int) -> list[int]:
-    """
-    Helper function to roll individual dice.
-
-    Args:
-        num (int): Number of dice to roll.
-        sides (int): Number of sides on each die.
-
-    Returns:
-        list[int]: List of individual dice roll results.
-    """
-    return [random.randint(1, sides) for _ in range(num)]
-
-
-def _assume_min_individual_dice(num: int, sides: int) -> list[int]:
-    """
-    Helper function to assume min for individual dice.
-
-    Args:
-        num (int): Number of dice.
-        sides (int): Number of sides on each die.
-
-    Returns:
-        list[int]: List with minimum roll (1) for each die.
-    """
-    return [1] * num  # The minimum roll for any die is always 1
-
-
-def _assume_max_individual_dice(num: int, sides: int) -> list[int]:
-    """
-    Helper function to assume max for individual dice.
-
-    Args:
-        num (int): Number of dice.
-        sides (int): Number of sides on each die.
-
-    Returns:
-        list[int]: List with maximum roll for each die.
-    """
-    return [sides] * num
-
-
-def parse_term_and_roll_dice(term: str) -> tuple[int, list[int]]:
-    """
-    Parses a dice term and rolls the dice.
-
-    Args:
-        term (str): The dice term to parse and roll.
-
-    Returns:
-        tuple[int, list[int]]: Total roll result and list of individual rolls.
-    """
-    return _parse_term_and_process_dice(term, _roll_individual_dice)
-
-
-def parse_term_and_assume_min_dice(term: str) -> tuple[int, list[int]]:
-    """
-    Parses a dice term and assumes the minimum roll (1) for each die.
-
-    Args:
-        term (str): The dice term to parse.
-
-    Returns:
-        tuple[int, list[int]]: Total minimum result and list of minimum rolls.
-    """
-    return _parse_term_and_process_dice(term, _assume_min_individual_dice)
-
-
-def parse_term_and_assume_max_dice(term: str) -> tuple[int, list[int]]:
-    """
-    Parses a dice term and assumes the maximum roll for each die.
-
-    Args:
-        term (str): The dice term to parse.
-
-    Returns:
-        tuple[int, list[int]]: Total maximum result and list of maximum rolls.
-    """
-    return _parse_term_and_process_dice(term, _assume_max_individual_dice)
-
-
-def roll_dice(term: str) -> int:
-    """
-    Rolls a dice term and returns the total.
-
-    Args:
-        term (str): The dice term to roll.
-
-    Returns:
-        int: The total result of the dice roll.
-    """
-    if not term:
-        return 0
-    term = term.upper().strip()
-    if term == "":
-        return 0
-    if term.isdigit():
-        return int(term)
-    total, _ = parse_term_and_roll_dice(term)
-    return total
-
-
-def _process_dice_expression(
-    expr: str, term_processor: Callable[[str], tuple[int, list[int]]]
+def _evaluate_compiled(
+    expr: str,
+    variables: Optional[dict[str, int]],
+    dice_action: DiceAction,
+    context: str,
 ) -> int:
-    """Processes a dice expression by replacing dice terms with their processed values.
+    """Compiles (or fetches from the cache) and evaluates a dice expression.
 
     Args:
-        expr (str): The dice expression to process.
-        term_processor (Callable[[str], tuple[int, list[int]]]): A function
-            that takes a dice term and returns its total and individual rolls.
+        expr (str): The dice expression to evaluate.
+        variables (Optional[dict[str, int]]): Variables used by the expression.
+        dice_action (DiceAction): Function used to resolve dice terms.
+        context (str): Context reported if the evaluation fails.
 
     Returns:
-        int: The total result of the processed dice expression.
+        int: The result of the expression, or 0 if it is invalid.
     """
     if not expr:
         return 0
-    expr = expr.upper().strip()
-    if expr == "":
-        return 0
-    if expr.isdigit():
-        return int(expr)
-
-    dice_terms = extract_dice_terms(expr)
-    processed_expr = expr
-
-    for term in dice_terms:
-        total, _ = term_processor(term)
-        # Use re.sub to replace only the first occurrence of the term to avoid issues
-        # if the same term appears multiple times and is meant to represent distinct rolls.
-        processed_expr = re.sub(
-            r"\b" + re.escape(term) + r"\b", str(total), processed_expr, count=1
-        )
-        debug(f"Processed {term} → {total} ({processed_expr})")
-
-    # Now evaluate the processed expression safely.
     try:
-        return int(eval(processed_expr, {"__builtins__": None}, math.__dict__))
+        return compile_expression(expr).evaluate(variables, dice_action)
     except Exception as e:
         log_warning(
-            f"Failed to evaluate '{processed_expr}': {e}",
+            f"Failed to evaluate '{expr}': {e}",
             {
-                "expression": processed_expr,
+                "expression": expr,
+                "variables": variables or {},
                 "error": str(e),
-                "context": "dice_expression_evaluation",
+                "context": context,
             },
         )
         return 0
@@ -469,57 +348,110 @@ def roll_dice_expression(expr: str) -> int:
     Returns:
         int: The total result of the dice expression.
     """
-    return _process_dice_expression(expr, parse_term_and_roll_dice)
+    return _evaluate_compiled(
+        expr, None, roll_individual_dice, "dice_expression_evaluation"
+    )
 
 
-def parse_expr_and_assume_min_roll(expr: str) -> int:
+def parse_expr_and_assume_min_roll(
+    expr: str, variables: Optional[dict[str, int]] = None
+) -> int:
     """
     Assumes the minimum roll (1) for all dice terms in the expression.
 
     Args:
         expr (str): The dice expression to process.
+        variables (Optional[dict[str, int]]): Variables used by the expression.
 
     Returns:
         int: The minimum possible result for the expression.
     """
-    return _process_dice_expression(expr, parse_term_and_assume_min_dice)
+    return _evaluate_compiled(
+        expr, variables, assume_min_individual_dice, "dice_expression_minimum"
+    )
 
 
-def parse_expr_and_assume_max_roll(expr: str) -> int:
+def parse_expr_and_assume_max_roll(
+    expr: str, variables: Optional[dict[str, int]] = None
+) -> int:
     """
     Assumes the maximum roll for all dice terms in the expression.
 
     Args:
         expr (str): The dice expression to process.
+        variables (Optional[dict[str, int]]): Variables used by the expression.
 
     Returns:
         int: The maximum possible result for the expression.
     """
-    return _process_dice_expression(expr, parse_term_and_assume_max_dice)
+    return _evaluate_compiled(
+        expr, variables, assume_max_individual_dice, "dice_expression_maximum"
+    )
 
 
 # ---- Public API ----
-def roll_expression(expr: str, variables: Optional[dict[str, int]] = None) -> int:
+def roll_expression(
+    expr: str,
+    variables: Optional[dict[str, int]] = None,
+    rng: Optional[RandomStream] = None,
+) -> int:
     """
     Rolls a dice expression with variable substitution.
 
     Args:
         expr (str): The dice expression to roll.
         variables (Optional[dict[str, int]]): Variables to substitute in the expression.
+        rng (Optional[RandomStream]): Stream used to roll the dice. Defaults to
+            the active stream.
 
     Returns:
         int: The total result of the roll.
     """
-    if not expr:
-        return 0
-    expr = expr.upper().strip()
-    if expr == "":
-        return 0
-    if expr.isdigit():
-        return int(expr)
-    substituted = substitute_variables(expr, variables)
-    debug(f"Substituted expression: {substituted}")
-    return roll_dice_expression(substituted)
+    return _evaluate_compiled(
+        expr,
+        variables,
+        rng.roll if rng else roll_individual_dice,
+        "dice_expression_evaluation",
+    )
+
+
+def roll_expression_batch(
+    expr: str,
+    variables: Optional[dict[str, int]] = None,
+    n: int = 1,
+    rng: Any = None,
+) -> Any:
+    """
+    Rolls a dice expression `n` times with vectorized NumPy draws.
+
+    Args:
+        expr (str): The dice expression to roll.
+        variables (Optional[dict[str, int]]): Variables to substitute in the expression.
+        n (int): The number of independent rolls. Defaults to 1.
+        rng (Optional[numpy.random.Generator | RandomStream]): The generator
+            used to draw the dice. Defaults to one derived from the active stream.
+
+    Returns:
+        numpy.ndarray: Integer array with the `n` results. Invalid expressions
+            yield an array of zeros.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    try:
+        compiled = compile_expression(expr) if expr else compile_expression("0")
+    except ValueError as e:
+        log_warning(
+            f"Failed to evaluate '{expr}': {e}",
+            {
+                "expression": expr,
+                "variables": variables or {},
+                "error": str(e),
+                "context": "dice_expression_batch_evaluation",
+            },
+        )
+        compiled = compile_expression("0")
+    return compiled.roll_batch(n, variables, rng)
 
 
 def get_max_roll(expr: str, variables: Optional[dict[str, int]] = None) -> int:
@@ -533,62 +465,46 @@ def get_max_roll(expr: str, variables: Optional[dict[str, int]] = None) -> int:
     Returns:
         int: The maximum possible result.
     """
-    if not expr:
-        return 0
-    expr = expr.upper().strip()
-    if expr == "":
-        return 0
-    if expr.isdigit():
-        return int(expr)
-    substituted = substitute_variables(expr, variables)
-    debug(f"Substituted expression for max roll: {substituted}")
-    return parse_expr_and_assume_max_roll(substituted)
+    return parse_expr_and_assume_max_roll(expr, variables)
 
 
 def roll_and_describe(
-    expr: str, variables: Optional[dict[str, int]] = None
+    expr: str,
+    variables: Optional[dict[str, int]] = None,
+    rng: Optional[RandomStream] = None,
 ) -> tuple[int, str, list[int]]:
     """Rolls a dice expression and returns the total, a description, and the individual rolls.
 
     Args:
         expr (str): The dice expression to roll.
-        entity (Optional[Any], optional): The entity rolling the dice. Defaults to None.
-        mind (Optional[int], optional): The mind level to use for the roll. Defaults to 1.
+        variables (Optional[dict[str, int]]): Variables to substitute in the expression.
+        rng (Optional[RandomStream]): Stream used to roll the dice. Defaults to
+            the active stream.
 
     Returns:
         tuple[int, str, list[int]]: The total roll, a description of the roll, and the individual rolls.
     """
     if not expr:
         return 0, "", []
-    expr = expr.upper().strip()
-    if expr == "":
-        return 0, "", []
-    if expr.isdigit():
-        return int(expr), f"{expr} = {expr}", []
-    original_expr = expr
-    substituted = substitute_variables(expr, variables)
-    dice_terms = extract_dice_terms(substituted)
-    dice_rolls: list[int] = []
-    breakdown = substituted
-    for term in dice_terms:
-        total, _ = parse_term_and_roll_dice(term)
-        breakdown = breakdown.replace(term, str(total), 1)
-        dice_rolls.append(total)
     try:
-        result = int(eval(breakdown, {"__builtins__": None}, math.__dict__))
-        comment = f"{substituted} → {breakdown}"
-        return result, comment, dice_rolls
+        compiled = compile_expression(expr)
+        if not compiled.has_dice and not compiled.has_variables:
+            value = compiled.evaluate()
+            return value, f"{value} = {value}", []
+        return compiled.describe(
+            variables, rng.roll if rng else roll_individual_dice
+        )
     except Exception as e:
         log_warning(
-            f"Failed to evaluate '{breakdown}': {e}",
+            f"Failed to evaluate '{expr}': {e}",
             {
-                "breakdown": breakdown,
-                "original_expr": original_expr,
+                "original_expr": expr,
+                "variables": variables or {},
                 "error": str(e),
                 "context": "dice_breakdown_evaluation",
             },
         )
-        return 0, f"{original_expr} = ERROR", []
+        return 0, f"{expr.upper().strip()} = ERROR", []
 
 
 def evaluate_expression(expr: str, variables: Optional[dict[str, int]] = None) -> int:
@@ -602,28 +518,9 @@ def evaluate_expression(expr: str, variables: Optional[dict[str, int]] = None) -
     Returns:
         int: The result of the expression evaluation.
     """
-    if not expr:
-        return 0
-    expr = expr.upper().strip()
-    if expr == "":
-        return 0
-    if expr.isdigit():
-        return int(expr)
-    substituted = substitute_variables(expr, variables)
-    try:
-        return int(eval(substituted, {"__builtins__": None}, math.__dict__))
-    except Exception as e:
-        log_warning(
-            f"Failed to evaluate '{substituted}': {e}",
-            {
-                "expression": substituted,
-                "original": expr,
-                "variables": variables or {},
-                "error": str(e),
-                "context": "variable_expression_evaluation",
-            },
-        )
-        return 0
+    return _evaluate_compiled(
+        expr, variables, roll_individual_dice, "variable_expression_evaluation"
+    )
 
 
 def simplify_expression(expr: str, variables: Optional[dict[str, int]] = None) -> str:
@@ -639,13 +536,14 @@ def simplify_expression(expr: str, variables: Optional[dict[str, int]] = None) -
     """
     if not expr:
         return ""
-    # Step 1: Substitute variables
-    substituted = substitute_variables(expr, variables)
-    # Step 2: Evaluate entire expression safely.
-    substituted = re.sub(
-        r"\b(\d+\s*[\+\-\*\/]\s*\d+)\b", lambda m: _safe_eval(m.group(0)), substituted
-    )
-    return substituted
+    try:
+        return compile_expression(expr).substitute(variables)
+    except ValueError as e:
+        log_warning(
+            f"Failed to simplify '{expr}': {e}",
+            {"expression": expr, "variables": variables or {}, "error": str(e)},
+        )
+        return substitute_variables(expr, variables)
 
 
 def make_bar(current: int, maximum: int, length: int = 10, color: str = "white") -> str:
@@ -1,13 +1,8 @@
 from typing import Any, Optional
 
-from core.constants import (
-    get_effect_emoji,
-    apply_character_type_color,
-    apply_damage_type_color,
-    get_damage_type_emoji,
-)
-from core.utils import cprint, roll_and_describe
+from core.utils import roll_and_describe, roll_expression
 from combat.damage import DamageComponent
+from combat.events import CombatEvent, CombatEventType, emit_event, wants_event
 
 from .base_effect import Effect
 
@@ -43,35 +38,40 @@ class DamageOverTimeEffect(Effect):
             target (Any): The character receiving the damage.
             mind_level (Optional[int]): The mind level for damage calculation. Defaults to 1.
         """
-        variables = actor.get_expression_variables()
-        variables["MIND"] = mind_level
-        # Calculate the damage amount using the provided expression.
-        dot_value, dot_desc, _ = roll_and_describe(self.damage.damage_roll, variables)
+        variables = actor.get_expression_variables(mind_level)
+        # Calculate the damage amount using the provided expression, describing
+        # the roll only if someone is going to read the description.
+        detailed = wants_event(CombatEventType.DAMAGE)
+        if detailed:
+            dot_value, dot_desc, _ = roll_and_describe(
+                self.damage.damage_roll, variables
+            )
+        else:
+            dot_value = roll_expression(self.damage.damage_roll, variables)
+            dot_desc = ""
         # Asser that the damage value is a positive integer.
         assert (
             isinstance(dot_value, int) and dot_value >= 0
         ), f"DamageOverTimeEffect '{self.name}' must have a non-negative integer damage value, got {dot_value}."
         # Apply the damage to the target.
-        base, adjusted, taken = target.take_damage(dot_value, self.damage.damage_type)
-        # If the damage value is positive, print the damage message.
-        dot_str = f"    {get_effect_emoji(self)} "
-        dot_str += apply_character_type_color(target.char_type, target.name) + " takes "
-        # Create a damage string for display.
-        dot_str += apply_damage_type_color(
-            self.damage.damage_type,
-            f"{taken} {get_damage_type_emoji(self.damage.damage_type)} ",
+        base, adjusted, taken = target.take_damage(
+            dot_value, self.damage.damage_type, actor
         )
-        # If the base damage differs from the adjusted damage (due to resistances),
-        # include the original and adjusted values in the damage string.
-        if base != adjusted:
-            dot_str += f"[dim](reduced: {base} → {adjusted})[/] "
-        # Append the rolled damage expression to the damage string.
-        dot_str += f"({dot_desc})"
-        # Add the damage string to the list of damage details.
-        cprint(dot_str)
-        # If the target is defeated, print a message.
-        if not target.is_alive():
-            cprint(f"    [bold red]{target.name} has been defeated![/]")
+        if detailed:
+            emit_event(
+                CombatEvent(
+                    CombatEventType.DAMAGE,
+                    actor=actor,
+                    target=target,
+                    effect=self,
+                    damage_type=self.damage.damage_type,
+                    base=base,
+                    adjusted=adjusted,
+                    amount=taken,
+                    description=dot_desc,
+                    defeated=not target.is_alive(),
+                )
+            )
 
     def validate(self) -> None:
         """
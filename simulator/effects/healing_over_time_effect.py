@@ -1,7 +1,7 @@
 from typing import Any, Optional
 
-from core.constants import get_effect_emoji, apply_character_type_color, apply_effect_color
-from core.utils import cprint, roll_and_describe
+from core.utils import roll_and_describe, roll_expression
+from combat.events import CombatEvent, CombatEventType, emit_event, wants_event
 
 from .base_effect import Effect
 
@@ -37,22 +37,33 @@ class HealingOverTimeEffect(Effect):
             target (Any): The character receiving the healing.
             mind_level (Optional[int]): The mind level for healing calculation. Defaults to 1.
         """
-        variables = actor.get_expression_variables()
-        variables["MIND"] = mind_level
-        # Calculate the heal amount using the provided expression.
-        hot_value, hot_desc, _ = roll_and_describe(self.heal_per_turn, variables)
+        variables = actor.get_expression_variables(mind_level)
+        # Calculate the heal amount using the provided expression, describing
+        # the roll only if someone is going to read the description.
+        detailed = wants_event(CombatEventType.HEAL)
+        if detailed:
+            hot_value, hot_desc, _ = roll_and_describe(self.heal_per_turn, variables)
+        else:
+            hot_value = roll_expression(self.heal_per_turn, variables)
+            hot_desc = ""
         # Assert that the heal value is a positive integer.
         assert (
             isinstance(hot_value, int) and hot_value >= 0
         ), f"HealingOverTimeEffect '{self.name}' must have a non-negative integer heal value, got {hot_value}."
-        # Apply the heal to the target.
-        hot_value = target.heal(hot_value)
-        # If the heal value is positive, print the heal message.
-        message = f"    {get_effect_emoji(self)} "
-        message += apply_character_type_color(target.action_type, target.name)
-        message += f" heals for {hot_value} ([white]{hot_desc}[/]) hp from "
-        message += apply_effect_color(self, self.name) + "."
-        cprint(message)
+        # Apply the heal to the target, and report it if anything was healed.
+        healed = target.heal(hot_value)
+        if detailed and healed > 0:
+            emit_event(
+                CombatEvent(
+                    CombatEventType.HEAL,
+                    actor=actor,
+                    target=target,
+                    effect=self,
+                    base=hot_value,
+                    amount=healed,
+                    description=hot_desc,
+                )
+            )
 
     def validate(self) -> None:
         """
@@ -307,6 +307,33 @@ class TriggerEffect(Effect):
         if self.cooldown_remaining > 0:
             self.cooldown_remaining -= 1
 
+    def get_state(self) -> tuple[int, int, bool]:
+        """
+        Returns the runtime state of the trigger, to restore it with `set_state`.
+
+        Returns:
+            tuple[int, int, bool]: The triggers used, the remaining cooldown,
+                and whether the trigger activated this turn.
+        """
+        return (
+            self.triggers_used,
+            self.cooldown_remaining,
+            self.has_triggered_this_turn,
+        )
+
+    def set_state(self, state: tuple[int, int, bool]) -> None:
+        """
+        Restores a runtime state returned by `get_state`.
+
+        Args:
+            state (tuple[int, int, bool]): The state.
+        """
+        (
+            self.triggers_used,
+            self.cooldown_remaining,
+            self.has_triggered_this_turn,
+        ) = state
+
     def get_status_text(self) -> str:
         """
         Get a human-readable status of the trigger effect.
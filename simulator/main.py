@@ -1,6 +1,5 @@
 import logging
 from collections import Counter
-from copy import deepcopy
 from pathlib import Path
 
 from combat.combat_manager import CombatManager
@@ -107,7 +106,8 @@ def add_to_list(from_group: dict[str, Character], to_list: list[Character], name
     """
     Add a character from a source group to a destination list for combat.
     
-    Creates a deep copy of the character to avoid modifying the original data.
+    Spawns a new instance of the character, so the loaded template is never
+    modified.
     Logs a warning if the character name is not found in the source group.
     
     Args:
@@ -116,7 +116,7 @@ def add_to_list(from_group: dict[str, Character], to_list: list[Character], name
         name (str): Name of the character to add from the source group.
     """
     if name in from_group:
-        to_list.append(deepcopy(from_group[name]))
+        to_list.append(from_group[name].spawn())
     else:
         log_warning(
             f"Opponent '{name}' not found in enemies data",
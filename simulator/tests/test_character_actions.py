@@ -0,0 +1,120 @@
+"""Tests of the cache of the available actions of a character."""
+
+from character import Character
+from character.character_actions import CharacterActions
+from core.constants import ActionType
+from core.utils import suppress_output
+
+# Getters whose results are cached.
+GETTERS = (
+    "get_available_natural_weapon_attacks",
+    "get_available_weapon_attacks",
+    "get_available_actions",
+    "get_available_spells",
+    "turn_done",
+)
+
+
+def available(actions: CharacterActions) -> dict[str, object]:
+    """Returns the result of every cached getter, checking that the cached
+    results match the ones computed from scratch."""
+    cached = {name: getattr(actions, name)() for name in GETTERS}
+    actions.invalidate()
+    fresh = {name: getattr(actions, name)() for name in GETTERS}
+    assert cached == fresh
+    return fresh
+
+
+def names(actions: list) -> set[str]:
+    return {action.name for action in actions}
+
+
+def test_turn_flags(player: Character) -> None:
+    character = player.spawn()
+    actions = character.actions_module
+    assert available(actions)["get_available_spells"]
+
+    actions.use_action_type(ActionType.STANDARD)
+    state = available(actions)
+    assert not any(
+        spell.action_type == ActionType.STANDARD for spell in state["get_available_spells"]
+    )
+
+    actions.use_action_type(ActionType.BONUS)
+    state = available(actions)
+    assert state["turn_done"]
+    assert not state["get_available_spells"]
+
+    actions.reset_turn_flags()
+    state = available(actions)
+    assert not state["turn_done"]
+    assert state["get_available_spells"]
+
+
+def test_cooldown_start_and_end(enemies: dict[str, Character]) -> None:
+    dragon = enemies["Infant Dragon"].spawn()
+    actions = dragon.actions_module
+    breath = dragon.actions["fire breath"]
+    assert breath.name in names(available(actions)["get_available_actions"])
+
+    actions.add_cooldown(breath)
+    assert breath.name not in names(available(actions)["get_available_actions"])
+
+    with suppress_output():
+        for _ in range(breath.get_cooldown()):
+            assert breath.name not in names(available(actions)["get_available_actions"])
+            actions.turn_update()
+    assert not actions.is_on_cooldown(breath)
+    assert breath.name in names(available(actions)["get_available_actions"])
+
+
+def test_incapacitation(enemies: dict[str, Character], player: Character) -> None:
+    moth = enemies["Purple Moth"].spawn()
+    character = player.spawn()
+    actions = character.actions_module
+    assert available(actions)["get_available_spells"]
+
+    sleep = moth.spells["sleep powder"].effect
+    with suppress_output():
+        assert character.effects_module.add_effect(moth, sleep, 1)
+    assert character.is_incapacitated()
+    state = available(actions)
+    assert not state["get_available_spells"]
+    assert not state["get_available_actions"]
+
+    with suppress_output():
+        for active in list(character.effects_module.active_effects):
+            character.effects_module.remove_effect(active)
+    assert not character.is_incapacitated()
+    assert available(actions)["get_available_spells"]
+
+
+def test_learn_and_unlearn(player: Character, enemies: dict[str, Character]) -> None:
+    character = player.spawn()
+    actions = character.actions_module
+    spell = next(iter(character.spells.values()))
+    assert spell.name in names(available(actions)["get_available_spells"])
+
+    actions.unlearn_spell(spell)
+    assert spell.name not in names(available(actions)["get_available_spells"])
+    actions.learn_spell(spell)
+    assert spell.name in names(available(actions)["get_available_spells"])
+
+    breath = enemies["Infant Dragon"].actions["fire breath"]
+    actions.learn_action(breath)
+    assert breath.name in names(available(actions)["get_available_actions"])
+    actions.unlearn_action(breath)
+    assert breath.name not in names(available(actions)["get_available_actions"])
+
+
+def test_mind_changes(player: Character) -> None:
+    character = player.spawn()
+    actions = character.actions_module
+    assert available(actions)["get_available_spells"]
+    character.mind = 0
+    costly = [
+        spell
+        for spell in available(actions)["get_available_spells"]
+        if spell.mind_cost and spell.mind_cost[0] > 0
+    ]
+    assert not costly
@@ -0,0 +1,64 @@
+"""Tests of the modifier table of the effects module."""
+
+from character import Character
+from core.constants import BonusType
+from core.utils import suppress_output
+from effects.base_effect import Modifier
+from effects.modifier_effect import BuffEffect
+
+
+def _buff(name: str, duration: int, attack: str, ac: int) -> BuffEffect:
+    return BuffEffect(
+        name,
+        "A test buff.",
+        duration,
+        [Modifier(BonusType.ATTACK, attack), Modifier(BonusType.AC, str(ac))],
+    )
+
+
+def test_modifier_table_follows_added_and_removed_effects(
+    player: Character,
+) -> None:
+    character = player.spawn()
+    effects = character.effects_module
+    assert effects.get_modifier(BonusType.ATTACK) == []
+    assert effects.get_modifier(BonusType.AC) == 0
+
+    weak, strong = _buff("Weak", 5, "1D4", 1), _buff("Strong", 5, "1D8", 3)
+    with suppress_output():
+        assert effects.add_effect(character, weak, 1)
+        assert effects.get_modifier(BonusType.ATTACK) == ["1D4"]
+        assert effects.get_modifier(BonusType.AC) == 1
+        # A stronger effect replaces the weaker one, not the other way around.
+        assert effects.add_effect(character, strong, 1)
+        assert not effects.add_effect(character, weak, 1)
+    assert effects.get_modifier(BonusType.ATTACK) == ["1D8"]
+    assert effects.get_modifier(BonusType.AC) == 3
+
+    with suppress_output():
+        effects.remove_effect(effects.active_modifiers[BonusType.AC])
+    assert effects.get_modifier(BonusType.ATTACK) == []
+    assert effects.get_modifier(BonusType.AC) == 0
+
+
+def test_modifier_table_follows_expiry(player: Character) -> None:
+    character = player.spawn()
+    effects = character.effects_module
+    with suppress_output():
+        effects.add_effect(character, _buff("Buff", 2, "1D6", 2), 1)
+        effects.turn_update()
+        assert effects.get_modifier(BonusType.AC) == 2
+        assert effects.get_modifier(BonusType.ATTACK) == ["1D6"]
+        effects.turn_update()
+    assert effects.get_modifier(BonusType.AC) == 0
+    assert effects.get_modifier(BonusType.ATTACK) == []
+    assert not effects.active_modifiers
+
+
+def test_modifier_lists_are_copies(player: Character) -> None:
+    character = player.spawn()
+    effects = character.effects_module
+    with suppress_output():
+        effects.add_effect(character, _buff("Buff", 5, "1D4", 1), 1)
+    effects.get_modifier(BonusType.ATTACK).append("1D20")
+    assert effects.get_modifier(BonusType.ATTACK) == ["1D4"]
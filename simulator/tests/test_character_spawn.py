@@ -0,0 +1,52 @@
+"""Tests of the combat instances spawned from character templates."""
+
+from character import Character
+from core.utils import suppress_output
+
+
+def test_spawn_shares_content_and_owns_state(enemies: dict[str, Character]) -> None:
+    template = enemies["Infant Dragon"]
+    instance = template.spawn()
+    assert instance is not template
+    assert instance.stats is template.stats
+    assert instance.actions == template.actions
+    assert instance.actions is not template.actions
+    assert instance.hp == instance.HP_MAX == template.HP_MAX
+    assert instance.effects_module is not template.effects_module
+    assert instance.actions_module is not template.actions_module
+
+    instance.hp -= 5
+    instance.cooldowns["fire breath"] = 3
+    assert template.hp == template.HP_MAX
+    assert "fire breath" not in template.cooldowns
+
+
+def test_spawn_copies_passive_effects(enemies: dict[str, Character]) -> None:
+    template = enemies["Minotaur Boss"]
+    first, second = template.spawn(), template.spawn()
+    for passive in template.passive_effects:
+        assert all(effect is not passive for effect in first.passive_effects)
+    assert all(
+        a is not b for a, b in zip(first.passive_effects, second.passive_effects)
+    )
+    assert [e.name for e in first.passive_effects] == [
+        e.name for e in template.passive_effects
+    ]
+
+
+def test_trigger_counters_are_not_shared(
+    player: Character, allies: dict[str, Character]
+) -> None:
+    templates = [player] + list(allies.values())
+    owner = next(c for c in templates if "divine smite" in c.spells)
+    effect = owner.spells["divine smite"].effect
+    first, second = owner.spawn(), owner.spawn()
+    with suppress_output():
+        first.effects_module.add_effect(first, effect, 1)
+        active = first.effects_module.active_effects[-1]
+        active.effect.activate_trigger(
+            first, {"event_type": "on_hit", "target": second, "mind_level": 1}
+        )
+    assert active.effect is not effect
+    assert active.effect.triggers_used == 1
+    assert effect.triggers_used == 0
@@ -0,0 +1,69 @@
+"""Tests of the cached derived stats of the characters."""
+
+from character import Character
+from core.constants import BonusType
+from core.utils import suppress_output
+from effects.base_effect import Modifier
+from effects.modifier_effect import BuffEffect
+
+
+def test_equipment_changes_invalidate_the_stats(player: Character) -> None:
+    character = player.spawn()
+    stats = character.stats_module
+    ac, version = character.AC, stats.version
+    assert character.AC == ac
+    assert stats.version == version
+
+    armor = character.equipped_armor[0]
+    with suppress_output():
+        assert character.inventory_module.remove_armor(armor)
+    assert stats.version > version
+    assert character.AC < ac
+    with suppress_output():
+        assert character.inventory_module.add_armor(armor)
+    assert character.AC == ac
+    # The template keeps its own equipment.
+    assert armor in player.equipped_armor
+
+
+def test_effect_changes_invalidate_the_stats(player: Character) -> None:
+    character = player.spawn()
+    ac, hp_max = character.AC, character.HP_MAX
+    buff = BuffEffect(
+        "Fortify",
+        "A test buff.",
+        2,
+        [Modifier(BonusType.AC, "2"), Modifier(BonusType.HP, "10")],
+    )
+    with suppress_output():
+        assert character.effects_module.add_effect(character, buff, 1)
+    assert character.AC == ac + 2
+    assert character.HP_MAX == hp_max + 10
+    with suppress_output():
+        character.effects_module.turn_update()
+        character.effects_module.turn_update()
+    # The effect expired.
+    assert character.AC == ac
+    assert character.HP_MAX == hp_max
+
+
+def test_expression_variables_follow_the_ability_scores(player: Character) -> None:
+    character = player.spawn()
+    stats = character.stats_module
+    variables = character.get_expression_variables()
+    assert character.get_expression_variables() is variables
+    assert variables["STR"] == stats.STR
+    assert character.get_expression_variables(2)["MIND"] == 2
+    assert "MIND" not in variables
+
+    # Equipment and effects do not change the ability scores.
+    stats.invalidate(abilities=False)
+    assert character.get_expression_variables() is variables
+
+    # The stats are shared with the template, so they are replaced, not edited.
+    character.stats = {**character.stats, "strength": character.stats["strength"] + 4}
+    stats.invalidate()
+    updated = character.get_expression_variables()
+    assert updated is not variables
+    assert updated["STR"] == variables["STR"] + 2
+    assert player.get_expression_variables()["STR"] == variables["STR"]
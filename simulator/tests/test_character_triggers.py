@@ -0,0 +1,107 @@
+"""Tests of the trigger and incapacitation indexes of the effects module."""
+
+from character import Character
+from core.constants import DamageType
+from core.utils import suppress_output
+from effects.incapacitating_effect import IncapacitatingEffect
+from effects.trigger_effect import TriggerCondition, TriggerEffect, TriggerType
+
+
+def _trigger(
+    trigger_type: TriggerType,
+    duration: int | None = None,
+    threshold: float | None = None,
+) -> TriggerEffect:
+    return TriggerEffect(
+        trigger_type.value,
+        "A test trigger.",
+        duration,
+        TriggerCondition(trigger_type, threshold=threshold),
+        [],
+        consumes_on_trigger=False,
+    )
+
+
+def test_trigger_index_follows_added_removed_and_expired_effects(
+    player: Character,
+) -> None:
+    character = player.spawn()
+    effects = character.effects_module
+    assert effects.get_triggers(TriggerType.ON_KILL) == []
+    assert effects.count_triggers(TriggerType.ON_KILL) == 0
+
+    with suppress_output():
+        effects.add_effect(character, _trigger(TriggerType.ON_KILL), 1)
+        effects.add_effect(character, _trigger(TriggerType.ON_KILL, duration=1), 1)
+        effects.add_effect(character, _trigger(TriggerType.ON_HEAL), 1)
+        effects.add_passive_effect(_trigger(TriggerType.ON_KILL))
+    on_kill = effects.get_triggers(TriggerType.ON_KILL)
+    assert [ae.effect.duration for ae in on_kill] == [None, 1]
+    assert effects.count_triggers(TriggerType.ON_KILL) == 3
+    assert effects.count_triggers(TriggerType.ON_HEAL) == 1
+    assert len(effects.get_passive_triggers(TriggerType.ON_KILL)) == 1
+
+    # The returned list is a copy.
+    on_kill.clear()
+    assert len(effects.get_triggers(TriggerType.ON_KILL)) == 2
+
+    with suppress_output():
+        effects.turn_update()
+    assert [ae.effect.duration for ae in effects.get_triggers(TriggerType.ON_KILL)] == [
+        None
+    ]
+    with suppress_output():
+        effects.remove_effect(effects.get_triggers(TriggerType.ON_HEAL)[0])
+    assert effects.get_triggers(TriggerType.ON_HEAL) == []
+    assert effects.count_triggers(TriggerType.ON_KILL) == 2
+
+
+def test_health_triggers_activate_when_their_threshold_is_crossed(
+    player: Character,
+) -> None:
+    character = player.spawn()
+    low = _trigger(TriggerType.ON_LOW_HEALTH, threshold=0.5)
+    high = _trigger(TriggerType.ON_HIGH_HEALTH, threshold=0.75)
+    character.add_passive_effect(low)
+    character.add_passive_effect(high)
+    hp_max = character.HP_MAX
+    half = hp_max // 2
+
+    with suppress_output():
+        # Damage above the threshold does not activate the trigger.
+        character.take_damage(hp_max - half - 1, DamageType.SLASHING)
+        assert character.hp > half
+        assert low.triggers_used == 0
+        character.take_damage(1, DamageType.SLASHING)
+        assert low.triggers_used == 1
+        # Staying below the threshold does not activate it again.
+        character.take_damage(1, DamageType.SLASHING)
+        assert low.triggers_used == 1
+
+        # Healing above the threshold activates the other trigger, and the
+        # next drop activates the low health trigger again.
+        character.heal(hp_max)
+        assert high.triggers_used == 1
+        character.take_damage(hp_max - half, DamageType.SLASHING)
+        assert low.triggers_used == 2
+        assert high.triggers_used == 1
+
+
+def test_incapacitation_follows_added_removed_and_expired_effects(
+    player: Character,
+) -> None:
+    character = player.spawn()
+    effects = character.effects_module
+    assert not character.is_incapacitated()
+
+    with suppress_output():
+        effects.add_effect(character, IncapacitatingEffect("Sleep", "", 1, "sleep"), 1)
+        effects.add_effect(character, IncapacitatingEffect("Stun", "", 3, "stunned"), 1)
+        # A new effect of the same type replaces the old one.
+        effects.add_effect(character, IncapacitatingEffect("Sleep", "", 1, "sleep"), 1)
+        assert character.is_incapacitated()
+        effects.turn_update()
+        assert [ae.effect.name for ae in effects.active_effects] == ["Stun"]
+        assert character.is_incapacitated()
+        effects.remove_effect(effects.active_effects[0])
+    assert not character.is_incapacitated()
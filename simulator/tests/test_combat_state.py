@@ -0,0 +1,97 @@
+"""Tests of the snapshots, restores and forks of a combat."""
+
+from typing import Any
+
+import pytest
+
+from character import Character
+from combat.combat_manager import CombatManager
+from combat.simulation import npc_policy
+from core.rng import RandomStream
+from core.utils import suppress_output
+
+ENEMIES = ("Purple Moth", "Hobgoblin", "Poison Jelly")
+
+
+def state(combat: CombatManager) -> Any:
+    """Returns what the turns of a combat change, to compare two runs."""
+    return combat.turn_number, [
+        (
+            participant.name,
+            participant.hp,
+            participant.mind,
+            dict(participant.cooldowns),
+            dict(participant.uses),
+            sorted(
+                (active.effect.name, active.duration)
+                for active in participant.effects_module.active_effects
+            ),
+        )
+        for participant in combat.participants
+    ]
+
+
+def run(combat: CombatManager, turns: int) -> list[Any]:
+    """Runs some turns of a combat and returns the state after each one."""
+    states = []
+    with suppress_output():
+        for _ in range(turns):
+            if combat.is_combat_over():
+                break
+            combat.run_turn()
+            states.append(state(combat))
+    return states
+
+
+def make_combat(
+    seed: int,
+    player: Character,
+    enemies: dict[str, Character],
+    allies: dict[str, Character],
+) -> CombatManager:
+    combat = CombatManager(
+        player.spawn(),
+        [enemies[name].spawn() for name in ENEMIES],
+        [allies["Naerin"].spawn()],
+        rng=RandomStream(seed),
+        player_policy=npc_policy,
+    )
+    with suppress_output():
+        combat.initialize()
+    return combat
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_restore_replays_the_same_turns(
+    seed: int,
+    player: Character,
+    enemies: dict[str, Character],
+    allies: dict[str, Character],
+) -> None:
+    combat = make_combat(seed, player, enemies, allies)
+    run(combat, 2)
+    snapshot = combat.snapshot()
+    before = state(combat)
+    first = run(combat, 4)
+
+    combat.restore(snapshot)
+    assert state(combat) == before
+    assert run(combat, 4) == first
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_fork_leaves_the_combat_untouched(
+    seed: int,
+    player: Character,
+    enemies: dict[str, Character],
+    allies: dict[str, Character],
+) -> None:
+    reference = make_combat(seed, player, enemies, allies)
+    run(reference, 2)
+    expected = run(reference, 4)
+
+    combat = make_combat(seed, player, enemies, allies)
+    run(combat, 2)
+    fork = combat.fork(RandomStream(seed + 100))
+    run(fork, 4)
+    assert run(combat, 4) == expected
@@ -0,0 +1,82 @@
+"""Tests of the alive indexes and the legal target cache of a combat."""
+
+from actions.abilities import HealingAbility
+from character import Character
+from combat.combat_manager import CombatManager
+from core.constants import ActionType, DamageType
+from core.rng import RandomStream
+from core.utils import suppress_output
+
+ENEMIES = ("Purple Moth", "Hobgoblin", "Poison Jelly")
+
+
+def make_combat(
+    player: Character,
+    enemies: dict[str, Character],
+    allies: dict[str, Character],
+) -> CombatManager:
+    combat = CombatManager(
+        player.spawn(),
+        [enemies[name].spawn() for name in ENEMIES],
+        [allies["Naerin"].spawn()],
+        rng=RandomStream(0),
+    )
+    with suppress_output():
+        combat.initialize()
+    return combat
+
+
+def test_targets_follow_deaths_and_revivals(
+    player: Character,
+    enemies: dict[str, Character],
+    allies: dict[str, Character],
+) -> None:
+    combat = make_combat(player, enemies, allies)
+    hero = combat.player
+    attack = hero.get_available_attacks()[0]
+    foes = [p for p in combat.participants if p.name in ENEMIES]
+    assert combat.get_legal_targets(hero, attack) == foes
+    snapshot = combat.snapshot()
+
+    victim = foes[1]
+    with suppress_output():
+        victim.take_damage(victim.hp + 100, DamageType.SLASHING, hero)
+    assert not victim.is_alive()
+    survivors = [foes[0], foes[2]]
+    assert combat.get_legal_targets(hero, attack) == survivors
+    assert combat.get_alive_opponents(hero) == survivors
+    assert victim not in combat.get_alive_participants()
+    # The dead cannot act either.
+    assert combat.get_legal_targets(victim, attack) == []
+
+    # A revived participant gets its place back in the turn order.
+    victim.hp = 1
+    combat.update_participant(victim)
+    assert combat.get_legal_targets(hero, attack) == foes
+    assert combat.get_alive_opponents(hero) == foes
+
+    # Restoring a snapshot taken before the death also brings it back.
+    with suppress_output():
+        victim.take_damage(victim.hp + 100, DamageType.SLASHING, hero)
+    combat.restore(snapshot)
+    assert combat.get_legal_targets(hero, attack) == foes
+
+
+def test_healing_targets_must_be_wounded(
+    player: Character,
+    enemies: dict[str, Character],
+    allies: dict[str, Character],
+) -> None:
+    combat = make_combat(player, enemies, allies)
+    hero = combat.player
+    # Without target restrictions, only wounded allies may be healed.
+    heal = HealingAbility("Mend", ActionType.STANDARD, "Heals.", 0, -1, "10")
+    assert combat.get_legal_targets(hero, heal) == []
+
+    ally = next(p for p in combat.participants if p.name == "Naerin")
+    with suppress_output():
+        ally.take_damage(1, DamageType.SLASHING)
+    assert combat.get_legal_targets(hero, heal) == [ally]
+    with suppress_output():
+        ally.take_damage(ally.hp + 100, DamageType.SLASHING)
+    assert combat.get_legal_targets(hero, heal) == []
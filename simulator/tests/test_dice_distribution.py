@@ -0,0 +1,43 @@
+"""Tests of the exact distributions of dice expressions."""
+
+import pytest
+
+from core.dice_distribution import get_distribution
+from core.rng import RandomStream
+from core.utils import roll_expression
+
+
+def test_distribution_of_2d6() -> None:
+    distribution = get_distribution("2d6")
+    assert distribution.minimum == 2
+    assert distribution.maximum == 12
+    assert distribution.mean == pytest.approx(7.0)
+    assert distribution.variance == pytest.approx(35 / 6)
+    assert distribution.probability_of(7) == pytest.approx(6 / 36)
+    assert distribution.probability_of(2) == pytest.approx(1 / 36)
+    assert distribution.probability_of(13) == 0.0
+    assert distribution.probability_at_least(10) == pytest.approx(6 / 36)
+    assert distribution.probability_at_most(4) == pytest.approx(6 / 36)
+    assert sum(distribution.pmf().values()) == pytest.approx(1.0)
+
+
+def test_distribution_with_variables() -> None:
+    distribution = get_distribution(
+        "[MIND]d8 + [SPELLCASTING]", {"MIND": 2, "SPELLCASTING": 3}
+    )
+    assert distribution.minimum == 5
+    assert distribution.maximum == 19
+    assert distribution.mean == pytest.approx(2 * 4.5 + 3)
+
+
+def test_distribution_of_a_d20_check() -> None:
+    distribution = get_distribution("1d20+5")
+    assert distribution.probability_at_least(16) == pytest.approx(0.5)
+    assert distribution.percentile(0.5) == 15
+
+
+def test_distribution_matches_sampling() -> None:
+    distribution = get_distribution("2d4+1d6")
+    stream = RandomStream(3)
+    samples = [roll_expression("2d4+1d6", None, stream) for _ in range(20000)]
+    assert sum(samples) / len(samples) == pytest.approx(distribution.mean, abs=0.05)
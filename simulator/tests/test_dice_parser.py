@@ -0,0 +1,75 @@
+"""Tests of the compiled dice expression engine."""
+
+import re
+from typing import Optional
+
+import pytest
+
+from core.dice_parser import DiceParser, compile_expression
+from core.rng import RandomStream, use_rng
+from core.utils import evaluate_expression, simplify_expression
+
+
+@pytest.mark.parametrize(
+    "expr, minimum, maximum",
+    [
+        ("2d6+3", 5, 15),
+        ("1d20+5", 6, 25),
+        ("d8", 1, 8),
+        ("(1+1)d6*2", 4, 24),
+        ("1d4 - 1", 0, 3),
+        ("7 // 2", 3, 3),
+    ],
+)
+def test_bounds(expr: str, minimum: int, maximum: int) -> None:
+    compiled = compile_expression(expr)
+    assert compiled.minimum() == minimum
+    assert compiled.maximum() == maximum
+
+
+def test_compiled_expressions_are_cached() -> None:
+    assert compile_expression("3d6 + [STR]") is compile_expression("3d6 + [STR]")
+
+
+def test_variables_are_matched_in_any_case() -> None:
+    assert evaluate_expression("[STR]+1", {"STR": 3}) == 4
+    assert evaluate_expression("[STR]+1", {"str": 3}) == 4
+    assert evaluate_expression("[mind]d1 + [Str]", {"MIND": 2, "str": 3}) == 5
+
+
+def test_unknown_variable_is_zero() -> None:
+    assert evaluate_expression("[WIS]+1", {"STR": 3}) == 1
+
+
+def test_parse_dice_describes_constant_terms() -> None:
+    with use_rng(RandomStream(1)):
+        total, description = DiceParser.parse_dice("2d6+3")
+    match = re.fullmatch(r"2d6\((\d)\+(\d)\) \+ 3", description)
+    assert match is not None, description
+    assert total == int(match[1]) + int(match[2]) + 3
+
+
+def test_parse_dice_constant() -> None:
+    assert DiceParser.parse_dice("3") == (3, "3")
+
+
+def test_parse_dice_rejects_invalid_expressions() -> None:
+    with pytest.raises(ValueError):
+        DiceParser.parse_dice("2d")
+
+
+@pytest.mark.parametrize(
+    "expr, variables, expected",
+    [
+        ("[MIND]D8 + [SPELLCASTING]", {"MIND": 2, "SPELLCASTING": 3}, "2D8 + 3"),
+        ("[mind]d6 + [WIS]", {"mind": 3}, "3D6 + [WIS]"),
+        ("1d8 + 2 + 3", None, "1D8 + 5"),
+        ("2 + 1d8 - 5", None, "1D8 - 3"),
+        ("(1+1)d6*2", None, "2D6 * 2"),
+        ("10 - 4", None, "6"),
+    ],
+)
+def test_simplify_expression(
+    expr: str, variables: Optional[dict[str, int]], expected: str
+) -> None:
+    assert simplify_expression(expr, variables) == expected
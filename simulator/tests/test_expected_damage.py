@@ -0,0 +1,65 @@
+"""Tests of the analytic estimates of attacks against exhaustive enumeration."""
+
+from itertools import product
+
+import pytest
+
+from actions.attacks import BaseAttack
+from character import Character
+from combat.damage import DamageComponent
+from combat.expected_damage import estimate_attack
+from core.constants import ActionType, DamageType
+
+
+def _exact_outcomes(ac: int) -> list[tuple[float, int]]:
+    """Enumerates every roll of the test attack against a fire resistant
+    target, as (probability, damage taken) pairs, a miss dealing no damage."""
+    outcomes = []
+    for d20, bonus, slashing, fire in product(
+        range(1, 21), range(1, 5), range(1, 7), range(1, 5)
+    ):
+        p = 1 / (20 * 4 * 6 * 4)
+        hit = d20 == 20 or (d20 != 1 and d20 + bonus >= ac)
+        outcomes.append((p, slashing + fire // 2 if hit else 0))
+    return outcomes
+
+
+def test_estimate_matches_the_exact_distribution(player: Character) -> None:
+    actor, target = player.spawn(), player.spawn()
+    target.resistances = {DamageType.FIRE}
+    target.vulnerabilities = set()
+    attack = BaseAttack(
+        "Test Strike",
+        ActionType.STANDARD,
+        "A test attack.",
+        0,
+        -1,
+        1,
+        "1D4",
+        [
+            DamageComponent("1D6", DamageType.SLASHING),
+            DamageComponent("1D4", DamageType.FIRE),
+        ],
+    )
+    outcomes = _exact_outcomes(target.AC)
+
+    estimate = estimate_attack(actor, attack, target)
+    assert estimate.hit_probability == pytest.approx(
+        sum(p for p, damage in outcomes if damage > 0)
+    )
+    assert estimate.expected_damage == pytest.approx(
+        sum(p * damage for p, damage in outcomes)
+    )
+    for hp in (1, 4, 7, 9):
+        assert estimate.expected_damage_taken(hp) == pytest.approx(
+            sum(p * min(damage, hp) for p, damage in outcomes)
+        )
+        assert estimate.kill_probability(hp) == pytest.approx(
+            sum(p for p, damage in outcomes if damage >= hp)
+        )
+    # The estimate is cached for the same target defenses only.
+    assert estimate_attack(actor, attack, target) is estimate
+    target.resistances = set()
+    assert estimate_attack(actor, attack, target).expected_damage > (
+        estimate.expected_damage
+    )
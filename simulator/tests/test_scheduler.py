@@ -0,0 +1,89 @@
+"""Tests of the expiry scheduler of durations and cooldowns."""
+
+from core.scheduler import ExpiryScheduler
+
+
+def test_items_expire_on_their_turn() -> None:
+    scheduler = ExpiryScheduler()
+    scheduler.schedule("long", 3)
+    scheduler.schedule("short", 1)
+    scheduler.schedule("medium", 2)
+    assert scheduler.advance() == ["short"]
+    assert scheduler.advance() == ["medium"]
+    assert scheduler.advance() == ["long"]
+    assert scheduler.advance() == []
+    assert len(scheduler) == 0
+
+
+def test_same_turn_keeps_scheduling_order() -> None:
+    scheduler = ExpiryScheduler()
+    for name in ("c", "a", "b"):
+        scheduler.schedule(name, 2)
+    scheduler.advance()
+    assert scheduler.advance() == ["c", "a", "b"]
+
+
+def test_scheduling_is_relative_to_the_clock() -> None:
+    scheduler = ExpiryScheduler()
+    first = scheduler.schedule("first", 2)
+    scheduler.advance()
+    second = scheduler.schedule("second", 1)
+    assert scheduler.remaining(first) == 1
+    assert scheduler.remaining(second) == 1
+    assert scheduler.advance() == ["first", "second"]
+
+
+def test_cancelled_items_never_expire() -> None:
+    scheduler = ExpiryScheduler()
+    kept = scheduler.schedule("kept", 1)
+    cancelled = scheduler.schedule("cancelled", 1)
+    scheduler.cancel(cancelled)
+    scheduler.cancel(None)
+    assert scheduler.advance() == [kept.item]
+
+
+def test_non_positive_durations_expire_on_next_turn() -> None:
+    scheduler = ExpiryScheduler()
+    scheduler.schedule("zero", 0)
+    scheduler.schedule("one", 1)
+    assert scheduler.advance() == ["zero", "one"]
+
+
+def test_state_round_trip() -> None:
+    scheduler = ExpiryScheduler()
+    scheduler.schedule("a", 3)
+    scheduler.cancel(scheduler.schedule("b", 2))
+    scheduler.schedule("c", 2)
+    scheduler.advance()
+    state = scheduler.get_state()
+
+    expected = [scheduler.advance() for _ in range(3)]
+    handles = scheduler.set_state(state)
+    # Cancelled items are not part of the state.
+    assert sorted(handle.item for handle in handles) == ["a", "c"]
+    assert scheduler.now == 1
+    assert [scheduler.advance() for _ in range(3)] == expected
+    assert expected == [["c"], ["a"], []]
+
+    # New items are scheduled after the restored ones on the same turn.
+    scheduler.set_state(state)
+    scheduler.schedule("d", 1)
+    assert scheduler.advance() == ["c", "d"]
+
+
+def test_len_counts_live_items_and_heap_is_compacted() -> None:
+    scheduler = ExpiryScheduler()
+    handles = [scheduler.schedule(index, 5) for index in range(10)]
+    for handle in handles[:5]:
+        scheduler.cancel(handle)
+    assert len(scheduler) == 5
+    # Cancelling twice, or after the expiry, counts only once.
+    scheduler.cancel(handles[0])
+    assert len(scheduler) == 5
+    # Once the cancelled entries outnumber the live ones, they are dropped.
+    scheduler.cancel(handles[5])
+    assert len(scheduler) == 4
+    assert len(scheduler._heap) == 4
+    assert [scheduler.advance() for _ in range(5)][-1] == [6, 7, 8, 9]
+    scheduler.cancel(handles[6])
+    assert len(scheduler) == 0
@@ -0,0 +1,106 @@
+"""Tests of the routing of combat events to triggers by the trigger bus."""
+
+from actions.abilities import HealingAbility
+from character import Character
+from combat.events import (
+    CombatEvent,
+    CombatEventType,
+    EventDispatcher,
+    emit_event,
+    use_event_dispatcher,
+    wants_event,
+)
+from combat.trigger_bus import TriggerBus
+from core.constants import ActionType, DamageType
+from core.utils import suppress_output
+from effects.trigger_effect import TriggerCondition, TriggerEffect, TriggerType
+
+
+def _trigger(trigger_type: TriggerType) -> TriggerEffect:
+    return TriggerEffect(
+        trigger_type.value,
+        "A test trigger.",
+        None,
+        TriggerCondition(trigger_type),
+        [],
+        consumes_on_trigger=False,
+    )
+
+
+def _add_trigger(character: Character, trigger_type: TriggerType) -> TriggerEffect:
+    """Adds a trigger to the character, and returns its own copy of it."""
+    with suppress_output():
+        assert character.effects_module.add_effect(
+            character, _trigger(trigger_type), 1
+        )
+    return character.effects_module.active_effects[-1].effect
+
+
+def test_events_activate_the_triggers_of_their_owner(player: Character) -> None:
+    actor, target = player.spawn(), player.spawn()
+    on_kill = _add_trigger(actor, TriggerType.ON_KILL)
+    on_cast = _add_trigger(actor, TriggerType.ON_SPELL_CAST)
+    on_heal = _add_trigger(target, TriggerType.ON_HEAL)
+    # Triggers of the other participant are never activated.
+    unrelated = [
+        _add_trigger(target, TriggerType.ON_KILL),
+        _add_trigger(target, TriggerType.ON_SPELL_CAST),
+        _add_trigger(actor, TriggerType.ON_HEAL),
+    ]
+    bus = TriggerBus()
+    bus.add_participant(actor)
+    bus.add_participant(target)
+    mend = HealingAbility("Mend", ActionType.STANDARD, "Heals.", 0, -1, "10")
+
+    with use_event_dispatcher(EventDispatcher()), bus.attached(), suppress_output():
+        spell = next(iter(actor.spells.values()))
+        emit_event(
+            CombatEvent(CombatEventType.SPELL_CAST, actor=actor, action=spell)
+        )
+        assert on_cast.triggers_used == 1
+
+        # Healing nothing does not activate ON_HEAL.
+        mend.execute(actor, target)
+        assert on_heal.triggers_used == 0
+        target.hp -= 5
+        mend.execute(actor, target)
+        assert on_heal.triggers_used == 1
+
+        target.take_damage(target.hp + 100, DamageType.SLASHING, actor)
+        assert not target.is_alive()
+        assert on_kill.triggers_used == 1
+
+    assert all(trigger.triggers_used == 0 for trigger in unrelated)
+
+
+def test_subscriptions_follow_the_triggers(player: Character) -> None:
+    character = player.spawn()
+    bus = TriggerBus()
+    bus.add_participant(character)
+    with use_event_dispatcher(EventDispatcher()), bus.attached():
+        assert not wants_event(CombatEventType.HEAL)
+        _add_trigger(character, TriggerType.ON_HEAL)
+        _add_trigger(character, TriggerType.ON_HEAL)
+        assert bus._subscriptions[TriggerType.ON_HEAL][character] == 2
+        assert bus._event_counts[CombatEventType.HEAL] == 1
+        assert wants_event(CombatEventType.HEAL)
+
+        effects = character.effects_module
+        with suppress_output():
+            effects.remove_effect(effects.get_triggers(TriggerType.ON_HEAL)[0])
+        assert bus._subscriptions[TriggerType.ON_HEAL][character] == 1
+        assert wants_event(CombatEventType.HEAL)
+        with suppress_output():
+            effects.remove_effect(effects.get_triggers(TriggerType.ON_HEAL)[0])
+        assert character not in bus._subscriptions[TriggerType.ON_HEAL]
+        assert bus._event_counts[CombatEventType.HEAL] == 0
+        assert not wants_event(CombatEventType.HEAL)
+
+        # Removing a participant drops all its triggers.
+        _add_trigger(character, TriggerType.ON_DEATH)
+        _add_trigger(character, TriggerType.ON_KILL)
+        assert wants_event(CombatEventType.DEATH)
+        bus.remove_participant(character)
+        assert bus._event_counts[CombatEventType.DEATH] == 0
+        assert not wants_event(CombatEventType.DEATH)
+        assert character.effects_module.trigger_bus is None
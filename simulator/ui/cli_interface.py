@@ -15,8 +15,17 @@ from core.constants import *
 from core.utils import *
 
 
-# one session keeps history
-session = PromptSession(erase_when_done=True)
+# one session keeps history, built on first prompt since building it checks
+# the terminal.
+_session: Optional[PromptSession] = None
+
+
+def get_session() -> PromptSession:
+    """Returns the prompt session shared by every prompt."""
+    global _session
+    if _session is None:
+        _session = PromptSession(erase_when_done=True)
+    return _session
 
 
 class PlayerInterface:
@@ -79,7 +88,8 @@ class PlayerInterface:
         prompt = "\n" + ccapture(table) + "\nAction > "
         while True:
             # Prompt the user for input.
-            answer = session.prompt(ANSI(prompt))
+            flush_output()
+            answer = get_session().prompt(ANSI(prompt))
 
             # Keep asking until the user provides a valid input.
             if not answer:
@@ -148,7 +158,8 @@ class PlayerInterface:
         prompt = "\n" + ccapture(table) + "\nTarget > "
         while True:
             # Prompt the user for input.
-            answer = session.prompt(ANSI(prompt))
+            flush_output()
+            answer = get_session().prompt(ANSI(prompt))
             # Keep asking until the user provides a valid input.
             if not answer:
                 continue
@@ -222,7 +233,8 @@ class PlayerInterface:
             # Prepare the prompt with the table.
             prompt = "\n" + ccapture(table) + "\nSelect > "
             # Prompt the user for input.
-            answer = session.prompt(ANSI(prompt))
+            flush_output()
+            answer = get_session().prompt(ANSI(prompt))
             # If the user didn't type anything, continue the loop.
             if not answer:
                 continue
@@ -302,7 +314,8 @@ class PlayerInterface:
         # Create a completer for the spell names.
         while True:
             # Prompt the user for input.
-            answer = session.prompt(ANSI(prompt))
+            flush_output()
+            answer = get_session().prompt(ANSI(prompt))
 
             # If the user didn't type anything, continue the loop.
             if not answer:
@@ -341,13 +354,11 @@ class PlayerInterface:
         """
         if len(spell.mind_cost) == 1:
             return spell.mind_cost[0]
-        # Get the variables for the prompt.
-        variables = actor.get_expression_variables()
         prompt = "\n"
         prompt = f"\n[bold]Upcasting [cyan]{spell.name}[/] is allowed[/]:\n"
         for mind_level in spell.mind_cost:
-            # Set the mind level in the variables for evaluation.
-            variables["MIND"] = mind_level
+            # Get the variables for evaluation, with the mind level set.
+            variables = actor.get_expression_variables(mind_level)
 
             # Get the maximum number of targets if applicable.
             max_targets = evaluate_expression(spell.target_expr, variables)
@@ -415,7 +426,8 @@ class PlayerInterface:
 
         while True:
             # Prompt the user for input.
-            answer = session.prompt(ANSI(ccapture(prompt)))
+            flush_output()
+            answer = get_session().prompt(ANSI(ccapture(prompt)))
             if not answer:
                 continue
 
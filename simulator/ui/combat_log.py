@@ -0,0 +1,360 @@
+"""
+Console rendering of combat events.
+
+The `ConsoleEventRenderer` is the only place where combat events are turned
+into rich-markup text. It is subscribed to the default event dispatcher when
+this module is imported, and it stays idle while the console output is
+disabled, so headless runs never format any message.
+"""
+
+from actions.abilities import BaseAbility, DebuffAbility
+from actions.spells import Spell
+from combat.events import (
+    CombatEvent,
+    CombatEventType,
+    EventSubscriber,
+    get_event_dispatcher,
+)
+from core.constants import (
+    GLOBAL_VERBOSE_LEVEL,
+    ActionCategory,
+    apply_character_type_color,
+    apply_effect_color,
+    apply_damage_type_color,
+    get_damage_type_emoji,
+    get_effect_color,
+    get_effect_emoji,
+)
+from core.utils import cprint, is_output_enabled
+
+
+def format_damage(event: CombatEvent) -> str:
+    """
+    Formats the details of a DAMAGE event.
+
+    Args:
+        event (CombatEvent): The DAMAGE event.
+
+    Returns:
+        str: The damage taken, its type, any reduction, and the roll.
+    """
+    text = apply_damage_type_color(
+        event.damage_type,
+        f"{event.amount} {get_damage_type_emoji(event.damage_type)} ",
+    )
+    # If the base damage differs from the adjusted damage (due to resistances),
+    # include the original and adjusted values.
+    if event.base != event.adjusted:
+        text += f"[dim](reduced: {event.base} → {event.adjusted})[/]"
+    if event.description:
+        text += f"({event.description})"
+    return text
+
+
+def _character(character: object) -> str:
+    return apply_character_type_color(character.char_type, character.name)  # type: ignore
+
+
+def _attack_header(event: CombatEvent) -> str:
+    actor_str, target_str = _character(event.actor), _character(event.target)
+    if event.mind_level is not None:
+        return f"    🎯 {actor_str} casts [bold]{event.action.name}[/] on {target_str}"
+    return f"    🎯 {actor_str} attacks {target_str} with [bold blue]{event.action.name}[/]"
+
+
+def format_miss(event: CombatEvent) -> str:
+    """
+    Formats a MISS event.
+
+    Args:
+        event (CombatEvent): The MISS event.
+
+    Returns:
+        str: The message.
+    """
+    color = "magenta" if event.fumble else "red"
+    msg = _attack_header(event)
+    if GLOBAL_VERBOSE_LEVEL >= 1:
+        msg += f" rolled ({event.description}) [{color}]{event.total}[/] vs AC [yellow]{event.ac}[/]"
+    msg += " and [magenta]fumble![/]" if event.fumble else " and [red]miss![/]"
+    return msg
+
+
+def format_hit(event: CombatEvent) -> str:
+    """
+    Formats a HIT event.
+
+    Args:
+        event (CombatEvent): The HIT event.
+
+    Returns:
+        str: The message.
+    """
+    is_spell = event.mind_level is not None
+    target_str = _character(event.target)
+    effect_str = (
+        f"[{get_effect_color(event.effect)}]{event.effect.name}[/]"
+        if event.effect
+        else ""
+    )
+    msg = _attack_header(event)
+    if GLOBAL_VERBOSE_LEVEL == 0:
+        msg += f" dealing {event.amount} damage"
+        if event.defeated:
+            msg += f" defeating {target_str}"
+        elif event.effect and event.effect_applied:
+            msg += f" and applying {effect_str}"
+        elif event.effect and not is_spell:
+            msg += f" and failing to apply {effect_str}"
+        msg += "."
+    else:
+        msg += f" rolled ({event.description}) {event.total} vs AC [yellow]{event.ac}[/]"
+        msg += " → " if is_spell else " and "
+        msg += "[magenta]crit![/]\n" if event.critical else "[green]hit![/]\n"
+        msg += f"        Dealing {event.amount} damage to {target_str} → "
+        msg += " + ".join(format_damage(damage) for damage in event.damage) + ".\n"
+        if event.defeated:
+            msg += f"        {target_str} is defeated."
+        elif event.effect and event.effect_applied:
+            msg += f"        {target_str} is affected by {effect_str}."
+        elif event.effect and not is_spell:
+            msg += f"        {target_str} is not affected by {effect_str}."
+    return msg
+
+
+def _ability_roll(event: CombatEvent) -> str:
+    # Abilities hitting automatically have no attack roll to show.
+    if not event.description:
+        return ""
+    return f" (rolled ({event.description}) {event.total} vs AC {event.ac})"
+
+
+def format_ability_miss(event: CombatEvent) -> str:
+    """
+    Formats the MISS event of an ability.
+
+    Args:
+        event (CombatEvent): The MISS event.
+
+    Returns:
+        str: The message.
+    """
+    return (
+        f"    ❌ {_character(event.actor)} uses [bold blue]{event.action.name}[/] "
+        f"on {_character(event.target)} but misses!{_ability_roll(event)}"
+    )
+
+
+def format_ability_hit(event: CombatEvent) -> str:
+    """
+    Formats the HIT event of an ability.
+
+    Args:
+        event (CombatEvent): The HIT event.
+
+    Returns:
+        str: The message.
+    """
+    target_str = _character(event.target)
+    effect_str = f"[bold yellow]{event.effect.name}[/]" if event.effect else ""
+    msg = f"    🔥 {_character(event.actor)} uses [bold blue]{event.action.name}[/] on {target_str}"
+    msg += _ability_roll(event)
+    msg += f" dealing {event.amount} damage"
+    if GLOBAL_VERBOSE_LEVEL >= 1 and event.damage:
+        msg += " → " + " + ".join(format_damage(damage) for damage in event.damage)
+    if event.fumble:
+        msg += " (fumble!)"
+    elif event.critical:
+        msg += " (critical hit!)"
+    if GLOBAL_VERBOSE_LEVEL == 0:
+        if event.defeated:
+            msg += f" defeating {target_str}"
+        elif event.effect and event.effect_applied:
+            msg += f" and applying {effect_str}"
+        elif event.effect:
+            msg += f" and failing to apply {effect_str}"
+        msg += "."
+    else:
+        msg += ".\n"
+        if event.defeated:
+            msg += f"        {target_str} is defeated."
+        elif event.effect and event.effect_applied:
+            msg += f"        {target_str} is affected by {effect_str}."
+        elif event.effect:
+            msg += f"        {target_str} resists {effect_str}."
+    return msg
+
+
+def format_heal(event: CombatEvent) -> str:
+    """
+    Formats a HEAL event, of either a healing action or healing over time.
+
+    Args:
+        event (CombatEvent): The HEAL event.
+
+    Returns:
+        str: The message.
+    """
+    target_str = _character(event.target)
+    if event.action is None:
+        return (
+            f"    {get_effect_emoji(event.effect)} {target_str} heals for "
+            f"{event.amount} ([white]{event.description}[/]) hp from "
+            f"{apply_effect_color(event.effect, event.effect.name)}."
+        )
+    actor_str = _character(event.actor)
+    if isinstance(event.action, Spell):
+        effect_str = (
+            f"[{get_effect_color(event.effect)}]{event.effect.name}[/]"
+            if event.effect
+            else ""
+        )
+        msg = f"    ✳️ {actor_str} casts [bold]{event.action.name}[/] on {target_str}"
+        msg += f" healing for [bold green]{event.amount}[/]"
+        if GLOBAL_VERBOSE_LEVEL >= 1:
+            msg += f" ({event.description})"
+        if event.effect and event.effect_applied:
+            msg += f" and applying {effect_str}"
+        elif event.effect:
+            msg += f" but failing to apply {effect_str}"
+        return msg + "."
+    effect_str = f"[bold yellow]{event.effect.name}[/]" if event.effect else ""
+    msg = f"    💚 {actor_str} uses [bold green]{event.action.name}[/] on {target_str}"
+    if GLOBAL_VERBOSE_LEVEL == 0:
+        msg += f" healing {event.amount} HP"
+        if event.effect and event.effect_applied:
+            msg += f" and applying {effect_str}"
+        return msg + "."
+    if event.amount != event.base:
+        msg += f" healing {event.amount} HP (rolled {event.base}, capped at max HP)"
+    else:
+        msg += f" healing {event.amount} HP → {event.description}"
+    msg += ".\n"
+    if event.effect and event.effect_applied:
+        msg += f"        {target_str} is affected by {effect_str}."
+    elif event.effect:
+        msg += f"        {target_str} resists {effect_str}."
+    return msg
+
+
+def format_effect_applied(event: CombatEvent) -> str:
+    """
+    Formats the EFFECT_APPLIED event of a buff or debuff action.
+
+    Args:
+        event (CombatEvent): The EFFECT_APPLIED event.
+
+    Returns:
+        str: The message.
+    """
+    actor_str, target_str = _character(event.actor), _character(event.target)
+    effect_str = f"[{get_effect_color(event.effect)}]{event.effect.name}[/]"
+    if isinstance(event.action, Spell):
+        emoji = "🔮" if event.action.category == ActionCategory.DEBUFF else "✨"
+        msg = f"    {emoji} {actor_str} casts [bold]{event.action.name}[/] on {target_str} "
+        msg += "applying " if event.effect_applied else "but fails to apply "
+        return msg + effect_str + "."
+    verb = "applying" if isinstance(event.action, DebuffAbility) else "granting"
+    msg = f"    ✨ {actor_str} uses [bold blue]{event.action.name}[/] on {target_str}"
+    if GLOBAL_VERBOSE_LEVEL == 0:
+        if event.effect_applied:
+            msg += f" {verb} {effect_str}"
+        else:
+            msg += f" but fails to apply {effect_str}"
+        return msg + "."
+    if event.effect_applied:
+        msg += f" successfully {verb} {effect_str}.\n"
+        msg += f"        Effect: {event.effect.description}"
+    else:
+        msg += f" but {target_str} resists {effect_str}.\n"
+    return msg
+
+
+def format_concentration_broken(event: CombatEvent) -> str:
+    """
+    Formats a CONCENTRATION_BROKEN event.
+
+    Args:
+        event (CombatEvent): The CONCENTRATION_BROKEN event.
+
+    Returns:
+        str: The message.
+    """
+    targets_str = ", ".join(target.name for target in event.targets)
+    msg = f"    :no_entry: [bold yellow]{event.action.name}[/] concentration broken on [bold]{targets_str}[/]"
+    if event.description:
+        msg += f" ({event.description})"
+    return msg + "."
+
+
+class ConsoleEventRenderer(EventSubscriber):
+    """Prints combat events on the console through cprint."""
+
+    # The event types rendered on the console.
+    EVENT_TYPES = (
+        CombatEventType.HIT,
+        CombatEventType.MISS,
+        CombatEventType.DAMAGE,
+        CombatEventType.HEAL,
+        CombatEventType.EFFECT_APPLIED,
+        CombatEventType.EFFECT_REPLACED,
+        CombatEventType.EFFECT_EXPIRED,
+        CombatEventType.CONCENTRATION_BROKEN,
+        CombatEventType.TRIGGER_ACTIVATED,
+    )
+
+    @property
+    def active(self) -> bool:
+        return is_output_enabled()
+
+    def handle(self, event: CombatEvent) -> None:
+        if event.type == CombatEventType.HIT:
+            if isinstance(event.action, BaseAbility):
+                cprint(format_ability_hit(event))
+            else:
+                cprint(format_hit(event))
+        elif event.type == CombatEventType.MISS:
+            if isinstance(event.action, BaseAbility):
+                cprint(format_ability_miss(event))
+            else:
+                cprint(format_miss(event))
+        elif event.type == CombatEventType.DAMAGE:
+            # Damage dealt by actions is part of their HIT message, only
+            # damage over time is rendered on its own.
+            if event.effect is None:
+                return
+            cprint(
+                f"    {get_effect_emoji(event.effect)} "
+                f"{_character(event.target)} takes {format_damage(event)}"
+            )
+            if event.defeated:
+                cprint(f"    [bold red]{event.target.name} has been defeated![/]")
+        elif event.type == CombatEventType.HEAL:
+            cprint(format_heal(event))
+        elif event.type == CombatEventType.EFFECT_APPLIED:
+            # The effects of offensive and healing actions are part of their
+            # HIT and HEAL messages, and the ones applied by triggers are not
+            # rendered, only buffs and debuffs are rendered on their own.
+            if event.action is None or event.action.category not in (
+                ActionCategory.BUFF,
+                ActionCategory.DEBUFF,
+            ):
+                return
+            cprint(format_effect_applied(event))
+        elif event.type == CombatEventType.EFFECT_REPLACED:
+            cprint(f"    ⚠️  {event.effect.name} replaces {event.replaced.name}.")
+        elif event.type == CombatEventType.EFFECT_EXPIRED:
+            cprint(
+                f"    :hourglass_done: [bold yellow]{event.effect.name}[/] has expired on [bold]{event.target.name}[/]."
+            )
+        elif event.type == CombatEventType.CONCENTRATION_BROKEN:
+            cprint(format_concentration_broken(event))
+        elif event.type == CombatEventType.TRIGGER_ACTIVATED:
+            cprint(
+                f"    ⚡ {_character(event.actor)}'s [bold][{get_effect_color(event.effect)}]{event.effect.name}[/][/] activates!"
+            )
+
+
+# The renderer subscribed to the default dispatcher.
+console_renderer: ConsoleEventRenderer = ConsoleEventRenderer()
+get_event_dispatcher().subscribe(console_renderer, ConsoleEventRenderer.EVENT_TYPES)